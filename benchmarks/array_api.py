@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the plain-array API against the structured-array API.
+
+The structured-array methods are evaluated on live points as used by nessai,
+which include the extra `logL`, `logP` and `it` fields, whereas the array
+methods are evaluated on a contiguous (n, dims) array.
+
+Usage:
+
+    python benchmarks/array_api.py --n 100000
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import (
+    Brewer,
+    EggBox,
+    Gaussian,
+    GaussianMixture,
+    HalfGaussian,
+    MixtureOfDistributions,
+    Pyramid,
+    Rosenbrock,
+)
+
+
+def best_time(func, number=5):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'model':<24}{'structured [s]':>16}{'array [s]':>12}"
+        f"{'speed-up':>10}"
+    )
+    for ModelClass in [
+        Brewer,
+        EggBox,
+        Gaussian,
+        GaussianMixture,
+        HalfGaussian,
+        MixtureOfDistributions,
+        Pyramid,
+        Rosenbrock,
+    ]:
+        model = ModelClass()
+        x = model.new_point(args.n)
+        x_array = np.ascontiguousarray(model.unstructured_view(x))
+        t_struct = best_time(lambda: model.log_likelihood(x))
+        t_array = best_time(lambda: model.log_likelihood_array(x_array))
+        print(
+            f"{ModelClass.__name__:<24}{t_struct:>16.3e}{t_array:>12.3e}"
+            f"{t_struct / t_array:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Benchmark coalescing single-point likelihood calls into batches.
+
+Compares evaluating points one at a time to evaluating them through a
+LikelihoodBatcher with different batch sizes and latencies. Reports the
+throughput and the mean time each request waited for its result.
+
+Usage:
+
+    python benchmarks/batching.py --n 10000
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from nessai_models import Gaussian, GaussianMixture, Rosenbrock
+from nessai_models.batching import LikelihoodBatcher
+
+
+async def run(batcher, points):
+    latencies = np.empty(len(points))
+
+    async def request(i, p):
+        start = time.perf_counter()
+        await batcher.log_likelihood(p)
+        latencies[i] = time.perf_counter() - start
+
+    await asyncio.gather(*(request(i, p) for i, p in enumerate(points)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=10_000)
+    parser.add_argument("--dims", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        f"{'model':<18}{'batch':>8}{'latency [s]':>13}{'samples/s':>12}"
+        f"{'mean wait [s]':>15}"
+    )
+    for ModelClass in [Gaussian, GaussianMixture, Rosenbrock]:
+        model = ModelClass(dims=args.dims)
+        x = model.new_point(args.n)
+        points = [x[i] for i in range(args.n)]
+
+        start = time.perf_counter()
+        for p in points:
+            model.log_likelihood(p)
+        t = time.perf_counter() - start
+        print(
+            f"{ModelClass.__name__:<18}{'-':>8}{'-':>13}{args.n / t:>12.3e}"
+            f"{t / args.n:>15.3e}"
+        )
+        for max_batch_size in [16, 256, 4096]:
+            for max_latency in [1e-4, 1e-2]:
+                batcher = LikelihoodBatcher(
+                    model,
+                    max_batch_size=max_batch_size,
+                    max_latency=max_latency,
+                )
+                start = time.perf_counter()
+                latencies = asyncio.run(run(batcher, points))
+                t = time.perf_counter() - start
+                print(
+                    f"{ModelClass.__name__:<18}{max_batch_size:>8}"
+                    f"{max_latency:>13.0e}{args.n / t:>12.3e}"
+                    f"{latencies.mean():>15.3e}"
+                )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the binned likelihood for GaussianMixtureWithData.
+
+Compares the time to evaluate a batch of samples near the truth for the
+unbinned and binned likelihoods and reports the mean and standard
+deviation of the difference between the two log-likelihoods. A constant
+difference does not change the posterior.
+
+Usage:
+
+    python benchmarks/binned_data.py --n-data 10000 100000 --n-bins 1000
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import GaussianMixtureWithData
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument(
+        "--n-data", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument(
+        "--n-bins", type=int, nargs="+", default=[500, 1_000, 2_000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'n data':>10}{'n bins':>8}{'unbinned':>12}{'binned':>12}"
+        f"{'speed-up':>10}{'mean diff':>12}{'std diff':>12}"
+    )
+    for n_data in args.n_data:
+        np.random.seed(1234)
+        unbinned = GaussianMixtureWithData(n=n_data)
+        truth = np.array([unbinned.truth[n] for n in unbinned.names])
+        scale = np.array([0.005, 0.003, 0.005, 0.0003, 0.003])
+        x = truth + scale * np.sqrt(1000 / n_data) * np.random.randn(args.n, 5)
+        log_l = unbinned.log_likelihood_array(x)
+        t_unbinned = best_time(lambda: unbinned.log_likelihood_array(x))
+        for n_bins in args.n_bins:
+            np.random.seed(1234)
+            binned = GaussianMixtureWithData(n=n_data, n_bins=n_bins)
+            diff = binned.log_likelihood_array(x) - log_l
+            t_binned = best_time(lambda: binned.log_likelihood_array(x))
+            print(
+                f"{n_data:>10}{n_bins:>8}{t_unbinned:>12.3e}"
+                f"{t_binned:>12.3e}{t_unbinned / t_binned:>10.1f}"
+                f"{np.mean(diff):>12.3e}{np.std(diff):>12.3e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Benchmark limiting the number of BLAS threads in a worker pool.
+
+Evaluates the log-likelihood of a dense Gaussian in a pool created by
+nessai (:code:`configure_pool`) with the BLAS threads unchanged
+(:code:`n_blas_threads=None`) and automatically limited
+(:code:`n_blas_threads='auto'`), and reports the throughput. The
+difference is only visible on machines with several cores, where each
+worker would otherwise start one BLAS thread per core.
+
+Usage:
+
+    python benchmarks/blas_threads.py --n-pool 4 16 --dims 500
+"""
+import argparse
+import time
+
+import numpy as np
+from nessai.livepoint import numpy_array_to_live_points
+from nessai.utils.multiprocessing import log_likelihood_wrapper
+
+from nessai_models import Gaussian
+from nessai_models.blas import get_blas_threads, get_cpu_count
+
+
+def throughput(model, x, n_pool, n_repeats):
+    model.configure_pool(n_pool=n_pool)
+    try:
+        chunks = np.array_split(x, 4 * n_pool)
+        model.pool.map(log_likelihood_wrapper, chunks)
+        start = time.perf_counter()
+        for _ in range(n_repeats):
+            model.pool.map(log_likelihood_wrapper, chunks)
+        duration = time.perf_counter() - start
+    finally:
+        model.close_pool()
+    return n_repeats * len(x) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--dims", type=int, default=500)
+    parser.add_argument("--n-pool", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--n-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    model = Gaussian(dims=args.dims, cov=np.eye(args.dims) + 0.1)
+    x = numpy_array_to_live_points(
+        np.random.randn(args.n, args.dims), model.names
+    )
+    print(f"CPUs: {get_cpu_count()}, BLAS threads: {get_blas_threads()}")
+    print(f"{'n pool':>8}{'unchanged':>14}{'auto':>14}{'speed-up':>10}")
+    for n_pool in args.n_pool:
+        model.n_blas_threads = None
+        before = throughput(model, x, n_pool, args.n_repeats)
+        model.n_blas_threads = "auto"
+        after = throughput(model, x, n_pool, args.n_repeats)
+        print(
+            f"{n_pool:>8}{before:>14.3e}{after:>14.3e}"
+            f"{after / before:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
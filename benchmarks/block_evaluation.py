@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Benchmark block-wise evaluation of the n-dimensional likelihoods.
+
+Compares the throughput of the log-likelihood with the block size
+against evaluating the full batch at once for increasing batch sizes. With
+:code:`--tune`, the block size is first tuned for this machine and cached
+for later runs.
+
+Usage:
+
+    python benchmarks/block_evaluation.py --dims 8 --tune
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import Brewer, Gaussian, Pyramid, Rosenbrock
+from nessai_models.utils import get_block_bytes, save_block_bytes
+
+
+def throughput(model, x, number=3):
+    """Number of samples evaluated per second."""
+    t = min(
+        timeit.repeat(lambda: model.log_likelihood(x), number=number, repeat=3)
+    )
+    return number * x.size / t
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dims", type=int, default=8)
+    parser.add_argument("--max-exponent", type=int, default=7)
+    parser.add_argument("--tune", action="store_true")
+    args = parser.parse_args()
+
+    if args.tune:
+        save_block_bytes()
+    print(f"Block size: {get_block_bytes()} bytes")
+    print(
+        f"{'model':<12}{'n':>10}{'blocked':>14}{'unblocked':>14}{'ratio':>8}"
+    )
+    for ModelClass in [Brewer, Gaussian, Pyramid, Rosenbrock]:
+        model = ModelClass(dims=args.dims)
+        for exponent in range(3, args.max_exponent + 1):
+            x = model.new_point(10**exponent)
+            model.block_size = None
+            blocked = throughput(model, x)
+            model.block_size = x.size
+            unblocked = throughput(model, x)
+            print(
+                f"{ModelClass.__name__:<12}{x.size:>10}{blocked:>14.3e}"
+                f"{unblocked:>14.3e}{blocked / unblocked:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
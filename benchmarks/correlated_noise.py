@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the likelihood for signals in correlated noise.
+
+Compares a dense Cholesky factorisation to the Toeplitz (Levinson-Durbin)
+and banded covariance matrices for construction and for evaluating the
+log-likelihood.
+
+Usage:
+
+    python benchmarks/correlated_noise.py --n 100
+"""
+import argparse
+import timeit
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+from nessai_models import LinearSignal
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100)
+    parser.add_argument(
+        "--n-points", type=int, nargs="+", default=[500, 1_000, 2_000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'n_points':>10}{'':>8}{'dense':>12}{'toeplitz':>12}{'banded':>12}"
+    )
+    for n_points in args.n_points:
+        autocovariance = np.zeros(n_points)
+        autocovariance[:3] = [2.0, 0.5, 0.2]
+        banded = np.tile(autocovariance[:3, np.newaxis], (1, n_points))
+        cov = np.diag(np.full(n_points, 2.0))
+        for i, a in enumerate(autocovariance[1:3], start=1):
+            cov += np.diag(np.full(n_points - i, a), i)
+            cov += np.diag(np.full(n_points - i, a), -i)
+
+        toeplitz = LinearSignal(
+            n_points=n_points, autocovariance=autocovariance
+        )
+        band = LinearSignal(n_points=n_points, banded_covariance=banded)
+        x = toeplitz.new_point(args.n)
+        factor = cho_factor(cov)
+
+        def dense_log_likelihood():
+            parameters = {n: x[n] for n in toeplitz.names}
+            res = toeplitz.data - toeplitz.signal_model(**parameters)
+            return -0.5 * np.sum(res * cho_solve(factor, res), axis=0)
+
+        construct = [
+            best_time(lambda: cho_factor(cov), number=1),
+            best_time(
+                lambda: LinearSignal(
+                    n_points=n_points, autocovariance=autocovariance
+                ),
+                number=1,
+            ),
+            best_time(
+                lambda: LinearSignal(
+                    n_points=n_points, banded_covariance=banded
+                ),
+                number=1,
+            ),
+        ]
+        evaluate = [
+            best_time(dense_log_likelihood),
+            best_time(lambda: toeplitz.log_likelihood(x)),
+            best_time(lambda: band.log_likelihood(x)),
+        ]
+        for label, times in [("init", construct), ("eval", evaluate)]:
+            print(
+                f"{n_points:>10}{label:>8}"
+                + "".join(f"{t:>12.3e}" for t in times)
+            )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
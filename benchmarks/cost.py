@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the scaling of likelihood evaluation with the number of workers.
+
+Uses a model with a synthetic cost per point and evaluates a batch of points
+split between a pool of workers, similar to nessai with :code:`n_pool`.
+The measured speed-up is compared to the ideal speed-up from the cost model.
+
+Usage:
+
+    python benchmarks/cost.py --cost 1e-3 --mode sleep --pool thread
+"""
+import argparse
+from multiprocessing.pool import Pool, ThreadPool
+import os
+import time
+
+import numpy as np
+
+from nessai_models import CostModel, Gaussian
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=200)
+    parser.add_argument("--cost", type=float, default=1e-3)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--mode", choices=CostModel.modes, default="busy")
+    parser.add_argument(
+        "--pool", choices=["process", "thread"], default="process"
+    )
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    model = CostModel(
+        Gaussian(), cost=args.cost, mode=args.mode, jitter=args.jitter
+    )
+    x = model.new_point(args.n)
+    PoolClass = Pool if args.pool == "process" else ThreadPool
+
+    print(f"{'workers':>8}{'time':>12}{'speed-up':>10}{'ideal':>8}")
+    reference = None
+    for n_workers in range(1, args.max_workers + 1):
+        with PoolClass(n_workers) as pool:
+            start = time.perf_counter()
+            pool.map(model.log_likelihood, np.array_split(x, n_workers))
+            duration = time.perf_counter() - start
+        if reference is None:
+            reference = duration
+        print(
+            f"{n_workers:>8}{duration:>12.3e}{reference / duration:>10.2f}"
+            f"{model.ideal_speedup(args.n, n_workers):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Benchmark constructing models with large dense covariance matrices.
+
+Compares constructing the distributions with scipy, which factorises the
+covariance matrices eagerly, to the deferred and cached factorisations used
+by the models, including a second construction that uses the cache.
+
+Usage:
+
+    python benchmarks/factorisation.py --dims 2000 --n-gaussians 20
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.stats import multivariate_normal
+
+from nessai_models import GaussianMixture
+
+
+def timed(func):
+    start = time.perf_counter()
+    out = func()
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dims", type=int, default=1000)
+    parser.add_argument("--n-gaussians", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1234)
+    config = []
+    for _ in range(args.n_gaussians):
+        a = rng.normal(size=(args.dims, args.dims)) / np.sqrt(args.dims)
+        config.append(
+            dict(
+                mean=rng.uniform(-5, 5, args.dims),
+                cov=a @ a.T + np.eye(args.dims),
+            )
+        )
+    x = rng.uniform(-5, 5, size=(100, args.dims))
+
+    _, t_scipy = timed(lambda: [multivariate_normal(**c) for c in config])
+
+    def construct():
+        return GaussianMixture(
+            dims=args.dims,
+            n_gaussians=args.n_gaussians,
+            config=[dict(c) for c in config],
+        )
+
+    model, t_init = timed(construct)
+    _, t_first = timed(lambda: model.log_likelihood_array(x))
+    model, t_cached_init = timed(construct)
+    _, t_cached_first = timed(lambda: model.log_likelihood_array(x))
+
+    for label, t in [
+        ("scipy construction", t_scipy),
+        ("deferred construction", t_init),
+        ("first likelihood call", t_first),
+        ("cached construction", t_cached_init),
+        ("cached first likelihood call", t_cached_first),
+    ]:
+        print(f"{label:<30}{t:>10.3f} s")
+
+
+if __name__ == "__main__":
+    main()
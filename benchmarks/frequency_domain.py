@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the frequency-domain sinusoidal likelihood.
+
+Compares the time-domain SinusoidalSignal likelihood to the
+frequency-domain version with the full band and with a restricted band.
+
+Usage:
+
+    python benchmarks/frequency_domain.py --n 1000
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import FrequencyDomainSinusoidalSignal, SinusoidalSignal
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument(
+        "--n-points", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'n_points':>10}{'time domain':>14}{'full band':>12}"
+        f"{'band':>12}{'# freqs':>10}"
+    )
+    for n_points in args.n_points:
+        end = n_points / 100
+        td = SinusoidalSignal(n_points=n_points, end=end)
+        fd = FrequencyDomainSinusoidalSignal(n_points=n_points, end=end)
+        band = FrequencyDomainSinusoidalSignal(
+            n_points=n_points, end=end, f_min=0.0, f_max=5.0
+        )
+        x = td.new_point(args.n)
+        times = [
+            best_time(lambda: model.log_likelihood(x))
+            for model in [td, fd, band]
+        ]
+        print(
+            f"{n_points:>10}{times[0]:>14.3e}{times[1]:>12.3e}"
+            f"{times[2]:>12.3e}{band.band.size:>10}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
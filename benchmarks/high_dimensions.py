@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the n-dimensional models with thousands of dimensions.
+
+Reports the time to construct each model and to evaluate the log-prior, the
+unit-hypercube transforms and the log-likelihood for a batch of samples.
+
+Models that construct dense covariance matrices are only included up to
+`--max-dense-dims` dimensions.
+
+Usage:
+
+    python benchmarks/high_dimensions.py --dims 1000 5000 10000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from nessai_models import (
+    Brewer,
+    ConcentricGaussianMixture,
+    EggBox,
+    Gaussian,
+    GaussianMixture,
+    GaussianShell,
+    HalfGaussian,
+    NealsFunnel,
+    Pyramid,
+    Rastrigin,
+    Rosenbrock,
+    SlabSpike,
+    StudentT,
+)
+
+DENSE_MODELS = [
+    Brewer,
+    ConcentricGaussianMixture,
+    Gaussian,
+    GaussianMixture,
+    SlabSpike,
+]
+MODELS = [
+    EggBox,
+    GaussianShell,
+    HalfGaussian,
+    NealsFunnel,
+    Pyramid,
+    Rastrigin,
+    Rosenbrock,
+    StudentT,
+] + DENSE_MODELS
+
+
+def timed(func):
+    start = time.perf_counter()
+    out = func()
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--dims", type=int, nargs="+", default=[1000, 5000, 10000]
+    )
+    parser.add_argument("--n", type=int, default=100)
+    parser.add_argument("--max-dense-dims", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"{'model':<28}{'dims':>7}{'init':>10}{'prior':>10}"
+        f"{'to unit':>10}{'from unit':>10}{'logL':>10}"
+    )
+    for dims in args.dims:
+        for ModelClass in MODELS:
+            if ModelClass in DENSE_MODELS and dims > args.max_dense_dims:
+                continue
+            model, t_init = timed(lambda: ModelClass(dims=dims))
+            x = model.new_point(args.n)
+            _, t_prior = timed(lambda: model.log_prior(x))
+            x_unit, t_to = timed(lambda: model.to_unit_hypercube(x))
+            _, t_from = timed(lambda: model.from_unit_hypercube(x_unit))
+            _, t_logl = timed(lambda: model.log_likelihood(x))
+            print(
+                f"{ModelClass.__name__:<28}{dims:>7}{t_init:>10.2e}"
+                f"{t_prior:>10.2e}{t_to:>10.2e}{t_from:>10.2e}"
+                f"{t_logl:>10.2e}"
+            )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
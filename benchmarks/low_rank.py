@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the low-rank plus diagonal Gaussian against the dense Gaussian.
+
+Reports the construction time, which includes the first likelihood call
+for the dense Gaussian since the factorisation is deferred, and the time
+to evaluate a batch of samples. The dense Gaussian is skipped for
+dimensions above :code:`--max-dense-dims`.
+
+Usage:
+
+    python benchmarks/low_rank.py --dims 100 1000 10000 --rank 10
+"""
+import argparse
+import time
+import timeit
+
+import numpy as np
+
+from nessai_models import Gaussian, LowRankGaussian
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument(
+        "--dims", type=int, nargs="+", default=[100, 1_000, 4_000, 100_000]
+    )
+    parser.add_argument("--rank", type=int, default=10)
+    parser.add_argument("--max-dense-dims", type=int, default=4_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'dims':>8}{'dense init':>14}{'dense eval':>14}"
+        f"{'low-rank init':>16}{'low-rank eval':>16}"
+    )
+    for dims in args.dims:
+        start = time.perf_counter()
+        low_rank = LowRankGaussian(dims=dims, rank=args.rank)
+        t_low_rank_init = time.perf_counter() - start
+        x = np.random.randn(args.n, dims)
+        t_low_rank = best_time(lambda: low_rank.log_likelihood_array(x))
+
+        if dims <= args.max_dense_dims:
+            start = time.perf_counter()
+            dense = Gaussian(dims=dims, cov=low_rank.dist.cov)
+            dense.log_likelihood_array(x[:1])
+            t_dense_init = time.perf_counter() - start
+            t_dense = best_time(lambda: dense.log_likelihood_array(x))
+            dense_times = f"{t_dense_init:>14.3e}{t_dense:>14.3e}"
+        else:
+            dense_times = f"{'-':>14}{'-':>14}"
+        print(
+            f"{dims:>8}{dense_times}"
+            f"{t_low_rank_init:>16.3e}{t_low_rank:>16.3e}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Benchmark analytically marginalising the amplitude and offset of
+SinusoidalSignal.
+
+Reports the time to evaluate a batch of samples for the full
+four-dimensional model and the two-dimensional marginalised model.
+
+Usage:
+
+    python benchmarks/marginalisation.py --n-points 100 1000
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import SinusoidalSignal
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument(
+        "--n-points", type=int, nargs="+", default=[100, 1_000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'n points':>10}{'full':>12}{'marginalised':>14}{'ratio':>8}")
+    for n_points in args.n_points:
+        np.random.seed(1234)
+        full = SinusoidalSignal(n_points=n_points)
+        np.random.seed(1234)
+        marginalised = SinusoidalSignal(
+            n_points=n_points, marginalise=["amp", "offset"]
+        )
+        x_full = np.random.uniform(
+            full.lower_bounds, full.upper_bounds, (args.n, full.dims)
+        )
+        x = x_full[:, [full.names.index(n) for n in marginalised.names]]
+        t_full = best_time(lambda: full.log_likelihood_array(x_full))
+        t_marginalised = best_time(
+            lambda: marginalised.log_likelihood_array(x)
+        )
+        print(
+            f"{n_points:>10}{t_full:>12.3e}{t_marginalised:>14.3e}"
+            f"{t_marginalised / t_full:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
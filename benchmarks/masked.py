@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Benchmark skipping the likelihood for samples outside the prior.
+
+Compares evaluating the log-likelihood for every sample to only evaluating
+it for the samples with a finite log-prior, for an expensive model where a
+fraction of the samples are outside the prior bounds.
+
+Usage:
+
+    python benchmarks/masked.py --n 1000 --cost 1e-5
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import CostModel, Rosenbrock
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument("--dims", type=int, default=4)
+    parser.add_argument("--cost", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    model = CostModel(Rosenbrock(dims=args.dims), cost=args.cost)
+    print(f"{'outside':>8}{'all':>12}{'masked':>12}{'speed-up':>10}")
+    for fraction in [0.0, 0.25, 0.5, 0.9]:
+        x = model.unstructured_view(model.new_point(args.n)).copy()
+        x[np.random.rand(args.n) < fraction] *= 10
+        outside = ~np.isfinite(model.log_prior_array(x))
+        t_all = best_time(
+            lambda: model.log_prior_array(x) + model.log_likelihood_array(x)
+        )
+        t_masked = best_time(lambda: model.log_posterior_array(x))
+        print(
+            f"{outside.mean():>8.2f}{t_all:>12.3e}{t_masked:>12.3e}"
+            f"{t_all / t_masked:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
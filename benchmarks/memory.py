@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Report the memory allocated by the log-likelihood of each model.
+
+Reports the peak memory allocated during a single call, the peak memory
+per sample and the number of arrays that are still allocated after the
+call.
+
+Usage:
+
+    python benchmarks/memory.py --n 10000
+"""
+import argparse
+
+import numpy as np
+
+import nessai_models
+from nessai_models.memory import measure_log_likelihood_memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=10_000)
+    parser.add_argument("--array", action="store_true")
+    args = parser.parse_args()
+
+    print(
+        f"{'model':<34}{'peak [MB]':>12}{'bytes/sample':>14}{'arrays':>8}"
+        f"{'retained':>10}"
+    )
+    for name in nessai_models.__all__:
+        ModelClass = getattr(nessai_models, name)
+        try:
+            model = ModelClass()
+        except TypeError:
+            # Wrappers require a model
+            continue
+        report = measure_log_likelihood_memory(
+            model, n=args.n, array=args.array
+        )
+        print(
+            f"{name:<34}{report.peak_bytes / 2**20:>12.2f}"
+            f"{report.peak_bytes_per_sample:>14.1f}"
+            f"{report.n_allocations:>8}{report.retained_bytes:>10}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Benchmark evaluating the likelihood for many realisations of the data.
+
+Compares building one signal model per realisation and evaluating each one
+separately, as in a PP test, to a single multi-realisation model that
+evaluates all the realisations with one matrix product.
+
+Usage:
+
+    python benchmarks/realisations.py --n 1000 --n-realisations 100
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import (
+    LinearSignal,
+    MultiRealisationLinearSignal,
+    MultiRealisationSinusoidalSignal,
+    SinusoidalSignal,
+)
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument("--n-realisations", type=int, default=100)
+    parser.add_argument("--n-points", type=int, default=100)
+    args = parser.parse_args()
+
+    print(
+        f"{'model':>12}{'build':>12}{'separate':>12}{'batched':>12}"
+        f"{'speed-up':>10}{'max diff':>12}"
+    )
+    for name, cls, single_cls in [
+        ("linear", MultiRealisationLinearSignal, LinearSignal),
+        ("sinusoidal", MultiRealisationSinusoidalSignal, SinusoidalSignal),
+    ]:
+        model = cls(
+            n_realisations=args.n_realisations,
+            seed=1234,
+            n_points=args.n_points,
+        )
+
+        def build():
+            models = []
+            for i in range(args.n_realisations):
+                truth = {k: model.truths[k][i] for k in model.names}
+                single = single_cls(truth=truth, n_points=args.n_points)
+                single.data = model.data_realisations[i][:, np.newaxis]
+                models.append(single)
+            return models
+
+        models = build()
+        x = model.unstructured_view(model.new_point(args.n)).copy()
+        t_build = best_time(build, number=1)
+        t_separate = best_time(
+            lambda: [m.log_likelihood_array(x) for m in models]
+        )
+        t_batched = best_time(
+            lambda: model.log_likelihood_realisations_array(x)
+        )
+        expected = np.array([m.log_likelihood_array(x) for m in models])
+        diff = np.max(
+            np.abs(model.log_likelihood_realisations_array(x) - expected)
+        )
+        print(
+            f"{name:>12}{t_build:>12.3e}{t_separate:>12.3e}"
+            f"{t_batched:>12.3e}{t_separate / t_batched:>10.1f}"
+            f"{diff:>12.2e}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Benchmark evaluating the log-likelihood on worker servers.
+
+Starts worker servers in local processes and compares evaluating batches of
+different sizes locally and with RemoteModel, for a cheap model, which
+measures the overhead per batch, and a model with a synthetic cost per
+point, which measures the speed-up from the servers.
+
+Usage:
+
+    python benchmarks/remote.py --n-servers 2 --batch-sizes 1 100 10000
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import CostModel, Gaussian, RemoteModel
+from nessai_models.remote import local_servers
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-servers", type=int, default=2)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 100, 10_000]
+    )
+    parser.add_argument("--dims", type=int, default=4)
+    parser.add_argument("--cost", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    models = {
+        "Gaussian": Gaussian(dims=args.dims),
+        "CostModel": CostModel(
+            Gaussian(dims=args.dims), cost=args.cost, mode="sleep"
+        ),
+    }
+    print(
+        f"{'model':<12}{'batch':>8}{'local':>12}{'remote':>12}"
+        f"{'overhead':>12}{'speed-up':>10}"
+    )
+    with local_servers(args.n_servers) as addresses:
+        for name, model in models.items():
+            with RemoteModel(model, addresses) as remote:
+                for n in args.batch_sizes:
+                    x = np.random.randn(n, args.dims)
+                    number = max(1000 // n, 3)
+                    t_local = best_time(
+                        lambda: model.log_likelihood_array(x), number
+                    )
+                    t_remote = best_time(
+                        lambda: remote.log_likelihood_array(x), number
+                    )
+                    print(
+                        f"{name:<12}{n:>8}{t_local:>12.3e}{t_remote:>12.3e}"
+                        f"{t_remote - t_local:>12.3e}"
+                        f"{t_local / t_remote:>10.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
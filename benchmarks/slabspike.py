@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the shared-distance likelihood for SlabSpike.
+
+Compares the specialised likelihood to the generic per-component mixture
+likelihood as the number of dimensions increases.
+
+Usage:
+
+    python benchmarks/slabspike.py --n 10000
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import ConcentricGaussianMixture, SlabSpike
+from nessai_models.gaussianmixture import GaussianMixture
+
+
+def best_time(func, number=5):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=10_000)
+    parser.add_argument("--dims", type=int, nargs="+", default=[2, 32, 512])
+    args = parser.parse_args()
+
+    print(
+        f"{'model':<12}{'dims':>6}{'generic [s]':>14}{'shared [s]':>14}"
+        f"{'speed-up':>10}"
+    )
+    for dims in args.dims:
+        models = [
+            ("SlabSpike", SlabSpike(dims=dims)),
+            (
+                "Concentric",
+                ConcentricGaussianMixture(
+                    dims=dims, scales=np.logspace(-3, 0, 8)
+                ),
+            ),
+        ]
+        for name, model in models:
+            x = 0.1 * np.random.randn(args.n, dims)
+            t_generic = best_time(
+                lambda: GaussianMixture._log_likelihood_block(model, x)
+            )
+            t_shared = best_time(lambda: model.log_likelihood_array(x))
+            print(
+                f"{name:<12}{dims:>6}{t_generic:>14.3e}{t_shared:>14.3e}"
+                f"{t_generic / t_shared:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Benchmark streaming evaluation of samples stored on disk.
+
+Writes samples to a memory-mapped .npy file and evaluates them in chunks
+with and without reading ahead on a background thread. Reports the
+throughput and the peak memory allocated while streaming.
+
+Usage:
+
+    python benchmarks/streaming.py --n 10000000 --chunk-size 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from nessai_models import Rosenbrock
+from nessai_models.utils import iter_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=2_000_000)
+    parser.add_argument("--dims", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--read-ahead", type=int, nargs="+", default=[0, 2])
+    args = parser.parse_args()
+
+    model = Rosenbrock(dims=args.dims)
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "samples.npy")
+        samples = np.lib.format.open_memmap(
+            filename, mode="w+", shape=(args.n, args.dims)
+        )
+        for chunk in iter_chunks(samples, args.chunk_size):
+            chunk[:] = np.random.uniform(-5, 5, chunk.shape)
+        samples.flush()
+        del samples
+
+        print(f"{'read-ahead':>10}{'samples/s':>14}{'peak [MB]':>12}")
+        for n_read_ahead in args.read_ahead:
+            mmap = np.load(filename, mmap_mode="r")
+            tracemalloc.start()
+            start = time.perf_counter()
+            for _ in model.iter_evaluate(
+                iter_chunks(mmap, args.chunk_size),
+                log_prior=False,
+                n_read_ahead=n_read_ahead,
+            ):
+                pass
+            duration = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{n_read_ahead:>10}{args.n / duration:>14.3e}"
+                f"{peak / 2**20:>12.1f}"
+            )
+            del mmap
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
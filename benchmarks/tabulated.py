@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Benchmark tabulated surrogate likelihoods.
+
+Reports the time to build the grid, to reload it from the cache and to
+evaluate the interpolated log-likelihood compared to the wrapped model,
+together with the estimated and measured maximum errors.
+
+The grids are cached in a temporary directory.
+
+Usage:
+
+    python benchmarks/tabulated.py --n 10000 --n-points 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+from nessai_models import (
+    MixtureOfDistributions,
+    SinusoidalSignal,
+    TabulatedModel,
+)
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def timed(func):
+    start = time.perf_counter()
+    out = func()
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=10_000)
+    parser.add_argument("--n-points", type=int, default=10_000)
+    parser.add_argument("--tolerance", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    models = {
+        "SinusoidalSignal": SinusoidalSignal(
+            n_points=args.n_points, marginalise=["amp", "offset"]
+        ),
+        "MixtureOfDistributions": MixtureOfDistributions(
+            {"gaussian": 1, "gamma": 1, "halfnorm": 1}
+        ),
+    }
+    print(
+        f"{'model':<24}{'build':>10}{'cached':>10}{'model':>10}"
+        f"{'tabulated':>10}{'speed-up':>10}{'estimate':>10}{'error':>10}"
+    )
+    for name, model in models.items():
+        x = model.unstructured_view(model.new_point(args.n))
+        tabulated, t_build = timed(
+            lambda: TabulatedModel(model, tolerance=args.tolerance)
+        )
+        _, t_cached = timed(
+            lambda: TabulatedModel(model, tolerance=args.tolerance)
+        )
+        t_model = best_time(lambda: model.log_likelihood_array(x), 1)
+        t_tabulated = best_time(lambda: tabulated.log_likelihood_array(x))
+        error = np.max(
+            np.abs(
+                tabulated.log_likelihood_array(x)
+                - model.log_likelihood_array(x)
+            )
+        )
+        print(
+            f"{name:<24}{t_build:>10.2e}{t_cached:>10.2e}{t_model:>10.2e}"
+            f"{t_tabulated:>10.2e}{t_model / t_tabulated:>10.1f}"
+            f"{tabulated.error_estimate:>10.1e}{error:>10.1e}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["NESSAI_MODELS_CACHE_DIR"] = cache_dir
+        main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Benchmark evaluating a ladder of tempered likelihoods.
+
+Compares evaluating a separately tempered model for each inverse
+temperature to evaluating the whole ladder with a single evaluation of the
+wrapped model.
+
+Usage:
+
+    python benchmarks/tempered.py --n 10000 --n-betas 32
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from nessai_models import GaussianMixtureWithData, Rosenbrock, TemperedModel
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=10_000)
+    parser.add_argument("--n-betas", type=int, default=32)
+    args = parser.parse_args()
+
+    betas = np.linspace(0, 1, args.n_betas) ** 5
+    print(f"{'model':<26}{'separate':>12}{'ladder':>12}{'speed-up':>10}")
+    for ModelClass, n in [
+        (Rosenbrock, args.n),
+        (GaussianMixtureWithData, args.n // 10),
+    ]:
+        base = ModelClass()
+        separate = [TemperedModel(base, beta=beta) for beta in betas]
+        ladder = TemperedModel(base, betas=betas)
+        x = base.new_point(n)
+        t_separate = best_time(
+            lambda: [model.log_likelihood(x) for model in separate]
+        )
+        t_ladder = best_time(lambda: ladder.log_likelihood_ladder(x))
+        print(
+            f"{ModelClass.__name__:<26}{t_separate:>12.3e}{t_ladder:>12.3e}"
+            f"{t_separate / t_ladder:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Benchmark thread-parallel likelihood evaluation.
+
+Reports the speed-up relative to a single thread as the number of threads
+increases from one to the number of available cores.
+
+Usage:
+
+    python benchmarks/threads.py --n 1000000
+"""
+import argparse
+import os
+import timeit
+
+import numpy as np
+
+from nessai_models import (
+    GaussianMixture,
+    GaussianMixtureWithData,
+    Pyramid,
+    Rosenbrock,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    n_threads_list = sorted(
+        {2**i for i in range(int(np.log2(args.max_threads)) + 1)}
+        | {args.max_threads}
+    )
+    print(f"{'model':<26}" + "".join(f"{n:>8}" for n in n_threads_list))
+    for ModelClass, n in [
+        (GaussianMixture, args.n),
+        (GaussianMixtureWithData, args.n // 100),
+        (Pyramid, args.n),
+        (Rosenbrock, args.n),
+    ]:
+        model = ModelClass()
+        x = np.ascontiguousarray(model.unstructured_view(model.new_point(n)))
+        times = []
+        for n_threads in n_threads_list:
+            model.n_threads = n_threads
+            times.append(
+                min(
+                    timeit.repeat(
+                        lambda: model.log_likelihood_array(x),
+                        number=1,
+                        repeat=3,
+                    )
+                )
+            )
+        model.close_thread_pool()
+        print(
+            f"{ModelClass.__name__:<26}"
+            + "".join(f"{times[0] / t:>8.2f}" for t in times)
+        )
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the overhead of tracing the evaluated points.
+
+Compares evaluating the log-likelihood of a model with and without the
+TracedModel wrapper for batches of different sizes, and the time to read
+the resulting trace.
+
+Usage:
+
+    python benchmarks/trace.py --dims 10 --n 1 100 10000
+"""
+import argparse
+import tempfile
+import timeit
+
+import numpy as np
+
+from nessai_models import Rosenbrock, TracedModel
+from nessai_models.trace import read_trace
+
+
+def best_time(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dims", type=int, default=10)
+    parser.add_argument("--n", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--buffer-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    model = Rosenbrock(dims=args.dims)
+    print(f"{'n':>8}{'model':>12}{'traced':>12}{'overhead':>10}")
+    with tempfile.TemporaryDirectory() as path:
+        traced = TracedModel(model, path, buffer_size=args.buffer_size)
+        for n in args.n:
+            x = model.new_point(n)
+            number = max(10_000 // n, 3)
+            t_model = best_time(lambda: model.log_likelihood(x), number)
+            t_traced = best_time(lambda: traced.log_likelihood(x), number)
+            print(
+                f"{n:>8}{t_model:>12.3e}{t_traced:>12.3e}"
+                f"{t_traced / t_model:>10.2f}"
+            )
+        traced.close()
+        t_read = best_time(lambda: read_trace(path, concatenate=False), 1)
+        n_records = len(read_trace(path))
+        print(f"Read {n_records} records (memory-mapped) in {t_read:.3e} s")
+
+
+if __name__ == "__main__":
+    np.random.seed(1234)
+    main()
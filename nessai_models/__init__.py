@@ -13,28 +13,63 @@ try:
 except PackageNotFoundError:
     pass
 
+from .batching import LikelihoodBatcher
 from .brewer import Brewer
+from .cost import CostModel
 from .eggbox import EggBox
-from .gaussian import Gaussian
-from .gaussianmixture import GaussianMixture, GaussianMixtureWithData
+from .funnel import NealsFunnel
+from .gaussian import Gaussian, LowRankGaussian
+from .gaussianmixture import (
+    ConcentricGaussianMixture,
+    GaussianMixture,
+    GaussianMixtureWithData,
+)
 from .halfgaussian import HalfGaussian
 from .mixture import MixtureOfDistributions
 from .pyramid import Pyramid
+from .rastrigin import Rastrigin
+from .remote import RemoteModel
 from .rosenbrock import Rosenbrock
-from .signals import LinearSignal, SinusoidalSignal
+from .shell import GaussianShell
+from .signals import (
+    FrequencyDomainSinusoidalSignal,
+    LinearSignal,
+    MultiRealisationLinearSignal,
+    MultiRealisationSinusoidalSignal,
+    SinusoidalSignal,
+)
 from .slabspike import SlabSpike
+from .tabulated import TabulatedModel
+from .studentt import StudentT
+from .tempered import TemperedModel
+from .trace import TracedModel
 
 __all__ = [
     "Brewer",
+    "ConcentricGaussianMixture",
+    "CostModel",
     "EggBox",
+    "FrequencyDomainSinusoidalSignal",
     "Gaussian",
     "GaussianMixture",
     "GaussianMixtureWithData",
+    "GaussianShell",
     "HalfGaussian",
+    "LikelihoodBatcher",
     "LinearSignal",
+    "LowRankGaussian",
     "MixtureOfDistributions",
+    "MultiRealisationLinearSignal",
+    "MultiRealisationSinusoidalSignal",
+    "NealsFunnel",
     "Pyramid",
+    "Rastrigin",
+    "RemoteModel",
     "Rosenbrock",
     "SinusoidalSignal",
     "SlabSpike",
+    "StudentT",
+    "TabulatedModel",
+    "TemperedModel",
+    "TracedModel",
 ]
@@ -2,48 +2,687 @@
 """
 Base models that remove the need to repeat code between models.
 """
-from typing import Sequence, Union
+from concurrent.futures import ThreadPoolExecutor
+import inspect
+import os
+import threading
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from nessai.model import Model
 import numpy as np
 
+from .blas import (
+    blas_threads,
+    get_auto_blas_threads,
+    limit_blas_threads,
+)
+from .config import encode_value
+from .utils import (
+    BLOCK_BYTES_CANDIDATES,
+    evaluate_in_blocks,
+    get_block_bytes,
+    load_chunk,
+    read_ahead,
+)
 
-class BaseModel(Model):
+
+def _same_random_state(a: Tuple, b: Tuple) -> bool:
+    """Check if two states of the global numpy random number generator are
+    the same.
+    """
+    return a[0] == b[0] and a[2:] == b[2:] and np.array_equal(a[1], b[1])
+
+
+class _ModelMeta(type(Model)):
+    """Metaclass that records the arguments used to create a model.
+
+    The state of the global numpy random number generator is only recorded
+    if the model draws random numbers from it when it is created.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        state = np.random.get_state()
+        obj = super().__call__(*args, **kwargs)
+        obj._init_args = args
+        obj._init_kwargs = kwargs
+        if _same_random_state(state, np.random.get_state()):
+            obj._init_random_state = None
+        else:
+            obj._init_random_state = state
+        return obj
+
+
+class BaseModel(Model, metaclass=_ModelMeta):
     """Model that includes an evidence attribute.
 
+    Models should implement :py:meth:`log_likelihood_array` which operates on
+    unstructured arrays. The structured-array methods used by nessai call the
+    array methods.
+
     Attributes
     ----------
     ln_evidence : float
         Natural log-evidence. Not set by default.
+    n_threads : int
+        Number of threads used to evaluate the log-likelihood. If greater
+        than one, batches are split across a persistent thread pool. This is
+        only beneficial for likelihoods that release the GIL, e.g. those
+        that use large numpy operations.
+    n_blas_threads : Optional[Union[int, str]]
+        Number of BLAS and OpenMP threads for each worker when the
+        log-likelihood is evaluated in parallel, either in a pool created
+        by nessai (:code:`n_pool`) or in the thread pool (:code:`n_threads`).
+        If :code:`'auto'`, the available CPUs are divided between the
+        workers of a pool created by nessai and the thread pool does not
+        change the limits. If None, the limits are not changed. See
+        :py:mod:`nessai_models.blas`.
+    skip_out_of_prior : bool
+        If True, :py:meth:`log_likelihood` only evaluates the
+        log-likelihood for samples with a finite log-prior and returns
+        :code:`-inf` for the others. This requires an additional
+        evaluation of the log-prior, so is only beneficial for expensive
+        likelihoods.
     """
 
     ln_evidence: float = None
+    n_threads: int = 1
+    n_blas_threads: Optional[Union[int, str]] = "auto"
+    skip_out_of_prior: bool = False
+    _thread_pool: Optional[ThreadPoolExecutor] = None
+    _thread_pool_pid: Optional[int] = None
+    _thread_pool_key: Optional[Tuple] = None
+
+    def __new__(cls, *args, **kwargs):
+        obj = super().__new__(cls)
+        obj._thread_pool_lock = threading.Lock()
+        return obj
+
+    def _get_init_kwargs(self) -> Dict:
+        """Get the arguments used to create the model as keyword arguments.
+
+        Subclasses with attributes that can be changed after the model is
+        created and that are also arguments should override this to return
+        the current values.
+        """
+        if not hasattr(self, "_init_kwargs"):
+            raise TypeError(
+                "The arguments used to create the model are not available "
+                "after it has been pickled"
+            )
+        signature = inspect.signature(self.__class__.__init__)
+        bound = signature.bind(
+            None, *self._init_args, **self._init_kwargs
+        ).arguments
+        kwargs = {}
+        for name, value in list(bound.items())[1:]:
+            kind = signature.parameters[name].kind
+            if kind == inspect.Parameter.VAR_KEYWORD:
+                kwargs.update(value)
+            elif kind == inspect.Parameter.VAR_POSITIONAL:
+                raise TypeError("Cannot save variable positional arguments")
+            else:
+                kwargs[name] = value
+        return kwargs
+
+    def get_config(self) -> Dict:
+        """Get the configuration needed to rebuild the model.
+
+        The configuration contains the name of the class and the arguments
+        used to create the model. For models that draw random numbers from
+        the global numpy random number generator when they are created, it
+        also contains the state of the generator when the model was created.
+        The model can be rebuilt with
+        :py:func:`nessai_models.config.model_from_config`.
+
+        Returns
+        -------
+        Dict
+            JSON-serialisable configuration.
+
+        Raises
+        ------
+        TypeError
+            If any of the arguments cannot be saved, e.g. functions, or if
+            the model has been pickled, since the arguments are not included
+            when pickling.
+        """
+        config = dict(
+            name=self.__class__.__name__,
+            kwargs={
+                k: encode_value(v, k)
+                for k, v in self._get_init_kwargs().items()
+            },
+        )
+        if self._init_random_state is not None:
+            name, keys, pos, has_gauss, cached_gaussian = (
+                self._init_random_state
+            )
+            config["random_state"] = [
+                name,
+                keys.tolist(),
+                int(pos),
+                int(has_gauss),
+                float(cached_gaussian),
+            ]
+        return config
+
+    def get_blas_threads(self, n_workers: Optional[int]) -> Optional[int]:
+        """Get the number of BLAS threads for each worker.
+
+        Parameters
+        ----------
+        n_workers : Optional[int]
+            Number of workers.
+
+        Returns
+        -------
+        Optional[int]
+            Number of threads, or None if the limits should not be changed.
+        """
+        if self.n_blas_threads == "auto":
+            if n_workers is None or n_workers <= 1:
+                return None
+            return get_auto_blas_threads(n_workers)
+        return self.n_blas_threads
+
+    def configure_pool(self, pool=None, n_pool: Optional[int] = None):
+        """Configure the multiprocessing pool used by nessai.
+
+        If nessai creates the pool, it is created with the BLAS threads
+        limited to :py:meth:`get_blas_threads` so the workers inherit the
+        limit. User-specified pools should be created within
+        :py:func:`nessai_models.blas.blas_threads` or use
+        :py:func:`nessai_models.blas.limit_blas_threads` in their
+        initializer.
+
+        See :py:meth:`nessai.model.Model.configure_pool` for details of the
+        arguments.
+        """
+        n = None if pool is not None else self.get_blas_threads(n_pool)
+        with blas_threads(n):
+            super().configure_pool(pool=pool, n_pool=n_pool)
+
+    def get_thread_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Get the thread pool for evaluating the log-likelihood.
+
+        The pool is created on the first call and recreated if
+        :code:`n_threads` or :code:`n_blas_threads` change or in a forked
+        process, e.g. a worker in the pool used by nessai. If
+        :code:`n_blas_threads` is an integer, the number of BLAS threads is
+        limited once, when the threads in the pool start. This limit applies
+        to the whole process, since the libraries have a single setting, so
+        it is not applied when :code:`n_blas_threads` is :code:`'auto'`.
+
+        Returns
+        -------
+        Optional[concurrent.futures.ThreadPoolExecutor]
+            The thread pool or None if :code:`n_threads` is one.
+        """
+        if self.n_threads is None or self.n_threads <= 1:
+            return None
+        pid = os.getpid()
+        if self._thread_pool_pid not in (None, pid):
+            # A pool inherited from the parent process after a fork has no
+            # threads and the lock may have been held, so both are replaced
+            self._thread_pool_lock = threading.Lock()
+            self._thread_pool = None
+            self._thread_pool_pid = None
+        # The limit is process-wide, so it is only set if requested
+        if self.n_blas_threads == "auto":
+            n_blas_threads = None
+        else:
+            n_blas_threads = self.get_blas_threads(self.n_threads)
+        key = (self.n_threads, n_blas_threads)
+        with self._thread_pool_lock:
+            self._thread_pool_pid = pid
+            pool = self._thread_pool
+            if pool is None or self._thread_pool_key != key:
+                if pool is not None:
+                    pool.shutdown(wait=False)
+                if n_blas_threads is None:
+                    initializer, initargs = None, ()
+                else:
+                    initializer = limit_blas_threads
+                    initargs = (n_blas_threads, False)
+                pool = ThreadPoolExecutor(
+                    self.n_threads,
+                    thread_name_prefix="nessai_models",
+                    initializer=initializer,
+                    initargs=initargs,
+                )
+                self._thread_pool = pool
+                self._thread_pool_key = key
+        return pool
+
+    def close_thread_pool(self) -> None:
+        """Shutdown the thread pool, if it has been created."""
+        if self._thread_pool is not None:
+            if self._thread_pool_pid == os.getpid():
+                self._thread_pool.shutdown()
+            self._thread_pool = None
+
+    def evaluate_in_threads(
+        self,
+        func: Callable,
+        x: np.ndarray,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Evaluate a function by splitting the samples between threads.
+
+        The samples are split into :code:`n_threads` contiguous chunks that
+        each write to a slice of the output. If :code:`n_threads` is one,
+        the function is called directly.
+
+        Parameters
+        ----------
+        func : Callable
+            Function to evaluate. Must accept an unstructured array of
+            samples.
+        x : numpy.ndarray
+            Unstructured array of samples with shape (n, dims).
+        out : Optional[numpy.ndarray]
+            Preallocated output array with shape (n,).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of outputs.
+        """
+        pool = self.get_thread_pool()
+        if pool is None or x.ndim < 2:
+            return evaluate_in_blocks(func, x, max(x.shape[0], 1), out=out)
+        block_size = -(-x.shape[0] // self.n_threads)
+        return evaluate_in_blocks(
+            func, x, max(block_size, 1), out=out, executor=pool
+        )
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_thread_pool", None)
+        state.pop("_thread_pool_lock", None)
+        state.pop("_thread_pool_pid", None)
+        state.pop("_thread_pool_key", None)
+        # The arguments can include large arrays and are only needed to get
+        # the configuration
+        state.pop("_init_args", None)
+        state.pop("_init_kwargs", None)
+        state.pop("_init_random_state", None)
+        return state
+
+    def iter_evaluate(
+        self,
+        chunks: Iterable[np.ndarray],
+        log_prior: bool = True,
+        log_likelihood: bool = True,
+        n_read_ahead: int = 1,
+        load: bool = True,
+    ) -> Iterator[Tuple[Optional[np.ndarray], Optional[np.ndarray]]]:
+        """Evaluate the log-prior and log-likelihood for chunks of samples.
+
+        Results are yielded chunk by chunk, so the memory usage is set by the
+        chunk size rather than the total number of samples. The next chunks
+        are read on a background thread while the current chunk is
+        evaluated.
+
+        Parameters
+        ----------
+        chunks : Iterable[numpy.ndarray]
+            Iterable of chunks of samples. Each chunk can be a structured
+            array or an unstructured array with shape (n, dims). See
+            :py:func:`nessai_models.utils.iter_chunks` for splitting an
+            array, including memory-mapped arrays, into chunks.
+        log_prior : bool
+            If True, evaluate the log-prior.
+        log_likelihood : bool
+            If True, evaluate the log-likelihood.
+        n_read_ahead : int
+            Number of chunks to read ahead. If zero, the chunks are read on
+            the calling thread.
+        load : bool
+            If True, chunks of memory-mapped arrays are loaded into memory
+            on the background thread, so reading from disk overlaps with
+            the evaluation.
+
+        Yields
+        ------
+        Tuple[Optional[numpy.ndarray], Optional[numpy.ndarray]]
+            The log-prior and log-likelihood for each chunk. Values that
+            are not evaluated are None.
+        """
+        func = load_chunk if load else None
+        for x in read_ahead(chunks, n=n_read_ahead, func=func):
+            if x.dtype.names:
+                log_p = self.log_prior(x) if log_prior else None
+                log_l = self.log_likelihood(x) if log_likelihood else None
+            else:
+                log_p = self.log_prior_array(x) if log_prior else None
+                log_l = (
+                    self.log_likelihood_array(x) if log_likelihood else None
+                )
+            yield log_p, log_l
+
+    def tempered_ln_evidence(
+        self, beta: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """Natural log-evidence for the likelihood raised to the power beta.
+
+        By default, this is only available for beta equal to zero, where
+        the evidence is one since the priors are normalised, and one, if
+        :code:`ln_evidence` is set. Models with analytic evidences should
+        override this method.
+
+        Parameters
+        ----------
+        beta : Union[float, numpy.ndarray]
+            Inverse temperature(s).
+
+        Returns
+        -------
+        Union[float, numpy.ndarray]
+            Log-evidence for each inverse temperature.
+        """
+        beta = np.asarray(beta, dtype=float)
+        known = beta == 0
+        if self.ln_evidence is not None:
+            known |= beta == 1
+        if not np.all(known):
+            raise NotImplementedError(
+                "Tempered evidence is not available for "
+                f"{self.__class__.__name__}"
+            )
+        return np.where(beta == 0, 0.0, self.ln_evidence or 0.0)[()]
+
+    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+        """Compute the log-likelihood for a structured array of samples.
+
+        Calls :py:meth:`log_likelihood_array` with an unstructured view of
+        the samples or, if :code:`skip_out_of_prior` is True,
+        :py:meth:`masked_log_likelihood_array`.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Structured array of samples.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-likelihoods.
+        """
+        if self.skip_out_of_prior:
+            return self.masked_log_likelihood_array(self.unstructured_view(x))
+        return self.log_likelihood_array(self.unstructured_view(x))
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Compute the log-likelihood for an unstructured array of samples.
+
+        Must be implemented by the child class.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims). The order of the
+            parameters must match :code:`names`. Contiguous arrays avoid
+            copies in the underlying numpy operations.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-likelihoods.
+        """
+        raise NotImplementedError
+
+    def log_prior_array(self, x: np.ndarray) -> np.ndarray:
+        """Compute the log-prior for an unstructured array of samples.
+
+        Must be implemented by the child class.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims). The order of the
+            parameters must match :code:`names`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-prior probabilities.
+        """
+        raise NotImplementedError
+
+    def masked_log_likelihood_array(
+        self, x: np.ndarray, mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Compute the log-likelihood only for samples in the prior.
+
+        The log-likelihood is only evaluated for the rows where
+        :code:`mask` is True and is :code:`-inf` for the others.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims).
+        mask : Optional[numpy.ndarray]
+            Boolean array with shape (n,). If not specified, the samples
+            with a finite log-prior are evaluated.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-likelihoods.
+        """
+        if mask is None:
+            mask = np.isfinite(self.log_prior_array(x))
+        mask = np.asarray(mask, dtype=bool)
+        if mask.all():
+            return self.log_likelihood_array(x)
+        log_l = np.full(mask.shape, -np.inf)
+        if mask.any():
+            log_l[mask] = self.log_likelihood_array(x[mask])
+        return log_l
+
+    def log_posterior_array(self, x: np.ndarray) -> np.ndarray:
+        """Compute the unnormalised log-posterior for an unstructured array
+        of samples.
+
+        The log-prior is evaluated first and the log-likelihood is only
+        evaluated for samples with a finite log-prior, see
+        :py:meth:`masked_log_likelihood_array`.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-prior plus log-likelihood.
+        """
+        log_p = self.log_prior_array(x)
+        return log_p + self.masked_log_likelihood_array(x, np.isfinite(log_p))
+
+    def log_posterior(self, x: np.ndarray) -> np.ndarray:
+        """Compute the unnormalised log-posterior for a structured array of
+        samples.
+
+        See :py:meth:`log_posterior_array`.
+        """
+        return self.log_posterior_array(self.unstructured_view(x))
 
 
 class NDimensionalModel(BaseModel):
     """Model with basic init for n-dimensional likelihoods.
 
+    The prior bounds are stored as arrays and the names and bounds dictionary
+    required by nessai are only created when they are first accessed. This
+    keeps construction, the prior and the unit-hypercube transforms fast for
+    models with thousands of dimensions.
+
     Parameters
     ----------
     dims : int
         Number of dimensions.
     bounds : Union[Sequence[float], numpy.ndarray]
         Prior bounds.
+
+    Attributes
+    ----------
+    block_size : Optional[int]
+        Number of samples per block when evaluating large batches. If not set,
+        the block size is determined from the block size in bytes, see
+        :py:func:`nessai_models.utils.get_block_bytes`.
     """
 
+    block_size: Optional[int] = None
+
     def __init__(
         self, dims: int, bounds: Union[Sequence[float], np.ndarray]
     ) -> None:
-        self.names = [f"x_{i}" for i in range(dims)]
+        if dims < 2:
+            # Use the setter from nessai to raise the relevant error
+            self.names = [f"x_{i}" for i in range(dims)]
         if isinstance(bounds, (Sequence, np.ndarray)):
             if len(bounds) == 2:
                 bounds = np.asarray(bounds, dtype=float)
-                self.bounds = {n: bounds for n in self.names}
+                self._lower = np.full(dims, bounds[0])
+                self._upper = np.full(dims, bounds[1])
             else:
                 raise ValueError("bounds must have length 2.")
         else:
             raise TypeError("Invalid type for `bounds` argument.")
 
+    @property
+    def names(self) -> List[str]:
+        """List of the names of each parameter in the model.
+
+        Created from the number of dimensions when first accessed.
+        """
+        if self._names is None and self._lower is not None:
+            self._names = [f"x_{i}" for i in range(self._lower.size)]
+        return Model.names.fget(self)
+
+    @names.setter
+    def names(self, names: List[str]) -> None:
+        Model.names.fset(self, names)
+
+    @property
+    def bounds(self) -> Dict[str, np.ndarray]:
+        """Dictionary with the lower and upper bounds for each parameter.
+
+        Created from the arrays of bounds when first accessed.
+        """
+        if self._bounds is None and self._lower is not None:
+            self._bounds = {
+                n: b
+                for n, b in zip(
+                    self.names, np.stack([self._lower, self._upper], axis=-1)
+                )
+            }
+        return Model.bounds.fget(self)
+
+    @bounds.setter
+    def bounds(self, bounds: Dict[str, np.ndarray]) -> None:
+        if self._lower is not None:
+            # Names are derived from the arrays so must be created first
+            self.names
+        Model.bounds.fset(self, bounds)
+        self._lower = None
+        self._upper = None
+
+    @property
+    def dims(self) -> int:
+        """Number of dimensions in the model"""
+        if self._lower is not None:
+            return self._lower.size
+        return super().dims
+
+    def in_bounds(self, x: np.ndarray) -> np.ndarray:
+        """Check if samples are within the prior bounds.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Structured array of samples.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array that is true for samples within the bounds.
+        """
+        x = self.unstructured_view(x)
+        return np.all(
+            (x >= self.lower_bounds) & (x <= self.upper_bounds), axis=-1
+        )
+
+    def get_block_size(self) -> int:
+        """Get the number of samples per block."""
+        if self.block_size is not None:
+            return self.block_size
+        return max(get_block_bytes() // (8 * self.dims), 1)
+
+    def evaluate_in_blocks(
+        self,
+        func: Callable,
+        x: np.ndarray,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Evaluate a function in cache-sized blocks of samples.
+
+        This avoids allocating full-size temporaries for large batches.
+        Batches that are smaller than the smallest candidate block size are
+        evaluated directly. If :code:`n_threads` is greater than one, the
+        blocks are distributed between the threads in the thread pool.
+
+        Parameters
+        ----------
+        func : Callable
+            Function to evaluate. Must accept an unstructured array of
+            samples.
+        x : numpy.ndarray
+            Unstructured array of samples with shape (n, dims).
+        out : Optional[numpy.ndarray]
+            Preallocated output array with shape (n,).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of outputs.
+        """
+        if self.block_size is None and x.size * 8 <= BLOCK_BYTES_CANDIDATES[0]:
+            block_size = x.shape[0]
+        else:
+            block_size = self.get_block_size()
+        pool = self.get_thread_pool()
+        if pool is None or x.ndim < 2:
+            return evaluate_in_blocks(func, x, max(block_size, 1), out=out)
+        block_size = min(block_size, -(-x.shape[0] // self.n_threads))
+        return evaluate_in_blocks(
+            func, x, max(block_size, 1), out=out, executor=pool
+        )
+
+
+def _uniform_log_prior(
+    in_bounds: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> np.ndarray:
+    """Log-prior for a uniform prior given a boolean array of samples that
+    are within the bounds.
+    """
+    with np.errstate(divide="ignore"):
+        log_p = np.log(in_bounds, dtype=float)
+    log_p -= np.sum(np.log(upper - lower))
+    return log_p
+
 
 class UniformPriorMixin:
     """Mixin class that defines a uniform prior."""
@@ -63,10 +702,27 @@ class UniformPriorMixin:
         numpy.ndarray
             Array of log-probabilities.
         """
-        with np.errstate(divide="ignore"):
-            log_p = np.log(self.in_bounds(x), dtype=float)
-        log_p -= np.sum(np.log(self.upper_bounds - self.lower_bounds))
-        return log_p
+        return _uniform_log_prior(
+            self.in_bounds(x), self.lower_bounds, self.upper_bounds
+        )
+
+    def log_prior_array(self, x: np.ndarray) -> np.ndarray:
+        """Log probability for a uniform prior for an unstructured array.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-probabilities.
+        """
+        lower, upper = self.lower_bounds, self.upper_bounds
+        return _uniform_log_prior(
+            np.all((x >= lower) & (x <= upper), axis=-1), lower, upper
+        )
 
     def to_unit_hypercube(self, x: np.ndarray) -> np.ndarray:
         """Convert the samples to the unit-hypercube.
@@ -82,10 +738,10 @@ class UniformPriorMixin:
             Array of rescaled samples.
         """
         x_out = x.copy()
-        for n in self.names:
-            x_out[n] = (x[n] - self.bounds[n][0]) / (
-                self.bounds[n][1] - self.bounds[n][0]
-            )
+        lower, upper = self.lower_bounds, self.upper_bounds
+        self.unstructured_view(x_out)[...] = (
+            self.unstructured_view(x) - lower
+        ) / (upper - lower)
         return x_out
 
     def from_unit_hypercube(self, x: np.ndarray) -> np.ndarray:
@@ -102,8 +758,70 @@ class UniformPriorMixin:
             Array of sample in the prior space.
         """
         x_out = x.copy()
-        for n in self.names:
-            x_out[n] = (self.bounds[n][1] - self.bounds[n][0]) * x[
-                n
-            ] + self.bounds[n][0]
+        lower, upper = self.lower_bounds, self.upper_bounds
+        self.unstructured_view(x_out)[...] = (
+            upper - lower
+        ) * self.unstructured_view(x) + lower
         return x_out
+
+
+class ModelWrapper(BaseModel):
+    """Model that wraps another model.
+
+    The names, bounds, evidence, prior and likelihood are taken from the
+    wrapped model. Child classes can override specific methods to change
+    their behaviour.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to wrap.
+    """
+
+    def __init__(self, model: BaseModel) -> None:
+        self.model = model
+        self.names = list(model.names)
+        self.bounds = model.bounds
+        self.ln_evidence = model.ln_evidence
+
+    def new_point(self, N: int = 1) -> np.ndarray:
+        """Draw new points using the wrapped model."""
+        return self.model.new_point(N)
+
+    def new_point_log_prob(self, x: np.ndarray) -> np.ndarray:
+        """Log-probability for :py:meth:`new_point` of the wrapped model."""
+        return self.model.new_point_log_prob(x)
+
+    def in_bounds(self, x: np.ndarray) -> np.ndarray:
+        """Check if samples are within the bounds of the wrapped model."""
+        return self.model.in_bounds(x)
+
+    def log_prior(self, x: np.ndarray) -> np.ndarray:
+        """Log-prior of the wrapped model."""
+        return self.model.log_prior(x)
+
+    def log_prior_array(self, x: np.ndarray) -> np.ndarray:
+        """Log-prior of the wrapped model for an unstructured array."""
+        return self.model.log_prior_array(x)
+
+    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood of the wrapped model."""
+        return self.model.log_likelihood(x)
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood of the wrapped model for an unstructured array."""
+        return self.model.log_likelihood_array(x)
+
+    def tempered_ln_evidence(
+        self, beta: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """Tempered log-evidence of the wrapped model."""
+        return self.model.tempered_ln_evidence(beta)
+
+    def to_unit_hypercube(self, x: np.ndarray) -> np.ndarray:
+        """Convert samples to the unit-hypercube using the wrapped model."""
+        return self.model.to_unit_hypercube(x)
+
+    def from_unit_hypercube(self, x: np.ndarray) -> np.ndarray:
+        """Convert samples from the unit-hypercube using the wrapped model."""
+        return self.model.from_unit_hypercube(x)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Coalesce single-point likelihood evaluations into batches.
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .base import BaseModel
+
+
+class LikelihoodBatcher:
+    """Asyncio front end that coalesces log-likelihood requests into batches.
+
+    Requests are queued until either :code:`max_batch_size` samples are
+    pending or :code:`max_latency` seconds have passed since the first
+    pending request. The queued samples are then evaluated with a single
+    vectorised call and the results are returned to each of the callers.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to evaluate.
+    max_batch_size : int
+        Maximum number of samples per batch. A batch is evaluated as soon as
+        this many samples are pending.
+    max_latency : float
+        Maximum time in seconds a request waits before the pending batch is
+        evaluated.
+    executor : Optional[concurrent.futures.Executor]
+        Executor used to evaluate the batches. If not specified, batches are
+        evaluated in the event loop, which blocks it during the evaluation.
+
+    Examples
+    --------
+    >>> batcher = LikelihoodBatcher(model, max_batch_size=128)
+    >>> async def evaluate(points):
+    ...     return await asyncio.gather(
+    ...         *(batcher.log_likelihood(p) for p in points)
+    ...     )
+    """
+
+    def __init__(
+        self,
+        model: BaseModel,
+        max_batch_size: int = 256,
+        max_latency: float = 1e-3,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_latency < 0:
+            raise ValueError("max_latency cannot be negative")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.executor = executor
+
+        self.n_batches = 0
+        self.n_samples = 0
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._n_pending = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Mean number of samples per evaluated batch."""
+        if not self.n_batches:
+            return 0.0
+        return self.n_samples / self.n_batches
+
+    async def log_likelihood(self, x: np.ndarray) -> Union[float, np.ndarray]:
+        """Queue samples for evaluation and wait for the log-likelihood.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Structured array of one or more samples or an unstructured array
+            with shape (dims,) or (n, dims).
+
+        Returns
+        -------
+        Union[float, numpy.ndarray]
+            Log-likelihood. A float is returned for a single sample and an
+            array otherwise.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((x, future))
+        self._n_pending += _n_samples(x)
+        if self._n_pending >= self.max_batch_size:
+            self.flush()
+        elif self._handle is None:
+            self._handle = loop.call_later(self.max_latency, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Evaluate all of the pending requests."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self._n_pending = 0
+        if self.executor is None:
+            self._resolve(batch, *self._evaluate(batch))
+        else:
+            task = asyncio.ensure_future(self._evaluate_in_executor(batch))
+            # Keep a reference to the task until it is complete
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _evaluate_in_executor(self, batch: list) -> None:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            self.executor, self._evaluate, batch
+        )
+        self._resolve(batch, *results)
+
+    def _evaluate(
+        self, batch: list
+    ) -> Tuple[Optional[list], Optional[Exception], List[int]]:
+        """Evaluate a batch of requests with a single vectorised call per
+        type of input (structured or unstructured).
+
+        Also returns the number of samples in each call. The counters are
+        updated by :py:meth:`_resolve` in the event loop, since this can run
+        in an executor.
+        """
+        sizes = []
+        try:
+            results = len(batch) * [None]
+            structured = [i for i, (x, _) in enumerate(batch) if x.dtype.names]
+            unstructured = [
+                i for i, (x, _) in enumerate(batch) if not x.dtype.names
+            ]
+            for indices, func, prepare in [
+                (structured, self.model.log_likelihood, np.atleast_1d),
+                (unstructured, self.model.log_likelihood_array, np.atleast_2d),
+            ]:
+                if not indices:
+                    continue
+                x = np.concatenate([prepare(batch[i][0]) for i in indices])
+                log_l = np.atleast_1d(func(x))
+                sizes.append(len(x))
+                start = 0
+                for i in indices:
+                    n = _n_samples(batch[i][0])
+                    results[i] = log_l[start : start + n]
+                    start += n
+            return results, None, sizes
+        except Exception as e:
+            return None, e, sizes
+
+    def _resolve(
+        self,
+        batch: list,
+        results: Optional[list],
+        error: Optional[Exception],
+        sizes: List[int],
+    ) -> None:
+        self.n_batches += len(sizes)
+        self.n_samples += sum(sizes)
+        for i, (x, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            elif _is_single_sample(x):
+                future.set_result(float(results[i][0]))
+            else:
+                future.set_result(results[i])
+
+
+def _is_single_sample(x: np.ndarray) -> bool:
+    if x.dtype.names:
+        return x.ndim == 0
+    return x.ndim == 1
+
+
+def _n_samples(x: np.ndarray) -> int:
+    if _is_single_sample(x):
+        return 1
+    return x.shape[0]
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Control of the number of threads used by BLAS and OpenMP libraries.
+
+Limits are set at runtime using :code:`threadpoolctl` if it is installed.
+The standard environment variables are also set so that any new processes,
+including those started with the spawn start method, use the same limit.
+"""
+from contextlib import contextmanager
+import os
+import threading
+from typing import Iterator, Optional
+import warnings
+
+try:
+    from threadpoolctl import ThreadpoolController
+except ImportError:
+    ThreadpoolController = None
+
+BLAS_ENVIRONMENT_VARIABLES = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+"""Environment variables read by BLAS and OpenMP libraries at start-up."""
+
+_controller = None
+_controller_pid = None
+_controller_lock = threading.Lock()
+
+
+def _get_controller():
+    """Get the threadpoolctl controller, or None if threadpoolctl is not
+    installed.
+
+    The controller is created once per process since finding the loaded
+    libraries is relatively slow.
+    """
+    global _controller, _controller_pid
+    if ThreadpoolController is None:
+        return None
+    with _controller_lock:
+        if _controller is None or _controller_pid != os.getpid():
+            _controller = ThreadpoolController()
+            _controller_pid = os.getpid()
+    return _controller
+
+
+def get_cpu_count() -> int:
+    """Number of CPUs available to the current process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_auto_blas_threads(n_workers: int) -> int:
+    """Number of BLAS threads per worker that avoids oversubscription.
+
+    Parameters
+    ----------
+    n_workers : int
+        Number of worker processes or threads.
+
+    Returns
+    -------
+    int
+        The number of available CPUs divided by the number of workers, at
+        least one.
+    """
+    return max(get_cpu_count() // max(n_workers, 1), 1)
+
+
+def get_blas_threads() -> Optional[int]:
+    """Get the maximum number of threads used by the BLAS and OpenMP
+    libraries loaded in the current process.
+
+    Returns
+    -------
+    Optional[int]
+        The number of threads or None if threadpoolctl is not installed or
+        no libraries are loaded.
+    """
+    controller = _get_controller()
+    if controller is None:
+        return None
+    n = [info["num_threads"] for info in controller.info()]
+    return max(n) if n else None
+
+
+def _set_environment(n: int) -> dict:
+    previous = {k: os.environ.get(k) for k in BLAS_ENVIRONMENT_VARIABLES}
+    for key in BLAS_ENVIRONMENT_VARIABLES:
+        os.environ[key] = str(n)
+    return previous
+
+
+def _restore_environment(previous: dict) -> None:
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+def limit_blas_threads(n: int, environment: bool = True) -> None:
+    """Limit the number of BLAS and OpenMP threads for the rest of the
+    process.
+
+    Intended for use in the initializer of a worker pool.
+
+    Parameters
+    ----------
+    n : int
+        Number of threads.
+    environment : bool
+        If True, also set the environment variables in
+        :code:`BLAS_ENVIRONMENT_VARIABLES`.
+    """
+    if environment:
+        _set_environment(n)
+    controller = _get_controller()
+    if controller is None:
+        if environment:
+            warnings.warn(
+                "threadpoolctl is not installed, the number of BLAS threads "
+                "will only be limited for new processes"
+            )
+        else:
+            warnings.warn(
+                "threadpoolctl is not installed, the number of BLAS threads "
+                "cannot be changed"
+            )
+    else:
+        controller.limit(limits=n)
+
+
+@contextmanager
+def blas_threads(n: Optional[int], environment: bool = True) -> Iterator:
+    """Context manager that limits the number of BLAS and OpenMP threads.
+
+    Processes forked within the context, e.g. a :code:`multiprocessing`
+    pool, inherit the limit and, if :code:`environment` is True, spawned
+    processes inherit it via the environment variables.
+
+    Parameters
+    ----------
+    n : Optional[int]
+        Number of threads. If None, the limits are not changed.
+    environment : bool
+        If True, also set the environment variables in
+        :code:`BLAS_ENVIRONMENT_VARIABLES`.
+
+    Examples
+    --------
+    Create a pool where each worker uses a single BLAS thread
+
+    >>> with blas_threads(1):
+    ...     pool = multiprocessing.Pool(4)
+    """
+    if n is None:
+        yield
+        return
+    previous = _set_environment(n) if environment else None
+    controller = _get_controller()
+    try:
+        if controller is None:
+            if not environment:
+                warnings.warn(
+                    "threadpoolctl is not installed, the number of BLAS "
+                    "threads cannot be changed"
+                )
+            yield
+        else:
+            with controller.limit(limits=n):
+                yield
+    finally:
+        if previous is not None:
+            _restore_environment(previous)
@@ -5,9 +5,9 @@ Likelihood described in Brewer et al. arXiv:0912.2380
 from typing import Sequence, Union
 
 import numpy as np
-from scipy.stats import multivariate_normal
 
 from .base import NDimensionalModel, UniformPriorMixin
+from .distributions import MultivariateNormal
 
 
 class Brewer(UniformPriorMixin, NDimensionalModel):
@@ -48,29 +48,29 @@ class Brewer(UniformPriorMixin, NDimensionalModel):
 
         self.weight = weight
         self.ln_weight = np.log(weight)
-        self.v_dist = multivariate_normal(
-            mean=v_mean * np.ones(self.dims),
-            cov=(v_width**2) * np.eye(self.dims),
+        self.v_dist = MultivariateNormal(
+            mean=v_mean, cov=v_width**2, dims=self.dims
         )
-        self.u_dist = multivariate_normal(
-            mean=u_mean * np.ones(self.dims),
-            cov=(u_width**2) * np.eye(self.dims),
+        self.u_dist = MultivariateNormal(
+            mean=u_mean, cov=u_width**2, dims=self.dims
         )
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
         """Likelihood function.
 
         Parameters
         ----------
         x : numpy.ndarray
-            Structured array of parameters.
+            Unstructured array of parameters with shape (n, dims).
 
         Returns
         -------
         numpy.ndarray
             Array of log-likelihood values.
         """
-        x = self.unstructured_view(x)
+        return self.evaluate_in_blocks(self._log_likelihood_block, x)
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
         return np.logaddexp(
             self.v_dist.logpdf(x),
             self.ln_weight + self.u_dist.logpdf(x),
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Command-line interface for re-evaluating models on nessai results.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from .blas import limit_blas_threads
+from .config import load_config, model_from_config
+from .utils import iter_chunks, read_ahead
+
+OUTPUT_DTYPE = [("logP", "f8"), ("logL", "f8")]
+"""Data type of the output array."""
+
+_worker_model = None
+
+
+def _init_worker(config: Dict, n_blas_threads: Optional[int]) -> None:
+    global _worker_model
+    if n_blas_threads is not None:
+        limit_blas_threads(n_blas_threads)
+    _worker_model = model_from_config(config)
+
+
+def _evaluate_chunk(x: np.ndarray):
+    return (
+        _worker_model.log_prior_array(x),
+        _worker_model.log_likelihood_array(x),
+    )
+
+
+def _open_samples(filename: str, key: str):
+    """Open the samples in a result file.
+
+    HDF5 datasets are returned without reading them so they can be read in
+    chunks.
+    """
+    ext = os.path.splitext(filename)[1].lstrip(".")
+    if ext in ("hdf5", "h5"):
+        import h5py
+
+        f = h5py.File(filename, "r")
+        if key not in f:
+            raise KeyError(f"{key} not found in {filename}")
+        return f[key], f
+    elif ext == "json":
+        with open(filename, "r") as f:
+            samples = json.load(f)[key]
+        if isinstance(samples, dict):
+            dtype = [(k, "f8") for k in samples]
+            out = np.empty(len(next(iter(samples.values()))), dtype=dtype)
+            for k, v in samples.items():
+                out[k] = v
+            samples = out
+        return samples, None
+    else:
+        raise ValueError(f"Unknown file extension: {ext}")
+
+
+def evaluate_result_file(
+    filename: str,
+    output: str,
+    model=None,
+    config: Optional[str] = None,
+    key: str = "posterior_samples",
+    chunk_size: int = 100_000,
+    n_workers: int = 1,
+    n_read_ahead: int = 2,
+    verbose: bool = True,
+) -> np.ndarray:
+    """Re-evaluate the log-prior and log-likelihood for a nessai result file.
+
+    The samples are read and evaluated in chunks and the results are
+    written to a memory-mapped :code:`.npy` file with fields :code:`logP`
+    and :code:`logL`, so the memory usage does not depend on the number of
+    samples.
+
+    Parameters
+    ----------
+    filename : str
+        Result file produced by nessai, either HDF5 or JSON.
+    output : str
+        Name of the output :code:`.npy` file.
+    model : Optional[nessai_models.base.BaseModel]
+        Model to evaluate. If not specified, the model is rebuilt from
+        :code:`config`.
+    config : Optional[str]
+        Configuration file written by
+        :py:func:`nessai_models.config.save_config`. Defaults to
+        :code:`model_config.json` in the same directory as the result file.
+    key : str
+        Samples to evaluate, e.g. :code:`posterior_samples` or
+        :code:`nested_samples`.
+    chunk_size : int
+        Number of samples per chunk.
+    n_workers : int
+        Number of worker processes. Each worker rebuilds the model from its
+        configuration and limits the number of BLAS threads using
+        :py:meth:`nessai_models.base.BaseModel.get_blas_threads`.
+    n_read_ahead : int
+        Number of chunks to read ahead on a background thread.
+    verbose : bool
+        If True, report the progress and throughput to stderr.
+
+    Returns
+    -------
+    numpy.memmap
+        Memory-mapped array of results.
+    """
+    if model is None:
+        if config is None:
+            config = os.path.join(
+                os.path.dirname(os.path.abspath(filename)), "model_config.json"
+            )
+        model = load_config(config)
+
+    samples, handle = _open_samples(filename, key)
+    try:
+        missing = set(model.names) - set(samples.dtype.names)
+        if missing:
+            raise ValueError(f"Samples are missing parameters: {missing}")
+        n = len(samples)
+        out = np.lib.format.open_memmap(
+            output, mode="w+", dtype=OUTPUT_DTYPE, shape=(n,)
+        )
+
+        def prepare(chunk):
+            return np.stack([chunk[name] for name in model.names], axis=-1)
+
+        start_time = time.perf_counter()
+        done = 0
+
+        def write(log_p, log_l):
+            nonlocal done
+            out["logP"][done : done + len(log_l)] = log_p
+            out["logL"][done : done + len(log_l)] = log_l
+            done += len(log_l)
+            if verbose:
+                rate = done / (time.perf_counter() - start_time)
+                print(
+                    f"{done}/{n} samples ({100 * done / max(n, 1):.1f}%), "
+                    f"{rate:.3e} samples/s",
+                    file=sys.stderr,
+                )
+
+        chunks = read_ahead(
+            iter_chunks(samples, chunk_size), n=n_read_ahead, func=prepare
+        )
+        try:
+            if n_workers > 1:
+                with ProcessPoolExecutor(
+                    n_workers,
+                    initializer=_init_worker,
+                    initargs=(
+                        model.get_config(),
+                        model.get_blas_threads(n_workers),
+                    ),
+                ) as executor:
+                    pending = deque()
+                    for x in chunks:
+                        pending.append(executor.submit(_evaluate_chunk, x))
+                        if len(pending) >= 2 * n_workers:
+                            write(*pending.popleft().result())
+                    while pending:
+                        write(*pending.popleft().result())
+            else:
+                for log_p, log_l in model.iter_evaluate(
+                    chunks, n_read_ahead=0
+                ):
+                    write(log_p, log_l)
+        finally:
+            # Stop the read-ahead thread if the evaluation fails
+            chunks.close()
+        out.flush()
+    finally:
+        if handle is not None:
+            handle.close()
+    return out
+
+
+def main(args=None) -> None:
+    """Entry point for :code:`nessai-models-evaluate`."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Re-evaluate the log-prior and log-likelihood of a nessai_models "
+            "model for the samples in a nessai result file."
+        )
+    )
+    parser.add_argument("result", help="nessai result file (HDF5 or JSON).")
+    parser.add_argument("output", help="Output .npy file.")
+    parser.add_argument(
+        "--config",
+        help=(
+            "Model configuration file. Defaults to model_config.json in the "
+            "same directory as the result file."
+        ),
+    )
+    parser.add_argument(
+        "--key",
+        default="posterior_samples",
+        help="Samples to evaluate, e.g. posterior_samples or nested_samples.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--n-workers", type=int, default=1)
+    parser.add_argument("--read-ahead", type=int, default=2)
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(args)
+
+    start = time.perf_counter()
+    out = evaluate_result_file(
+        args.result,
+        args.output,
+        config=args.config,
+        key=args.key,
+        chunk_size=args.chunk_size,
+        n_workers=args.n_workers,
+        n_read_ahead=args.read_ahead,
+        verbose=not args.quiet,
+    )
+    if not args.quiet:
+        duration = time.perf_counter() - start
+        print(
+            f"Evaluated {len(out)} samples in {duration:.2f} s "
+            f"({len(out) / duration:.3e} samples/s)",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Save and rebuild models from their configuration.
+"""
+import json
+from typing import Any, Dict
+
+import numpy as np
+
+
+def encode_value(value: Any, name: str = "value") -> Any:
+    """Encode a value so it can be saved as JSON.
+
+    Supports numbers, strings, None, lists, tuples, dictionaries, numpy
+    arrays and models, which are encoded using their configuration.
+
+    Parameters
+    ----------
+    value : Any
+        Value to encode.
+    name : str
+        Name of the value used in the error message.
+
+    Returns
+    -------
+    Any
+        JSON-serialisable value.
+
+    Raises
+    ------
+    TypeError
+        If the value cannot be encoded.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v, name) for v in value]
+    if isinstance(value, dict):
+        return {str(k): encode_value(v, name) for k, v in value.items()}
+    if hasattr(value, "get_config"):
+        return {"__model__": value.get_config()}
+    raise TypeError(
+        f"Cannot save {name} of type {type(value).__name__} in the "
+        "model configuration"
+    )
+
+
+def decode_value(value: Any) -> Any:
+    """Decode a value encoded with :py:func:`encode_value`."""
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    if isinstance(value, dict):
+        if "__ndarray__" in value:
+            return np.array(value["__ndarray__"], dtype=value["dtype"])
+        if "__model__" in value:
+            return model_from_config(value["__model__"])
+        return {k: decode_value(v) for k, v in value.items()}
+    return value
+
+
+def model_from_config(config: Dict[str, Any]):
+    """Rebuild a model from its configuration.
+
+    The global numpy random state is set to the state when the original
+    model was created, so models that draw random data, e.g. the signal
+    models, are rebuilt with the same data. The random state is restored
+    afterwards.
+
+    Parameters
+    ----------
+    config : Dict[str, Any]
+        Configuration returned by
+        :py:meth:`nessai_models.base.BaseModel.get_config`.
+
+    Returns
+    -------
+    nessai_models.base.BaseModel
+        The model.
+    """
+    import nessai_models
+
+    try:
+        ModelClass = getattr(nessai_models, config["name"])
+    except AttributeError:
+        raise ValueError(f"Unknown model: {config['name']}")
+    kwargs = decode_value(config.get("kwargs", {}))
+    random_state = config.get("random_state")
+    if random_state is None:
+        return ModelClass(**kwargs)
+    current_state = np.random.get_state()
+    try:
+        name, keys, pos, has_gauss, cached_gaussian = random_state
+        np.random.set_state(
+            (
+                name,
+                np.array(keys, dtype=np.uint32),
+                pos,
+                has_gauss,
+                cached_gaussian,
+            )
+        )
+        return ModelClass(**kwargs)
+    finally:
+        np.random.set_state(current_state)
+
+
+def save_config(model, filename: str) -> None:
+    """Save the configuration of a model to a JSON file.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to save.
+    filename : str
+        Name of the file.
+    """
+    with open(filename, "w") as f:
+        json.dump(model.get_config(), f, indent=4)
+
+
+def load_config(filename: str):
+    """Rebuild a model from a configuration file.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file written by :py:func:`save_config`.
+
+    Returns
+    -------
+    nessai_models.base.BaseModel
+        The model.
+    """
+    with open(filename, "r") as f:
+        return model_from_config(json.load(f))
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Wrapper that adds a synthetic cost to the likelihood of any model.
+"""
+import time
+from typing import Optional
+
+import numpy as np
+
+from .base import BaseModel, ModelWrapper
+
+
+class CostModel(ModelWrapper):
+    """Wrapper that adds a configurable cost per likelihood evaluation.
+
+    Intended for testing how samplers scale with the number of workers when
+    the likelihood is expensive. The log-likelihood is the same as the
+    wrapped model.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to wrap.
+    cost : float
+        Mean cost in seconds per point.
+    mode : str, {'busy', 'sleep'}
+        How the cost is incurred. :code:`'busy'` spins in a loop and holds
+        the GIL, so only scales with processes, which mimics CPU-bound
+        likelihoods. :code:`'sleep'` releases the GIL, which mimics
+        likelihoods that wait on I/O or external code.
+    jitter : float
+        Coefficient of variation of the cost per point. If non-zero, the
+        cost for each point is drawn from a log-normal distribution with
+        mean :code:`cost`.
+    seed : Optional[int]
+        Seed for the random number generator used for the jitter.
+    """
+
+    modes = ("busy", "sleep")
+
+    def __init__(
+        self,
+        model: BaseModel,
+        cost: float = 1e-3,
+        mode: str = "busy",
+        jitter: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        if cost < 0:
+            raise ValueError("cost cannot be negative")
+        if jitter < 0:
+            raise ValueError("jitter cannot be negative")
+        if mode not in self.modes:
+            raise ValueError(
+                f"Unknown mode: {mode}. Choose from: {self.modes}"
+            )
+        super().__init__(model)
+        self.cost = cost
+        self.mode = mode
+        self.jitter = jitter
+        self.rng = np.random.default_rng(seed)
+
+    def sample_cost(self, n: int) -> float:
+        """Draw the total cost in seconds for evaluating n points.
+
+        Parameters
+        ----------
+        n : int
+            Number of points.
+
+        Returns
+        -------
+        float
+            Total cost in seconds.
+        """
+        if not self.jitter or not self.cost:
+            return n * self.cost
+        sigma2 = np.log1p(self.jitter**2)
+        return float(
+            np.sum(
+                self.rng.lognormal(
+                    np.log(self.cost) - 0.5 * sigma2, np.sqrt(sigma2), size=n
+                )
+            )
+        )
+
+    def expected_time(self, n: int, n_workers: int = 1) -> float:
+        """Expected time to evaluate n points with perfect scaling.
+
+        Points are assumed to be split evenly between the workers.
+
+        Parameters
+        ----------
+        n : int
+            Number of points.
+        n_workers : int
+            Number of workers.
+
+        Returns
+        -------
+        float
+            Expected time in seconds.
+        """
+        return -(-n // n_workers) * self.cost
+
+    def ideal_speedup(self, n: int, n_workers: int) -> float:
+        """Ideal speed-up for evaluating n points with n_workers workers."""
+        return self.expected_time(n) / self.expected_time(n, n_workers)
+
+    def incur_cost(self, n: int) -> None:
+        """Incur the cost for evaluating n points.
+
+        Parameters
+        ----------
+        n : int
+            Number of points.
+        """
+        duration = self.sample_cost(n)
+        if self.mode == "sleep":
+            time.sleep(duration)
+        else:
+            end = time.perf_counter() + duration
+            while time.perf_counter() < end:
+                pass
+
+    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood of the wrapped model with the added cost."""
+        self.incur_cost(max(x.size, 1))
+        return super().log_likelihood(x)
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood of the wrapped model with the added cost for an
+        unstructured array.
+        """
+        self.incur_cost(x.shape[0] if x.ndim > 1 else 1)
+        return super().log_likelihood_array(x)
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+Multivariate normal distributions with deferred and cached factorisations.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from scipy.linalg import cholesky, solve_triangular
+
+from .utils import get_cache_dir
+
+FACTORISATION_CACHE_BYTES = 2**28
+"""Maximum total size, in bytes, of the factorisations cached in memory.
+Can be overridden with the :code:`NESSAI_MODELS_FACTORISATION_CACHE_BYTES`
+environment variable.
+"""
+
+_factorisation_cache = OrderedDict()
+_factorisation_cache_bytes = 0
+_factorisation_cache_lock = threading.Lock()
+
+
+def _disk_cache_enabled() -> bool:
+    return os.environ.get(
+        "NESSAI_MODELS_CACHE_FACTORISATIONS", ""
+    ).lower() in ("1", "true", "yes")
+
+
+def _get_cache_bytes() -> int:
+    value = os.environ.get("NESSAI_MODELS_FACTORISATION_CACHE_BYTES")
+    if value:
+        return int(value)
+    return FACTORISATION_CACHE_BYTES
+
+
+def hash_array(x: np.ndarray) -> str:
+    """Compute a hash of the contents of an array.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Array to hash.
+
+    Returns
+    -------
+    str
+        Hexadecimal hash.
+    """
+    x = np.ascontiguousarray(x)
+    h = hashlib.sha256()
+    h.update(f"{x.dtype.str}{x.shape}".encode())
+    h.update(x.data)
+    return h.hexdigest()
+
+
+def get_cholesky_factor(cov: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Get the lower Cholesky factor and log-determinant of a covariance
+    matrix.
+
+    Factorisations are cached in memory, keyed by a hash of the covariance
+    matrix, so repeated constructions of the same model only factorise the
+    covariance once per process. The least recently used factorisations are
+    discarded once their total size exceeds
+    :py:data:`FACTORISATION_CACHE_BYTES`. If the
+    :code:`NESSAI_MODELS_CACHE_FACTORISATIONS` environment variable is set
+    to :code:`1`, factorisations are also cached on disk in the cache
+    directory (see :py:func:`nessai_models.utils.get_cache_dir`), which
+    allows them to be shared between processes and runs.
+
+    Parameters
+    ----------
+    cov : numpy.ndarray
+        Positive definite covariance matrix.
+
+    Returns
+    -------
+    numpy.ndarray
+        Lower triangular Cholesky factor.
+    float
+        Natural log of the determinant of the covariance matrix.
+    """
+    key = hash_array(cov)
+    with _factorisation_cache_lock:
+        if key in _factorisation_cache:
+            _factorisation_cache.move_to_end(key)
+            return _factorisation_cache[key]
+
+    factor = None
+    if _disk_cache_enabled():
+        filename = os.path.join(
+            get_cache_dir(), "factorisations", f"{key}.npy"
+        )
+        try:
+            factor = np.load(filename)
+        except (OSError, ValueError):
+            pass
+        else:
+            # Ignore files that do not match, e.g. if they were corrupted
+            if factor.shape != cov.shape:
+                factor = None
+    if factor is None:
+        factor = cholesky(cov, lower=True, check_finite=False)
+        if _disk_cache_enabled():
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            tmp = f"{filename}.{os.getpid()}.npy"
+            np.save(tmp, factor)
+            os.replace(tmp, filename)
+    log_det = 2 * np.sum(np.log(np.diag(factor)))
+
+    global _factorisation_cache_bytes
+    max_bytes = _get_cache_bytes()
+    with _factorisation_cache_lock:
+        if key not in _factorisation_cache:
+            _factorisation_cache[key] = (factor, log_det)
+            _factorisation_cache_bytes += factor.nbytes
+        while _factorisation_cache_bytes > max_bytes:
+            old_factor, _ = _factorisation_cache.popitem(last=False)[1]
+            _factorisation_cache_bytes -= old_factor.nbytes
+    return factor, log_det
+
+
+def clear_factorisation_cache() -> None:
+    """Clear the in-memory cache of factorisations."""
+    global _factorisation_cache_bytes
+    with _factorisation_cache_lock:
+        _factorisation_cache.clear()
+        _factorisation_cache_bytes = 0
+
+
+class MultivariateNormal:
+    """Multivariate normal distribution with a deferred factorisation.
+
+    Alternative to :py:func:`scipy.stats.multivariate_normal` that does not
+    factorise the covariance matrix until :py:meth:`logpdf` is first
+    called. Diagonal covariance matrices are never factorised and dense
+    covariance matrices are factorised using
+    :py:func:`get_cholesky_factor`, which caches the result.
+
+    Parameters
+    ----------
+    mean : Union[float, numpy.ndarray]
+        Mean of the distribution.
+    cov : Union[float, numpy.ndarray]
+        Covariance matrix. A scalar or 1-dimensional array is interpreted as
+        the diagonal of the covariance matrix.
+    dims : Optional[int]
+        Number of dimensions. If not specified, it is inferred from the mean
+        and covariance.
+    """
+
+    def __init__(
+        self,
+        mean: Union[float, np.ndarray] = 0.0,
+        cov: Union[float, np.ndarray] = 1.0,
+        dims: Optional[int] = None,
+    ) -> None:
+        mean = np.asarray(mean, dtype=float)
+        cov = np.asarray(cov, dtype=float)
+        if dims is None:
+            if mean.ndim:
+                dims = mean.size
+            else:
+                dims = cov.shape[0] if cov.ndim else 1
+        if mean.ndim and mean.shape != (dims,):
+            raise ValueError(f"mean must have shape ({dims},)")
+        self.dims = dims
+        self.mean = np.broadcast_to(mean, (dims,))
+        if cov.ndim == 2 and cov.shape != (dims, dims):
+            raise ValueError(
+                f"cov must have shape ({dims}, {dims}), got {cov.shape}"
+            )
+        elif cov.ndim > 2:
+            raise ValueError("cov must be at most 2-dimensional")
+        if cov.ndim == 2 and not np.any(cov[~np.eye(dims, dtype=bool)]):
+            cov = np.diag(cov).copy()
+        self._diagonal = cov.ndim < 2
+        if self._diagonal:
+            self.variance = np.broadcast_to(cov, (dims,))
+            if np.any(self.variance <= 0):
+                raise ValueError("Variances must be positive")
+        self._cov = cov
+        self._factor = None
+        self._whiten = None
+        self._log_det = None
+
+    @property
+    def cov(self) -> np.ndarray:
+        """Covariance matrix."""
+        if self._diagonal:
+            return np.diag(self.variance)
+        return self._cov
+
+    @property
+    def factorised(self) -> bool:
+        """Whether the covariance matrix has been factorised."""
+        return self._log_det is not None
+
+    def _factorise(self) -> None:
+        if self._diagonal:
+            # Same operations as scipy so the results agree to rounding
+            self._whiten = np.sqrt(1 / self.variance)
+            log_det = np.sum(np.log(self.variance))
+        else:
+            self._factor, log_det = get_cholesky_factor(self._cov)
+        self._log_const = self.dims * np.log(2 * np.pi) + log_det
+        # Set last since this marks the distribution as factorised
+        self._log_det = log_det
+
+    def logpdf(self, x: np.ndarray) -> Union[float, np.ndarray]:
+        """Log-probability density.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims) or (dims,).
+
+        Returns
+        -------
+        Union[float, numpy.ndarray]
+            Log-probability for each sample.
+        """
+        if not self.factorised:
+            self._factorise()
+        diff = np.atleast_2d(x) - self.mean
+        if self._diagonal:
+            z = diff * self._whiten
+            maha = np.sum(z * z, axis=-1)
+        else:
+            z = solve_triangular(
+                self._factor, diff.T, lower=True, check_finite=False
+            )
+            maha = np.sum(z * z, axis=0)
+        log_p = -0.5 * (self._log_const + maha)
+        if np.ndim(x) < 2:
+            return log_p[0]
+        return log_p
+
+    def pdf(self, x: np.ndarray) -> Union[float, np.ndarray]:
+        """Probability density."""
+        return np.exp(self.logpdf(x))
+
+
+class LowRankMultivariateNormal:
+    """Multivariate normal with a diagonal plus low-rank covariance matrix.
+
+    The covariance matrix is :math:`C = D + U U^T` where :math:`D` is
+    diagonal and :math:`U` has shape (dims, rank). The Woodbury identity and
+    matrix determinant lemma are used to evaluate the log-probability
+    without forming :math:`C`, so the memory and the cost per sample are
+    O(dims * rank).
+
+    Parameters
+    ----------
+    mean : Union[float, numpy.ndarray]
+        Mean of the distribution.
+    diagonal : Union[float, numpy.ndarray]
+        Diagonal :math:`D` of the covariance matrix.
+    factor : numpy.ndarray
+        Low-rank factor :math:`U` with shape (dims, rank).
+    """
+
+    def __init__(
+        self,
+        mean: Union[float, np.ndarray],
+        diagonal: Union[float, np.ndarray],
+        factor: np.ndarray,
+    ) -> None:
+        self.factor = np.asarray(factor, dtype=float)
+        if self.factor.ndim != 2:
+            raise ValueError("factor must be 2-dimensional")
+        self.dims, self.rank = self.factor.shape
+        self.mean = np.broadcast_to(
+            np.asarray(mean, dtype=float), (self.dims,)
+        )
+        self.diagonal = np.broadcast_to(
+            np.asarray(diagonal, dtype=float), (self.dims,)
+        )
+        if np.any(self.diagonal <= 0):
+            raise ValueError("diagonal must be positive")
+
+        self._precision = 1 / self.diagonal
+        scaled = self._precision[:, np.newaxis] * self.factor
+        capacitance = np.eye(self.rank) + self.factor.T @ scaled
+        chol = cholesky(capacitance, lower=True, check_finite=False)
+        # C^-1 = D^-1 - W W^T with W = D^-1 U L^-T
+        self._woodbury = solve_triangular(
+            chol, scaled.T, lower=True, check_finite=False
+        ).T
+        self.log_det = np.sum(np.log(self.diagonal)) + 2 * np.sum(
+            np.log(np.diag(chol))
+        )
+        self._log_norm = -0.5 * (self.dims * np.log(2 * np.pi) + self.log_det)
+
+    @property
+    def cov(self) -> np.ndarray:
+        """Dense covariance matrix.
+
+        Requires O(dims^2) memory.
+        """
+        return np.diag(self.diagonal) + self.factor @ self.factor.T
+
+    def logpdf(self, x: np.ndarray) -> Union[float, np.ndarray]:
+        """Log-probability density.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims) or (dims,).
+
+        Returns
+        -------
+        Union[float, numpy.ndarray]
+            Log-probability for each sample.
+        """
+        diff = np.atleast_2d(x) - self.mean
+        z = diff @ self._woodbury
+        maha = (diff * diff) @ self._precision - np.sum(z * z, axis=-1)
+        log_p = self._log_norm - 0.5 * maha
+        if np.ndim(x) < 2:
+            return log_p[0]
+        return log_p
+
+    def rvs(
+        self, size: int = 1, random_state: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """Draw samples from the distribution.
+
+        Parameters
+        ----------
+        size : int
+            Number of samples.
+        random_state : Optional[numpy.random.Generator]
+            Random number generator. If not specified, the global numpy
+            random state is used.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of samples with shape (size, dims).
+        """
+        if random_state is None:
+            normal = np.random.standard_normal
+        else:
+            normal = random_state.standard_normal
+        return (
+            self.mean
+            + np.sqrt(self.diagonal) * normal((size, self.dims))
+            + normal((size, self.rank)) @ self.factor.T
+        )
@@ -35,21 +35,19 @@ class EggBox(UniformPriorMixin, NDimensionalModel):
     ) -> None:
         super().__init__(dims, bounds)
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
         """Compute the log-likelihood.
 
         Parameters
         ----------
         x :
-            Point or array of points as a structured array with fields
-            that match the names of the model.
+            Point or array of points as an unstructured array with shape
+            (n, dims).
 
         Returns
         -------
         numpy.ndarray
             One-dimensional array of log-likelihoods
         """
-        log_l = np.ones(x.size)
-        for n in self.names:
-            log_l += np.cos(x[n] / 2.0)
+        log_l = 1.0 + np.sum(np.cos(x / 2.0), axis=-1)
         return (log_l + 2.0) ** 5.0
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+N-dimensional Neal's funnel likelihood.
+"""
+from typing import Sequence, Union
+
+import numpy as np
+from scipy.special import logsumexp
+
+from .base import NDimensionalModel, UniformPriorMixin
+from .utils import gauss_legendre_nodes, log_normal_probability
+
+
+def compute_funnel_ln_evidence(
+    dims: int,
+    bounds: Union[Sequence[float], np.ndarray],
+    scale: float = 3.0,
+    n_intervals: int = 256,
+    order: int = 8,
+) -> float:
+    """Compute the ln-evidence for Neal's funnel with a uniform prior.
+
+    The integral over the Gaussian parameters is analytic given the
+    log-variance, including the truncation at the prior bounds, and the
+    remaining integral over the log-variance is computed using composite
+    Gauss-Legendre quadrature.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions, including the log-variance.
+    bounds : Union[Sequence[float], numpy.ndarray]
+        Prior bounds, the same for every dimension.
+    scale : float
+        Standard deviation of the log-variance.
+    n_intervals : int
+        Number of intervals for the quadrature.
+    order : int
+        Number of nodes per interval.
+    """
+    lower, upper = bounds
+    v, log_w = gauss_legendre_nodes(lower, upper, n_intervals, order)
+    sigma = np.exp(0.5 * v)
+    log_f = (
+        -0.5 * (v / scale) ** 2
+        - 0.5 * np.log(2 * np.pi * scale**2)
+        + (dims - 1) * log_normal_probability(lower / sigma, upper / sigma)
+    )
+    return logsumexp(log_f + log_w) - dims * np.log(upper - lower)
+
+
+class NealsFunnel(UniformPriorMixin, NDimensionalModel):
+    """N-dimensional version of Neal's funnel with uniform priors.
+
+    The first parameter, :code:`x_0`, is the log-variance :math:`v` and is
+    normally distributed with standard deviation :code:`scale`. The other
+    parameters are normally distributed with zero mean and variance
+    :math:`e^v`, so the posterior narrows into a funnel as :math:`v`
+    decreases. Described in
+    `Neal 2003 <https://doi.org/10.1214/aos/1056562461>`_.
+
+    The ln-evidence is computed using
+    :py:func:`compute_funnel_ln_evidence`.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions.
+    bounds : Union[Sequence[float], numpy.ndarray]
+        Prior bounds.
+    scale : float
+        Standard deviation of the log-variance.
+    """
+
+    def __init__(
+        self,
+        dims: int = 2,
+        bounds: Union[Sequence[float], np.ndarray] = [-10.0, 10.0],
+        scale: float = 3.0,
+    ) -> None:
+        super().__init__(dims, bounds)
+        self.scale = scale
+        self._norm_const = 0.5 * np.log(2 * np.pi * scale**2) + 0.5 * (
+            self.dims - 1
+        ) * np.log(2 * np.pi)
+        self.ln_evidence = compute_funnel_ln_evidence(
+            self.dims, bounds, scale=scale
+        )
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood for Neal's funnel."""
+        return self.evaluate_in_blocks(self._log_likelihood_block, x)
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
+        v = x[..., 0]
+        return (
+            -0.5 * (v / self.scale) ** 2
+            - 0.5 * (self.dims - 1) * v
+            - 0.5 * np.exp(-v) * np.sum(x[..., 1:] ** 2, axis=-1)
+            - self._norm_const
+        )
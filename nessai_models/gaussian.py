@@ -6,9 +6,10 @@ from typing import Optional, Sequence, Union
 import warnings
 
 import numpy as np
-from scipy.stats import multivariate_normal
+from scipy.special import log_ndtr
 
 from .base import NDimensionalModel, UniformPriorMixin
+from .distributions import LowRankMultivariateNormal, MultivariateNormal
 
 
 def compute_gaussian_ln_evidence(
@@ -43,6 +44,45 @@ def compute_gaussian_ln_evidence(
     return ln_z
 
 
+def compute_tempered_gaussian_ln_evidence(
+    beta: Union[float, np.ndarray],
+    lower: np.ndarray,
+    upper: np.ndarray,
+) -> Union[float, np.ndarray]:
+    """Compute the ln-evidence for a unit Gaussian likelihood raised to the
+    power beta with a uniform prior.
+
+    Unlike :py:func:`compute_gaussian_ln_evidence`, this accounts for the
+    truncation of the likelihood at the prior bounds, which is significant
+    for small values of beta.
+
+    Parameters
+    ----------
+    beta : Union[float, numpy.ndarray]
+        Inverse temperature(s).
+    lower : numpy.ndarray
+        Lower prior bound in each dimension.
+    upper : numpy.ndarray
+        Upper prior bound in each dimension.
+    """
+    beta = np.asarray(beta, dtype=float)[..., np.newaxis]
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.sqrt(beta)
+        log_upper = log_ndtr(upper * s)
+        log_mass = log_upper + np.log1p(
+            -np.exp(log_ndtr(lower * s) - log_upper)
+        )
+        ln_z = (
+            0.5 * (1 - beta) * np.log(2 * np.pi)
+            - 0.5 * np.log(beta)
+            + log_mass
+            - np.log(upper - lower)
+        )
+    return np.where(beta == 0, 0.0, ln_z).sum(axis=-1)[()]
+
+
 class Gaussian(UniformPriorMixin, NDimensionalModel):
     """A simple n-dimensional Guassian with uniform priors.
 
@@ -63,6 +103,11 @@ class Gaussian(UniformPriorMixin, NDimensionalModel):
         If true, the log-likelihood will be renormalised such that the log-
         evidence is zero. Only applies when :code:`mean` and :code:`cov` are
         not specified.
+
+    Notes
+    -----
+    The covariance matrix is factorised when the likelihood is first
+    evaluated, see :py:class:`nessai_models.distributions.MultivariateNormal`.
     """
 
     def __init__(
@@ -88,7 +133,7 @@ class Gaussian(UniformPriorMixin, NDimensionalModel):
         else:
             self.cov = cov
 
-        self.dist = multivariate_normal(mean=self.mean, cov=self.cov)
+        self.dist = MultivariateNormal(mean=self.mean, cov=self.cov)
         self.normalise = normalise
 
         if cov is None and mean is None:
@@ -103,7 +148,83 @@ class Gaussian(UniformPriorMixin, NDimensionalModel):
                 warnings.warn("Cannot normalise non-unit Gaussian")
                 self.normalise = False
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Gaussian log-likelihood."""
+        return self.evaluate_in_blocks(self.dist.logpdf, x) - self._norm_const
+
+    def tempered_ln_evidence(
+        self, beta: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """Natural log-evidence for the likelihood raised to the power beta.
+
+        Only available for the unit Gaussian.
+        """
+        if self.ln_evidence is None:
+            return super().tempered_ln_evidence(beta)
+        return (
+            compute_tempered_gaussian_ln_evidence(
+                beta, self.lower_bounds, self.upper_bounds
+            )
+            - np.asarray(beta) * self._norm_const
+        )
+
+
+class LowRankGaussian(UniformPriorMixin, NDimensionalModel):
+    """An n-dimensional Gaussian with a diagonal plus low-rank covariance.
+
+    The covariance matrix is :math:`D + U U^T`, see
+    :py:class:`nessai_models.distributions.LowRankMultivariateNormal`. The
+    dense covariance matrix is never formed, so the memory and the cost per
+    sample are O(dims * rank) and this can be used with tens of thousands of
+    dimensions.
+
+    The log-evidence assumes the prior bounds are wide enough that the
+    likelihood is contained within them.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions.
+    rank : int
+        Rank of the low-rank part of the covariance. Ignored if
+        :code:`factor` is specified.
+    diagonal : Optional[Union[float, numpy.ndarray]]
+        Diagonal of the covariance matrix. Defaults to one.
+    factor : Optional[numpy.ndarray]
+        Low-rank factor with shape (dims, rank). If not specified, it is
+        drawn from a normal distribution with variance :code:`1 / rank` so
+        the marginal variances are approximately two.
+    mean : Optional[Union[float, numpy.ndarray]]
+        Mean of the Gaussian. Defaults to the origin.
+    bounds : Union[Sequence[float], numpy.ndarray]
+        Prior bounds.
+    seed : int
+        Random seed used to draw the low-rank factor.
+    """
+
+    def __init__(
+        self,
+        dims: int = 4,
+        rank: int = 2,
+        diagonal: Optional[Union[float, np.ndarray]] = None,
+        factor: Optional[np.ndarray] = None,
+        mean: Optional[Union[float, np.ndarray]] = None,
+        bounds: Union[Sequence[float], np.ndarray] = [-10.0, 10.0],
+        seed: int = 1234,
+    ) -> None:
+        super().__init__(dims, bounds)
+        if factor is None:
+            random_state = np.random.RandomState(seed=seed)
+            factor = random_state.randn(self.dims, rank) / np.sqrt(rank)
+        self.dist = LowRankMultivariateNormal(
+            mean=0.0 if mean is None else mean,
+            diagonal=1.0 if diagonal is None else diagonal,
+            factor=factor,
+        )
+        if self.dist.dims != self.dims:
+            raise ValueError("factor must have shape (dims, rank)")
+        self.ln_evidence = compute_gaussian_ln_evidence(bounds, dims=self.dims)
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
         """Gaussian log-likelihood."""
-        # Use a view rather than making a new copy of y
-        return self.dist.logpdf(self.unstructured_view(x)) - self._norm_const
+        return self.evaluate_in_blocks(self.dist.logpdf, x)
@@ -5,10 +5,12 @@ Gaussian mixture models.
 from typing import Dict, List, Optional, Sequence, Union
 
 import numpy as np
-from scipy.stats import multivariate_normal, norm
+from scipy.stats import norm
 from scipy.special import logsumexp
 
 from .base import BaseModel, NDimensionalModel, UniformPriorMixin
+from .distributions import MultivariateNormal
+from .utils import log_normal_probability
 
 
 class GaussianMixture(UniformPriorMixin, NDimensionalModel):
@@ -24,7 +26,9 @@ class GaussianMixture(UniformPriorMixin, NDimensionalModel):
         Weights for each of the Gaussian. Must sum to one.
     config : Optional[Union[List[Dict[str, numpy.ndarray]]]]
         List of configurations for each Gaussian. Each dictionary should have
-        a mean and cov key.
+        a mean and cov key. The covariance matrices are factorised when the
+        likelihood is first evaluated, see
+        :py:class:`nessai_models.distributions.MultivariateNormal`.
     random_state : Optional[numpy.random.RandomState]
         Random state to use for generation configuration if `config` is not
         specified. If not specified `seed` is used instead.
@@ -66,21 +70,82 @@ class GaussianMixture(UniformPriorMixin, NDimensionalModel):
             if config[n] is None:
                 config[n] = dict(
                     mean=random_state.uniform(bounds[0], bounds[1], dims),
-                    cov=3 * random_state.rand() * np.eye(dims),
+                    cov=3 * random_state.rand(),
                 )
-            self.gaussians[n] = multivariate_normal(**config[n])
+            self.gaussians[n] = MultivariateNormal(**config[n])
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
         """Log-likelihood for the mixture of Gaussians."""
-        _x = self.unstructured_view(x)
-        b = np.broadcast_to(self.weights, (x.size, self.n_gaussians)).T
-        arg = np.array([g.logpdf(_x) for g in self.gaussians])
+        return self.evaluate_in_blocks(self._log_likelihood_block, x)
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
+        n = x.shape[0] if x.ndim > 1 else 1
+        b = np.broadcast_to(self.weights, (n, self.n_gaussians)).T
+        arg = np.array([g.logpdf(x) for g in self.gaussians])
         if arg.ndim == 1:
             arg = arg[:, np.newaxis]
         log_l = logsumexp(arg, b=b, axis=0)
         return log_l
 
 
+class ConcentricGaussianMixture(GaussianMixture):
+    """A mixture of isotropic Gaussians that share the same mean.
+
+    The squared distance to the mean is computed once per sample and the
+    components are combined analytically, rather than evaluating each
+    component separately.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions.
+    scales : Union[Sequence[float], numpy.ndarray]
+        Variance of each of the Gaussians.
+    mean : Optional[Union[float, Sequence[float], numpy.ndarray]]
+        Common mean of the Gaussians. Defaults to the origin.
+    weights : Optional[Union[Sequence[float], np.ndarray]]
+        Weights for each of the Gaussian. Must sum to one.
+    bounds : Union[Sequence[float], numpy.ndarray]
+        Prior bounds.
+    kwargs :
+        Keyword arguments passed to :py:class:`GaussianMixture`.
+    """
+
+    def __init__(
+        self,
+        dims: int = 2,
+        scales: Union[Sequence[float], np.ndarray] = (1.0, 1e-3),
+        mean: Optional[Union[float, Sequence[float], np.ndarray]] = None,
+        weights: Optional[Union[Sequence[float], np.ndarray]] = None,
+        bounds: Union[Sequence[float], np.ndarray] = [-10.0, 10.0],
+        **kwargs,
+    ) -> None:
+        if mean is None:
+            mean = 0.0
+        self.mean = np.broadcast_to(np.asarray(mean, dtype=float), (dims,))
+        self.scales = np.asarray(scales, dtype=float)
+        config = [dict(mean=self.mean, cov=s) for s in scales]
+        super().__init__(
+            dims=dims,
+            n_gaussians=len(self.scales),
+            weights=weights,
+            config=config,
+            bounds=bounds,
+            **kwargs,
+        )
+        with np.errstate(divide="ignore"):
+            self._log_norm = np.log(self.weights) - 0.5 * dims * np.log(
+                2 * np.pi * self.scales
+            )
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
+        r2 = np.sum((x - self.mean) ** 2, axis=-1)
+        log_l = self._log_norm - 0.5 * r2[..., np.newaxis] / self.scales
+        if self.n_gaussians == 2:
+            return np.logaddexp(log_l[..., 0], log_l[..., 1])
+        return logsumexp(log_l, axis=-1)
+
+
 class GaussianMixtureWithData(UniformPriorMixin, BaseModel):
     """
     A Gaussian mixture model with two peaks that uses samples and fits the
@@ -92,13 +157,23 @@ class GaussianMixtureWithData(UniformPriorMixin, BaseModel):
     The parameters to estimate are the means, standard deviations and the
     weight.
 
+    If :code:`n_bins` is specified, the data are histogrammed once and a
+    binned (multinomial) likelihood is used instead. Each data point is
+    replaced by the probability of its bin, computed from differences of the
+    normal CDF, divided by the bin width, so the cost per sample is
+    O(n_bins) rather than O(n) and the log-likelihood is approximately equal
+    to the unbinned log-likelihood when the bins are narrow compared to the
+    standard deviations.
+
     Parameters
     ----------
     n : int
         Number of data points to use.
+    n_bins : Optional[int]
+        Number of bins. If not specified, the unbinned likelihood is used.
     """
 
-    def __init__(self, n: int = 1000) -> None:
+    def __init__(self, n: int = 1000, n_bins: Optional[int] = None) -> None:
         self.names = ["mu1", "sigma1", "mu2", "sigma2", "weight"]
         self.bounds = {
             "mu1": [-3, 3],
@@ -125,13 +200,75 @@ class GaussianMixtureWithData(UniformPriorMixin, BaseModel):
             [self.gaussian1.rvs(size=n1), self.gaussian2.rvs(size=n2)]
         )
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
-        """Returns log likelihood of given live point."""
-        w = x["weight"][..., np.newaxis]
-        mu1 = x["mu1"][..., np.newaxis]
-        mu2 = x["mu2"][..., np.newaxis]
-        sigma1 = x["sigma1"][..., np.newaxis]
-        sigma2 = x["sigma2"][..., np.newaxis]
+        self.n_bins = n_bins
+        if n_bins is not None:
+            if n_bins < 1:
+                raise ValueError("n_bins must be at least 1")
+            counts, edges = np.histogram(self.data, bins=n_bins)
+            keep = counts > 0
+            self.bin_counts = counts[keep]
+            self.bin_lower = edges[:-1][keep]
+            self.bin_upper = edges[1:][keep]
+            # Matches the normalisation of the unbinned likelihood, which
+            # does not include the factor of sqrt(2 pi) per data point
+            self._binned_constant = 0.5 * n * np.log(
+                2 * np.pi
+            ) - self.bin_counts @ np.log(self.bin_upper - self.bin_lower)
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Returns log likelihood for an unstructured array of samples."""
+        return self.evaluate_in_threads(self._log_likelihood_block, x)
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
+        if self.n_bins is not None:
+            return self._binned_log_likelihood(
+                **{n: x[..., i] for i, n in enumerate(self.names)}
+            )
+        return self._log_likelihood(
+            **{n: x[..., i] for i, n in enumerate(self.names)}
+        )
+
+    def _log_bin_probabilities(
+        self, mu: np.ndarray, sigma: np.ndarray
+    ) -> np.ndarray:
+        """Log-probability of each bin for a normal distribution."""
+        return log_normal_probability(
+            (self.bin_lower - mu) / sigma, (self.bin_upper - mu) / sigma
+        )
+
+    def _binned_log_likelihood(
+        self,
+        mu1: np.ndarray,
+        sigma1: np.ndarray,
+        mu2: np.ndarray,
+        sigma2: np.ndarray,
+        weight: np.ndarray,
+    ) -> np.ndarray:
+        n = self.data.size
+        log_p1 = self._log_bin_probabilities(
+            mu1[..., np.newaxis], sigma1[..., np.newaxis]
+        )
+        log_p2 = self._log_bin_probabilities(
+            mu2[..., np.newaxis], sigma2[..., np.newaxis]
+        )
+        with np.errstate(divide="ignore"):
+            log_l1 = n * np.log(weight) + log_p1 @ self.bin_counts
+            log_l2 = n * np.log(1.0 - weight) + log_p2 @ self.bin_counts
+        return np.logaddexp(log_l1, log_l2) + self._binned_constant
+
+    def _log_likelihood(
+        self,
+        mu1: np.ndarray,
+        sigma1: np.ndarray,
+        mu2: np.ndarray,
+        sigma2: np.ndarray,
+        weight: np.ndarray,
+    ) -> np.ndarray:
+        w = weight[..., np.newaxis]
+        mu1 = mu1[..., np.newaxis]
+        mu2 = mu2[..., np.newaxis]
+        sigma1 = sigma1[..., np.newaxis]
+        sigma2 = sigma2[..., np.newaxis]
         log_l1 = np.sum(
             np.log(w)
             - np.log(sigma1)
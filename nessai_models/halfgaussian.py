@@ -8,7 +8,10 @@ import numpy as np
 from scipy.stats import halfnorm
 
 from .base import NDimensionalModel, UniformPriorMixin
-from .gaussian import compute_gaussian_ln_evidence
+from .gaussian import (
+    compute_gaussian_ln_evidence,
+    compute_tempered_gaussian_ln_evidence,
+)
 
 
 class HalfGaussian(UniformPriorMixin, NDimensionalModel):
@@ -34,9 +37,14 @@ class HalfGaussian(UniformPriorMixin, NDimensionalModel):
             raise ValueError("Lower bounds must all be zero!")
         self.ln_evidence = compute_gaussian_ln_evidence(bounds, dims=self.dims)
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
         """Gaussian log-likelihood."""
-        log_l = np.zeros(x.size)
-        for n in self.names:
-            log_l += halfnorm.logpdf(x[n])
-        return log_l
+        return np.sum(halfnorm.logpdf(x), axis=-1)
+
+    def tempered_ln_evidence(
+        self, beta: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """Natural log-evidence for the likelihood raised to the power beta."""
+        return compute_tempered_gaussian_ln_evidence(
+            beta, self.lower_bounds, self.upper_bounds
+        ) + self.dims * np.log(2) * np.asarray(beta)
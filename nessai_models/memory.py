@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the memory allocated when evaluating a model.
+"""
+import gc
+import tracemalloc
+from typing import NamedTuple, Optional
+import warnings
+
+import numpy as np
+
+from .base import BaseModel
+
+
+class MemoryReport(NamedTuple):
+    """Memory allocated by a single log-likelihood call.
+
+    All values are in bytes and are relative to the memory allocated before
+    the call, so they do not include the input samples.
+    """
+
+    n_samples: int
+    """Number of samples in the batch."""
+    peak_bytes: int
+    """Peak memory allocated during the call, including the output."""
+    output_bytes: int
+    """Size of the returned array."""
+    retained_bytes: int
+    """Memory still allocated after the call, excluding the output."""
+    n_allocations: int
+    """Number of numpy arrays allocated during the call that are still
+    allocated after it, i.e. the output and any retained arrays. Temporary
+    arrays freed during the call are not counted since tracemalloc only
+    keeps live allocations, their size is included in
+    :code:`peak_bytes`."""
+
+    @property
+    def peak_bytes_per_sample(self) -> float:
+        """Peak memory allocated per sample."""
+        return self.peak_bytes / self.n_samples
+
+
+def measure_log_likelihood_memory(
+    model: BaseModel,
+    n: int = 1000,
+    x: Optional[np.ndarray] = None,
+    array: bool = False,
+) -> MemoryReport:
+    """Measure the memory allocated by a call to the log-likelihood.
+
+    Memory is measured with :py:mod:`tracemalloc`, which includes the
+    memory allocated by numpy for array data. The log-likelihood is called
+    once before measuring so that any lazily created caches are not
+    included.
+
+    If tracemalloc is already tracing, it is not reset or stopped so the
+    measurements of the caller are not changed. The peak is then only
+    known if the call exceeds the existing peak, otherwise a warning is
+    raised and the memory allocated after the call is used as a lower
+    bound.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to measure.
+    n : int
+        Number of samples. Ignored if :code:`x` is specified.
+    x : Optional[numpy.ndarray]
+        Samples to evaluate. If not specified, samples are drawn using
+        :code:`model.new_point`.
+    array : bool
+        If True, measure :code:`log_likelihood_array` rather than
+        :code:`log_likelihood`.
+
+    Returns
+    -------
+    MemoryReport
+        The memory allocated by the call.
+    """
+    if x is None:
+        x = model.new_point(n)
+        if array:
+            x = np.ascontiguousarray(model.unstructured_view(x))
+    func = model.log_likelihood_array if array else model.log_likelihood
+    if array:
+        n_samples = x.shape[0] if x.ndim > 1 else 1
+    else:
+        n_samples = max(x.size, 1)
+
+    func(x)
+    gc.collect()
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    numpy_filter = [tracemalloc.DomainFilter(True, np.lib.tracemalloc_domain)]
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(numpy_filter)
+        baseline, previous_peak = tracemalloc.get_traced_memory()
+        out = func(x)
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(numpy_filter)
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    if not started and peak <= previous_peak:
+        warnings.warn(
+            "tracemalloc was already tracing and the call did not exceed "
+            "the existing peak, the peak memory is a lower bound"
+        )
+        peak = current
+    n_allocations = sum(
+        max(stat.count_diff, 0)
+        for stat in after.compare_to(before, "traceback")
+    )
+    output_bytes = np.asarray(out).nbytes
+    return MemoryReport(
+        n_samples=n_samples,
+        peak_bytes=max(peak - baseline, 0),
+        output_bytes=output_bytes,
+        retained_bytes=max(current - baseline - output_bytes, 0),
+        n_allocations=n_allocations,
+    )
+
+
+def assert_memory_budget(
+    model: BaseModel,
+    n: int,
+    budget: float,
+    array: bool = False,
+) -> MemoryReport:
+    """Assert the log-likelihood stays within a memory budget.
+
+    Intended for use in tests.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to check.
+    n : int
+        Number of samples in the batch.
+    budget : float
+        Maximum peak memory in bytes.
+    array : bool
+        If True, check :code:`log_likelihood_array` rather than
+        :code:`log_likelihood`.
+
+    Returns
+    -------
+    MemoryReport
+        The memory allocated by the call.
+
+    Raises
+    ------
+    AssertionError
+        If the peak memory exceeds the budget.
+    """
+    report = measure_log_likelihood_memory(model, n=n, array=array)
+    if report.peak_bytes > budget:
+        raise AssertionError(
+            f"{model.__class__.__name__} allocated {report.peak_bytes} bytes "
+            f"for {n} samples which exceeds the budget of {budget:.0f} bytes "
+            f"({report.peak_bytes_per_sample:.1f} bytes per sample)"
+        )
+    return report
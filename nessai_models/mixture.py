@@ -92,30 +92,31 @@ class MixtureOfDistributions(UniformPriorMixin, BaseModel):
             self.map_fn = map_fn
 
     @staticmethod
-    def _log_likelihood_name(
-        mapping: dict, x: np.ndarray, name: str
+    def _log_likelihood_index(
+        logpdfs: list, x: np.ndarray, index: int
     ) -> np.ndarray:
-        return mapping[name](x[name])
+        return logpdfs[index](x[..., index])
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
         """Compute the log-likelihood.
 
         Parameters
         ----------
         x :
-            Point or array of points as a structured array with fields
-            that match the names of the model.
+            Point or array of points as an unstructured array with shape
+            (n, dims).
 
         Returns
         -------
         numpy.ndarray
             One-dimensional array of log-likelihoods
         """
+        logpdfs = [self.mapping[n] for n in self.names]
         return np.vstack(
             list(
                 self.map_fn(
-                    partial(self._log_likelihood_name, self.mapping, x),
-                    self.names,
+                    partial(self._log_likelihood_index, logpdfs, x),
+                    range(len(self.names)),
                 )
             )
         ).sum(axis=0)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Structured covariance matrices for correlated Gaussian noise.
+"""
+from typing import Optional
+
+import numpy as np
+from scipy.linalg import (
+    blas,
+    cholesky_banded,
+    solve_banded,
+    solve_triangular,
+)
+
+
+class ToeplitzCovariance:
+    """Covariance matrix of stationary noise defined by its autocovariance.
+
+    The Levinson-Durbin recursion is used at construction to compute the
+    innovations decomposition of the inverse covariance in O(n^2) time. This
+    avoids the O(n^3) dense factorisation. Whitening is a triangular
+    matrix product which requires O(n^2) memory for the innovations matrix.
+
+    Parameters
+    ----------
+    autocovariance : numpy.ndarray
+        Autocovariance of the noise at lags 0 to n - 1. This is the first
+        column of the Toeplitz covariance matrix.
+    """
+
+    def __init__(self, autocovariance: np.ndarray) -> None:
+        self.autocovariance = np.asarray(autocovariance, dtype=float)
+        if self.autocovariance.ndim != 1:
+            raise ValueError("autocovariance must be one-dimensional")
+        self.n_points = self.autocovariance.size
+        innovations, self.variances = _levinson_durbin(self.autocovariance)
+        # Subnormal coefficients are negligible but slow down the BLAS call
+        innovations[np.abs(innovations) < np.finfo(float).tiny] = 0.0
+        # Fortran order avoids a copy in the BLAS call
+        self._innovations = np.asfortranarray(innovations)
+        self.log_det = np.sum(np.log(self.variances))
+        self._scale = 1 / np.sqrt(self.variances)[:, np.newaxis]
+
+    def whiten(self, x: np.ndarray) -> np.ndarray:
+        """Whiten an array of residuals.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array with shape (n_points, ...).
+
+        Returns
+        -------
+        numpy.ndarray
+            Whitened array with the same shape as the input.
+        """
+        shape = x.shape
+        x = x.reshape(self.n_points, -1)
+        y = blas.dtrmm(1.0, self._innovations, x, lower=1, diag=1)
+        return (self._scale * y).reshape(shape)
+
+    def sample(
+        self,
+        size: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> np.ndarray:
+        """Draw realisations of the noise.
+
+        Parameters
+        ----------
+        size : Optional[int]
+            Number of realisations. If not specified, a single realisation
+            is returned.
+        rng : Optional[numpy.random.Generator]
+            Random number generator. Defaults to the global numpy random
+            number generator.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of noise with shape (n_points,) or (size, n_points).
+        """
+        z = _standard_normal(self.n_points, size, rng)
+        return solve_triangular(
+            self._innovations,
+            (np.sqrt(self.variances) * z).T,
+            lower=True,
+            unit_diagonal=True,
+        ).T
+
+
+class BandedCovariance:
+    """Banded covariance matrix.
+
+    The banded Cholesky factor is computed once at construction, evaluating
+    the whitened residuals then costs O(n * bandwidth) per sample.
+
+    Parameters
+    ----------
+    banded_covariance : numpy.ndarray
+        Lower triangle of the covariance matrix in the banded storage used
+        by :py:func:`scipy.linalg.cholesky_banded` with :code:`lower=True`,
+        i.e. :code:`banded_covariance[i, j] = cov[i + j, j]`. The shape is
+        (bandwidth + 1, n).
+    """
+
+    def __init__(self, banded_covariance: np.ndarray) -> None:
+        banded_covariance = np.asarray(banded_covariance, dtype=float)
+        if banded_covariance.ndim != 2:
+            raise ValueError("banded_covariance must be two-dimensional")
+        self.bandwidth = banded_covariance.shape[0] - 1
+        self.n_points = banded_covariance.shape[1]
+        self._cholesky = cholesky_banded(banded_covariance, lower=True)
+        self.log_det = 2 * np.sum(np.log(self._cholesky[0]))
+
+    def whiten(self, x: np.ndarray) -> np.ndarray:
+        """Whiten an array of residuals.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array with shape (n_points, ...).
+
+        Returns
+        -------
+        numpy.ndarray
+            Whitened array with the same shape as the input.
+        """
+        shape = x.shape
+        x = x.reshape(self.n_points, -1)
+        return solve_banded(
+            (self.bandwidth, 0), self._cholesky, x, check_finite=False
+        ).reshape(shape)
+
+    def sample(
+        self,
+        size: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> np.ndarray:
+        """Draw realisations of the noise.
+
+        Parameters
+        ----------
+        size : Optional[int]
+            Number of realisations. If not specified, a single realisation
+            is returned.
+        rng : Optional[numpy.random.Generator]
+            Random number generator. Defaults to the global numpy random
+            number generator.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of noise with shape (n_points,) or (size, n_points).
+        """
+        z = _standard_normal(self.n_points, size, rng)
+        out = np.zeros(z.shape)
+        n = self.n_points
+        for i in range(self.bandwidth + 1):
+            out[..., i:] += self._cholesky[i, : n - i] * z[..., : n - i]
+        return out
+
+
+def _standard_normal(
+    n_points: int,
+    size: Optional[int],
+    rng: Optional[np.random.Generator],
+) -> np.ndarray:
+    shape = (n_points,) if size is None else (size, n_points)
+    if rng is None:
+        return np.random.randn(*shape)
+    return rng.standard_normal(shape)
+
+
+def _levinson_durbin(autocovariance: np.ndarray):
+    """Levinson-Durbin recursion for the innovations decomposition.
+
+    Returns the unit lower-triangular matrix A and variances v such that the
+    covariance C satisfies A C A^T = diag(v).
+    """
+    n = autocovariance.size
+    if not np.all(np.isfinite(autocovariance)):
+        raise ValueError("autocovariance must be finite")
+    if not autocovariance[0] > 0:
+        raise ValueError("autocovariance is not positive definite")
+    innovations = np.eye(n)
+    variances = np.empty(n)
+    variances[0] = autocovariance[0]
+    phi = np.zeros(0)
+    for k in range(1, n):
+        kappa = (
+            autocovariance[k] - np.dot(phi, autocovariance[k - 1 : 0 : -1])
+        ) / variances[k - 1]
+        phi = np.append(phi - kappa * phi[::-1], kappa)
+        variances[k] = variances[k - 1] * (1 - kappa**2)
+        if not variances[k] > 0:
+            raise ValueError("autocovariance is not positive definite")
+        innovations[k, :k] = -phi[::-1]
+    return innovations, variances
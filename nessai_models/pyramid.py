@@ -26,18 +26,22 @@ class Pyramid(UniformPriorMixin, NDimensionalModel):
     ) -> None:
         super().__init__(dims, bounds)
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
         """Compute the log-likelihood.
 
         Parameters
         ----------
         x :
-            Point or array of points as a structured array with fields
-            that match the names of the model.
+            Point or array of points as an unstructured array with shape
+            (n, dims).
 
         Returns
         -------
         numpy.ndarray
             One-dimensional array of log-likelihoods
         """
-        return -np.sum(np.abs(self.unstructured_view(x)), axis=-1)
+        return self.evaluate_in_blocks(self._log_likelihood_block, x)
+
+    @staticmethod
+    def _log_likelihood_block(x: np.ndarray) -> np.ndarray:
+        return -np.sum(np.abs(x), axis=-1)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+N-dimensional Rastrigin likelihood.
+"""
+from typing import Sequence, Union
+
+import numpy as np
+from scipy.special import logsumexp
+
+from .base import NDimensionalModel, UniformPriorMixin
+from .utils import gauss_legendre_nodes
+
+
+def rastrigin(x: np.ndarray, amplitude: float = 10.0) -> np.ndarray:
+    r"""Rastrigin function in N dimensions.
+
+    .. math::
+        A n + \sum_{i=1}^{n} [x_i^2 - A \cos(2 \pi x_i)].
+    """
+    return np.sum(
+        x**2 - amplitude * np.cos(2 * np.pi * x) + amplitude, axis=-1
+    )
+
+
+def compute_rastrigin_ln_evidence(
+    dims: int,
+    bounds: Union[Sequence[float], np.ndarray],
+    amplitude: float = 10.0,
+    n_intervals: int = 1024,
+    order: int = 8,
+) -> float:
+    """Compute the ln-evidence for the Rastrigin likelihood with a uniform
+    prior.
+
+    The likelihood is separable, so the ln-evidence is the number of
+    dimensions times a one-dimensional integral, which is computed using
+    composite Gauss-Legendre quadrature.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions.
+    bounds : Union[Sequence[float], numpy.ndarray]
+        Prior bounds, the same for every dimension.
+    amplitude : float
+        Amplitude of the cosine term.
+    n_intervals : int
+        Number of intervals for the quadrature.
+    order : int
+        Number of nodes per interval.
+    """
+    x, log_w = gauss_legendre_nodes(bounds[0], bounds[1], n_intervals, order)
+    log_z = logsumexp(-rastrigin(x[:, np.newaxis], amplitude) + log_w)
+    return dims * (log_z - np.log(bounds[1] - bounds[0]))
+
+
+class Rastrigin(UniformPriorMixin, NDimensionalModel):
+    """N-dimensional Rastrigin likelihood with uniform priors.
+
+    The log-likelihood is minus the Rastrigin function, which has a mode
+    at every point on the integer lattice, so the number of modes grows
+    exponentially with the number of dimensions.
+
+    The ln-evidence is computed using
+    :py:func:`compute_rastrigin_ln_evidence`.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions.
+    bounds : Union[Sequence[float], numpy.ndarray]
+        Prior bounds.
+    amplitude : float
+        Amplitude of the cosine term.
+    """
+
+    def __init__(
+        self,
+        dims: int = 2,
+        bounds: Union[Sequence[float], np.ndarray] = [-5.12, 5.12],
+        amplitude: float = 10.0,
+    ) -> None:
+        super().__init__(dims, bounds)
+        self.amplitude = amplitude
+        self.ln_evidence = compute_rastrigin_ln_evidence(
+            self.dims, bounds, amplitude=amplitude
+        )
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Rastrigin log-likelihood."""
+        return self.evaluate_in_blocks(self._log_likelihood_block, x)
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
+        return -rastrigin(x, self.amplitude)
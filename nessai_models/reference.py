@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Reference evidence and posterior moments computed by quadrature.
+"""
+import json
+import os
+from typing import NamedTuple, Tuple
+import warnings
+
+import numpy as np
+
+from .base import BaseModel
+from .utils import gauss_legendre_nodes, get_cache_dir, get_model_hash
+
+
+class Reference(NamedTuple):
+    """Reference values computed by quadrature."""
+
+    ln_evidence: float
+    """Natural log-evidence."""
+    mean: np.ndarray
+    """Posterior mean of each parameter."""
+    covariance: np.ndarray
+    """Posterior covariance matrix."""
+    n_evaluations: int
+    """Number of likelihood evaluations for the final quadrature."""
+    converged: bool
+    """Whether the change in the log-evidence was less than the
+    tolerance."""
+
+
+def _integrate(
+    model: BaseModel, n_intervals: int, order: int, batch_size: int
+) -> Tuple[float, np.ndarray, np.ndarray, int]:
+    """Tensor-product quadrature of the posterior and its first two moments.
+
+    The sums are accumulated in batches relative to a running maximum so
+    the memory usage does not depend on the number of nodes.
+    """
+    grids = [
+        gauss_legendre_nodes(lo, hi, n_intervals, order)
+        for lo, hi in zip(model.lower_bounds, model.upper_bounds)
+    ]
+    shape = tuple(g[0].size for g in grids)
+    n_total = int(np.prod(shape))
+    dims = len(grids)
+
+    log_max = -np.inf
+    s0 = 0.0
+    s1 = np.zeros(dims)
+    s2 = np.zeros((dims, dims))
+    for start in range(0, n_total, batch_size):
+        index = np.unravel_index(
+            np.arange(start, min(start + batch_size, n_total)), shape
+        )
+        x = np.stack([g[0][i] for g, i in zip(grids, index)], axis=-1)
+        log_w = sum(g[1][i] for g, i in zip(grids, index))
+        log_p = model.log_likelihood_array(x) + model.log_prior_array(x)
+        log_p = log_p + log_w
+        batch_max = np.max(log_p)
+        if not np.isfinite(batch_max):
+            continue
+        if batch_max > log_max:
+            scale = np.exp(log_max - batch_max)
+            s0, s1, s2 = scale * s0, scale * s1, scale * s2
+            log_max = batch_max
+        p = np.exp(log_p - log_max)
+        s0 += p.sum()
+        s1 += p @ x
+        s2 += (x * p[:, np.newaxis]).T @ x
+
+    ln_z = log_max + np.log(s0)
+    mean = s1 / s0
+    covariance = s2 / s0 - np.outer(mean, mean)
+    return ln_z, mean, covariance, n_total
+
+
+def compute_reference(
+    model: BaseModel,
+    n_intervals: int = 8,
+    order: int = 5,
+    tolerance: float = 1e-3,
+    max_evaluations: int = 2**24,
+    batch_size: int = 2**16,
+    cache: bool = True,
+) -> Reference:
+    """Compute the log-evidence and posterior moments by quadrature.
+
+    Uses tensor-product composite Gauss-Legendre quadrature over the prior
+    bounds with batched calls to :code:`log_likelihood_array`. The number
+    of intervals in each dimension is doubled until the log-evidence
+    changes by less than :code:`tolerance`. This is intended for models
+    with one to three dimensions.
+
+    Results are cached in the cache directory (see
+    :py:func:`nessai_models.utils.get_cache_dir`) and are keyed by the
+    hash of the model (see :py:func:`nessai_models.utils.get_model_hash`)
+    and the quadrature settings.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to integrate.
+    n_intervals : int
+        Initial number of intervals per dimension.
+    order : int
+        Number of Gauss-Legendre nodes per interval.
+    tolerance : float
+        Tolerance on the change in the log-evidence.
+    max_evaluations : int
+        Maximum number of likelihood evaluations for a single quadrature.
+        If the tolerance has not been reached before this is exceeded, the
+        last result is returned with :code:`converged=False`.
+    batch_size : int
+        Number of nodes per call to the likelihood.
+    cache : bool
+        If True, read and write cached results.
+
+    Returns
+    -------
+    Reference
+        The log-evidence and posterior moments.
+
+    Raises
+    ------
+    ValueError
+        If the initial quadrature exceeds the maximum number of
+        evaluations.
+    """
+    if (n_intervals * order) ** model.dims > max_evaluations:
+        raise ValueError(
+            f"Quadrature with {model.dims} dimensions exceeds the maximum "
+            "number of evaluations"
+        )
+    settings = dict(
+        n_intervals=n_intervals,
+        order=order,
+        tolerance=tolerance,
+        max_evaluations=max_evaluations,
+    )
+    if cache:
+        try:
+            key = get_model_hash(model)
+        except TypeError as e:
+            warnings.warn(f"Could not cache the reference: {e}")
+            cache = False
+    if cache:
+        filename = os.path.join(get_cache_dir(), "reference", f"{key}.json")
+        try:
+            with open(filename, "r") as f:
+                data = json.load(f)
+            if data["settings"] == settings:
+                return Reference(
+                    ln_evidence=data["ln_evidence"],
+                    mean=np.array(data["mean"]),
+                    covariance=np.array(data["covariance"]),
+                    n_evaluations=data["n_evaluations"],
+                    converged=data["converged"],
+                )
+        except (OSError, ValueError, KeyError):
+            pass
+
+    previous = None
+    converged = False
+    while True:
+        ln_z, mean, cov, n_evaluations = _integrate(
+            model, n_intervals, order, batch_size
+        )
+        if previous is not None and abs(ln_z - previous) < tolerance:
+            converged = True
+            break
+        previous = ln_z
+        n_intervals *= 2
+        if n_evaluations * 2**model.dims > max_evaluations:
+            warnings.warn(
+                "Reached the maximum number of evaluations before the "
+                "log-evidence converged"
+            )
+            break
+
+    reference = Reference(
+        ln_evidence=float(ln_z),
+        mean=mean,
+        covariance=cov,
+        n_evaluations=n_evaluations,
+        converged=converged,
+    )
+    if cache:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        tmp = f"{filename}.{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(
+                dict(
+                    settings=settings,
+                    ln_evidence=reference.ln_evidence,
+                    mean=reference.mean.tolist(),
+                    covariance=reference.covariance.tolist(),
+                    n_evaluations=reference.n_evaluations,
+                    converged=reference.converged,
+                ),
+                f,
+            )
+        os.replace(tmp, filename)
+    return reference
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+Evaluate the log-likelihood of a model on remote worker servers.
+
+A worker server (:py:class:`ModelServer`, or :code:`nessai-models-server`
+from the command line) rebuilds models from their configuration and
+evaluates batches of samples sent over TCP. :py:class:`RemoteModel` wraps a
+model on the client, sends its configuration to each server once and then
+splits each batch of samples between the servers.
+
+Messages are a fixed header, containing the message type and the length of
+the payload, followed by the payload. Samples and log-likelihoods are sent
+as raw little-endian float64 buffers, so no serialisation is needed.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json
+import multiprocessing
+import socket
+import socketserver
+import struct
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .base import BaseModel, ModelWrapper
+from .blas import get_auto_blas_threads, limit_blas_threads
+from .config import model_from_config
+
+_HEADER = struct.Struct("!4sQ")
+_SHAPE = struct.Struct("!QQ")
+_CONFIG = b"CONF"
+_READY = b"REDY"
+_EVALUATE = b"EVAL"
+_RESULT = b"RSLT"
+_ERROR = b"ERRR"
+
+Address = Tuple[str, int]
+
+
+def _send(sock: socket.socket, message_type: bytes, *buffers) -> None:
+    length = sum(memoryview(b).nbytes for b in buffers)
+    sock.sendall(_HEADER.pack(message_type, length))
+    for b in buffers:
+        sock.sendall(b)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytearray:
+    buffer = bytearray(n)
+    view = memoryview(buffer)
+    while n:
+        received = sock.recv_into(view, n)
+        if not received:
+            raise ConnectionError("Connection closed")
+        view = view[received:]
+        n -= received
+    return buffer
+
+
+def _recv(sock: socket.socket) -> Tuple[bytes, bytearray]:
+    message_type, length = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return message_type, _recv_exact(sock, length)
+
+
+def parse_address(address: Union[str, Address]) -> Address:
+    """Parse an address of the form :code:`host:port`.
+
+    Parameters
+    ----------
+    address : Union[str, Tuple[str, int]]
+        Address as a string or a tuple of the host and port.
+
+    Returns
+    -------
+    Tuple[str, int]
+        Host and port.
+    """
+    if isinstance(address, str):
+        host, _, port = address.rpartition(":")
+        if not host:
+            raise ValueError(f"Invalid address: {address}")
+        return host, int(port)
+    host, port = address
+    return host, int(port)
+
+
+class _ModelHandler(socketserver.BaseRequestHandler):
+    """Handle the requests from a single client connection."""
+
+    def handle(self) -> None:
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        model = None
+        while True:
+            try:
+                message_type, payload = _recv(self.request)
+            except OSError:
+                return
+            try:
+                if message_type == _CONFIG:
+                    model = self.server.get_model(json.loads(payload))
+                    reply = (_READY, json.dumps(list(model.names)).encode())
+                elif message_type == _EVALUATE:
+                    if model is None:
+                        raise RuntimeError("No model has been configured")
+                    n, dims = _SHAPE.unpack_from(payload)
+                    x = np.frombuffer(
+                        payload, dtype="<f8", offset=_SHAPE.size
+                    ).reshape(n, dims)
+                    log_l = np.ascontiguousarray(
+                        model.log_likelihood_array(x), dtype="<f8"
+                    )
+                    reply = (_RESULT, log_l)
+                else:
+                    raise RuntimeError(f"Unknown message type: {message_type}")
+            except Exception as e:
+                reply = (_ERROR, f"{type(e).__name__}: {e}".encode())
+            try:
+                _send(self.request, *reply)
+            except OSError:
+                # The client has disconnected
+                return
+
+
+class ModelServer(socketserver.ThreadingTCPServer):
+    """Server that evaluates the log-likelihood of models for clients.
+
+    Each client connection is handled on its own thread. Models are rebuilt
+    from the configuration sent by the client and are shared between
+    connections with the same configuration.
+
+    Parameters
+    ----------
+    address : Union[str, Tuple[str, int]]
+        Address to listen on. Use port 0 to choose a free port.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Union[str, Address] = ("127.0.0.1", 0)):
+        super().__init__(parse_address(address), _ModelHandler)
+        self._models = {}
+        self._models_lock = threading.Lock()
+
+    @property
+    def address(self) -> Address:
+        """Address the server is listening on."""
+        return self.server_address[:2]
+
+    def get_model(self, config: Dict) -> BaseModel:
+        """Get the model for a configuration, building it if needed."""
+        key = json.dumps(config, sort_keys=True)
+        with self._models_lock:
+            if key not in self._models:
+                self._models[key] = model_from_config(config)
+            return self._models[key]
+
+
+def _run_server(
+    address: Address, n_blas_threads: Optional[int], queue
+) -> None:
+    if n_blas_threads is not None:
+        limit_blas_threads(n_blas_threads)
+    with ModelServer(address) as server:
+        queue.put(server.address)
+        server.serve_forever()
+
+
+@contextmanager
+def local_servers(
+    n: int,
+    host: str = "127.0.0.1",
+    n_blas_threads: Optional[Union[int, str]] = "auto",
+) -> Iterator[List[Address]]:
+    """Start worker servers in local processes.
+
+    Intended for testing and benchmarking on a single machine.
+
+    Parameters
+    ----------
+    n : int
+        Number of servers.
+    host : str
+        Host to listen on.
+    n_blas_threads : Optional[Union[int, str]]
+        Number of BLAS threads for each server. If :code:`'auto'`, the
+        available CPUs are divided between the servers. If None, the limits
+        are not changed.
+
+    Yields
+    ------
+    List[Tuple[str, int]]
+        Addresses of the servers.
+    """
+    if n_blas_threads == "auto":
+        n_blas_threads = get_auto_blas_threads(n)
+    context = multiprocessing.get_context()
+    queue = context.Queue()
+    processes = [
+        context.Process(
+            target=_run_server,
+            args=((host, 0), n_blas_threads, queue),
+            daemon=True,
+        )
+        for _ in range(n)
+    ]
+    try:
+        for p in processes:
+            p.start()
+        yield [queue.get(timeout=60) for _ in processes]
+    finally:
+        for p in processes:
+            p.terminate()
+        for p in processes:
+            p.join()
+
+
+class RemoteModel(ModelWrapper):
+    """Wrapper that evaluates the log-likelihood on worker servers.
+
+    The configuration of the wrapped model (see
+    :py:meth:`nessai_models.base.BaseModel.get_config`) is sent to each
+    server once, when the model first connects. Each batch of samples is
+    then split into chunks that are sent to the servers as they become
+    free, so faster servers evaluate more chunks, and the results are
+    returned in the original order. The prior is evaluated locally.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to wrap.
+    addresses : Sequence[Union[str, Tuple[str, int]]]
+        Addresses of the servers, e.g. :code:`'localhost:5000'`.
+    chunk_size : Optional[int]
+        Maximum number of samples sent to a server at once. If not
+        specified, each batch is split evenly between the servers.
+    timeout : Optional[float]
+        Timeout in seconds for the socket operations.
+    """
+
+    def __init__(
+        self,
+        model: BaseModel,
+        addresses: Sequence[Union[str, Address]],
+        chunk_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(model)
+        if not addresses:
+            raise ValueError("At least one address must be specified")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.addresses = [parse_address(a) for a in addresses]
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self._model_config = json.dumps(model.get_config()).encode()
+        self._connections = None
+        self._connection_locks = None
+        self._executor = None
+        self._connect_lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """Whether the model is connected to the servers."""
+        return self._connections is not None
+
+    def connect(self) -> None:
+        """Connect to the servers and send the model configuration.
+
+        Called automatically by :py:meth:`log_likelihood_array`.
+        """
+        with self._connect_lock:
+            if self._connections is not None:
+                return
+            connections = []
+            try:
+                for address in self.addresses:
+                    sock = socket.create_connection(
+                        address, timeout=self.timeout
+                    )
+                    connections.append(sock)
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    _send(sock, _CONFIG, self._model_config)
+                    names = json.loads(self._receive(sock, address, _READY))
+                    if names != self.names:
+                        raise RuntimeError(
+                            f"Server {address} built a model with different "
+                            f"parameters: {names}"
+                        )
+            except Exception:
+                for sock in connections:
+                    sock.close()
+                raise
+            self._connections = connections
+            # Concurrent calls share the connections, so each request and
+            # its reply must not be interleaved with another call
+            self._connection_locks = [threading.Lock() for _ in connections]
+            self._executor = ThreadPoolExecutor(
+                len(connections), thread_name_prefix="RemoteModel"
+            )
+
+    def close(self) -> None:
+        """Close the connections to the servers."""
+        with self._connect_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+            for sock in self._connections or []:
+                sock.close()
+            self._connections = None
+            self._connection_locks = None
+            self._executor = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def _receive(
+        sock: socket.socket, address: Address, expected: bytes
+    ) -> bytearray:
+        message_type, payload = _recv(sock)
+        if message_type == _ERROR:
+            raise RuntimeError(
+                f"Server {address} raised an error: {payload.decode()}"
+            )
+        if message_type != expected:
+            raise RuntimeError(
+                f"Unexpected message from server {address}: {message_type}"
+            )
+        return payload
+
+    def _worker(self, index: int, chunks, out: np.ndarray, x: np.ndarray):
+        """Evaluate chunks on a single server until none are left."""
+        sock = self._connections[index]
+        lock = self._connection_locks[index]
+        address = self.addresses[index]
+        for start, end in chunks:
+            with lock:
+                _send(
+                    sock,
+                    _EVALUATE,
+                    _SHAPE.pack(end - start, x.shape[1]),
+                    x[start:end],
+                )
+                result = self._receive(sock, address, _RESULT)
+            out[start:end] = np.frombuffer(result, dtype="<f8")
+
+    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood evaluated on the servers."""
+        return self.log_likelihood_array(self.unstructured_view(x))
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood evaluated on the servers for an unstructured
+        array.
+        """
+        self.connect()
+        single = np.ndim(x) < 2
+        x = np.ascontiguousarray(np.atleast_2d(x), dtype="<f8")
+        n = x.shape[0]
+        n_servers = len(self._connections)
+        chunk_size = self.chunk_size or max(-(-n // n_servers), 1)
+        # A shared iterator means each server takes the next chunk when it
+        # is free
+        starts = range(0, n, chunk_size)
+        chunks = iter([(s, min(s + chunk_size, n)) for s in starts])
+        lock = threading.Lock()
+
+        def locked():
+            while True:
+                with lock:
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+        out = np.empty(n)
+        futures = [
+            self._executor.submit(self._worker, i, locked(), out, x)
+            for i in range(min(n_servers, len(starts)))
+        ]
+        errors = [f.exception() for f in futures]
+        for e in errors:
+            if e is not None:
+                # The state of the connections is unknown after an error
+                self.close()
+                raise e
+        return out[0] if single else out
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_connect_lock", None)
+        state["_connections"] = None
+        state["_connection_locks"] = None
+        state["_executor"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._connect_lock = threading.Lock()
+
+
+def main(args=None) -> None:
+    """Entry point for :code:`nessai-models-server`."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Start a server that evaluates the log-likelihood of "
+            "nessai_models models for RemoteModel clients."
+        )
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, default=0, help="Port, 0 chooses a free port."
+    )
+    parser.add_argument(
+        "--blas-threads",
+        type=int,
+        default=None,
+        help="Maximum number of BLAS threads.",
+    )
+    args = parser.parse_args(args)
+    if args.blas_threads is not None:
+        limit_blas_threads(args.blas_threads)
+    with ModelServer((args.host, args.port)) as server:
+        host, port = server.address
+        print(f"Listening on {host}:{port}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -69,6 +69,9 @@ class Rosenbrock(UniformPriorMixin, NDimensionalModel):
         else:
             self._fn = rosenbrock
 
-    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
         """Rosenbrock Log-likelihood."""
-        return -self._fn(self.unstructured_view(x))
+        return self.evaluate_in_blocks(self._log_likelihood_block, x)
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
+        return -self._fn(x)
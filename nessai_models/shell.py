@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+N-dimensional Gaussian shell likelihood.
+"""
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from scipy.special import gammaln, logsumexp
+
+from .base import NDimensionalModel, UniformPriorMixin
+from .utils import gauss_legendre_nodes
+
+
+def compute_gaussian_shell_ln_evidence(
+    dims: int,
+    bounds: Union[Sequence[float], np.ndarray],
+    radius: float = 2.0,
+    width: float = 0.1,
+    n_intervals: int = 64,
+    order: int = 8,
+) -> float:
+    """Compute the ln-evidence for a Gaussian shell with a uniform prior.
+
+    Assumes the shell is contained within the prior bounds. The integral is
+    the surface area of the unit sphere times a one-dimensional integral
+    over the radius, which is computed using composite Gauss-Legendre
+    quadrature.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions.
+    bounds : Union[Sequence[float], numpy.ndarray]
+        Prior bounds, the same for every dimension.
+    radius : float
+        Radius of the shell.
+    width : float
+        Width of the shell.
+    n_intervals : int
+        Number of intervals for the quadrature.
+    order : int
+        Number of nodes per interval.
+    """
+    peak = _radial_peak(dims, radius, width)
+    r, log_w = gauss_legendre_nodes(
+        max(peak - 20 * width, 0.0), peak + 20 * width, n_intervals, order
+    )
+    log_f = (
+        (dims - 1) * np.log(r)
+        - 0.5 * ((r - radius) / width) ** 2
+        - 0.5 * np.log(2 * np.pi * width**2)
+    )
+    log_area = np.log(2) + 0.5 * dims * np.log(np.pi) - gammaln(0.5 * dims)
+    return (
+        log_area
+        + logsumexp(log_f + log_w)
+        - dims * np.log(bounds[1] - bounds[0])
+    )
+
+
+def _radial_peak(dims: int, radius: float, width: float) -> float:
+    """Radius at which the radial integrand of the shell peaks."""
+    return 0.5 * (radius + np.sqrt(radius**2 + 4 * (dims - 1) * width**2))
+
+
+class GaussianShell(UniformPriorMixin, NDimensionalModel):
+    """N-dimensional Gaussian shell likelihood with uniform priors.
+
+    The likelihood is a Gaussian in the distance from the centre of the
+    shell, which gives a thin shell that is difficult to sample. Based on
+    the shells in `Feroz et al. 2008 <https://arxiv.org/abs/0809.3437>`_.
+
+    The ln-evidence is computed using
+    :py:func:`compute_gaussian_shell_ln_evidence` if the shell is contained
+    within the prior bounds, otherwise it is not set.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions.
+    bounds : Union[Sequence[float], numpy.ndarray]
+        Prior bounds.
+    radius : float
+        Radius of the shell.
+    width : float
+        Width of the shell.
+    centre : Optional[Union[float, Sequence[float], numpy.ndarray]]
+        Centre of the shell. Defaults to the origin.
+    """
+
+    def __init__(
+        self,
+        dims: int = 2,
+        bounds: Union[Sequence[float], np.ndarray] = [-6.0, 6.0],
+        radius: float = 2.0,
+        width: float = 0.1,
+        centre: Optional[Union[float, Sequence[float], np.ndarray]] = None,
+    ) -> None:
+        super().__init__(dims, bounds)
+        self.radius = radius
+        self.width = width
+        if centre is None:
+            centre = 0.0
+        self.centre = np.broadcast_to(
+            np.asarray(centre, dtype=float), (self.dims,)
+        )
+        self._norm_const = 0.5 * np.log(2 * np.pi * width**2)
+
+        distance = min(
+            np.min(self.centre - self.lower_bounds),
+            np.min(self.upper_bounds - self.centre),
+        )
+        if _radial_peak(self.dims, radius, width) + 10 * width <= distance:
+            self.ln_evidence = compute_gaussian_shell_ln_evidence(
+                self.dims, bounds, radius=radius, width=width
+            )
+        else:
+            self.ln_evidence = None
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Gaussian shell log-likelihood."""
+        return self.evaluate_in_blocks(self._log_likelihood_block, x)
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
+        r = np.sqrt(np.sum((x - self.centre) ** 2, axis=-1))
+        return -0.5 * ((r - self.radius) / self.width) ** 2 - self._norm_const
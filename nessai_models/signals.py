@@ -1,11 +1,21 @@
 """Signal plus noise models."""
 
 from abc import abstractmethod
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
+from scipy.special import logsumexp
+from scipy.stats import truncnorm
 
 from .base import BaseModel, UniformPriorMixin
+from .noise import BandedCovariance, ToeplitzCovariance
+from .utils import log_normal_probability
+
+N_BOX_NODES = 64
+"""Number of Gauss-Legendre nodes used to integrate the conditional
+posterior over the prior bounds when two parameters with uniform priors are
+marginalised."""
 
 
 class GaussianNoisePlusSignal(UniformPriorMixin, BaseModel):
@@ -18,7 +28,8 @@ class GaussianNoisePlusSignal(UniformPriorMixin, BaseModel):
     truth : dict
         Dictionary contain the true value for the injected signal.
     sigma : float
-        Standard deviation of the Gaussian noise.
+        Standard deviation of the Gaussian noise. Only used if the noise is
+        uncorrelated.
     bounds : Dict
         Prior bounds for the parameters.
     n_points : int
@@ -27,8 +38,28 @@ class GaussianNoisePlusSignal(UniformPriorMixin, BaseModel):
         The starting x-value.
     end : float
         The ending x-value.
+    autocovariance : Optional[numpy.ndarray]
+        Autocovariance of stationary correlated noise at lags 0 to
+        n_points - 1. See
+        :py:class:`nessai_models.noise.ToeplitzCovariance`.
+    banded_covariance : Optional[numpy.ndarray]
+        Lower triangle of a banded noise covariance matrix. See
+        :py:class:`nessai_models.noise.BandedCovariance`.
+    marginalise : Optional[Union[Sequence[str], Dict]]
+        Parameters in :code:`linear_parameters` to marginalise analytically.
+        Either a list of names, in which case the priors are uniform on the
+        prior bounds, or a dictionary mapping each name to :code:`None` for a
+        uniform prior or to :code:`(mean, sigma)` for a Gaussian prior. The
+        marginalised parameters are removed from :code:`names`. At most two
+        parameters with uniform priors can be marginalised and at least two
+        parameters must remain. See
+        :py:meth:`reconstruct_marginalised_parameters`.
     """
 
+    linear_parameters: List[str] = []
+    """Parameters the signal depends on linearly, these can be
+    marginalised analytically."""
+
     def __init__(
         self,
         names: List[str],
@@ -38,11 +69,32 @@ class GaussianNoisePlusSignal(UniformPriorMixin, BaseModel):
         n_points: int = 100,
         start: float = 0.0,
         end: float = 1.0,
+        autocovariance: Optional[np.ndarray] = None,
+        banded_covariance: Optional[np.ndarray] = None,
+        marginalise: Optional[
+            Union[Sequence[str], Dict[str, Optional[Sequence[float]]]]
+        ] = None,
     ) -> None:
         self.names = names
 
+        if autocovariance is not None and banded_covariance is not None:
+            raise ValueError(
+                "Specify only one of autocovariance and banded_covariance"
+            )
+        elif autocovariance is not None:
+            self.noise_covariance = ToeplitzCovariance(autocovariance)
+        elif banded_covariance is not None:
+            self.noise_covariance = BandedCovariance(banded_covariance)
+        else:
+            self.noise_covariance = None
+        if (
+            self.noise_covariance is not None
+            and self.noise_covariance.n_points != n_points
+        ):
+            raise ValueError("Noise covariance does not match n_points")
+
         if truth is None:
-            truth = {k: np.random.uniform(*v) for k, v in bounds.items()}
+            truth = self._draw_truth(bounds)
         elif list(truth.keys()) != self.names:
             raise ValueError("Keys in truth dictionary do not match names")
 
@@ -51,9 +103,92 @@ class GaussianNoisePlusSignal(UniformPriorMixin, BaseModel):
         self.sigma = sigma
 
         self.x = np.linspace(start, end, n_points)[:, np.newaxis]
-        self.data = self.signal_model(
-            **self.truth
-        ) + self.sigma * np.random.randn(n_points, 1)
+        self.data = self._generate_data()
+
+        self._setup_marginalisation(marginalise)
+
+    def _draw_truth(self, bounds: Dict) -> Dict:
+        return {k: np.random.uniform(*v) for k, v in bounds.items()}
+
+    def _generate_data(self) -> np.ndarray:
+        return self.signal_model(**self.truth) + self.generate_noise()
+
+    def _setup_marginalisation(
+        self,
+        marginalise: Optional[
+            Union[Sequence[str], Dict[str, Optional[Sequence[float]]]]
+        ],
+    ) -> None:
+        if not marginalise:
+            self.marginalised = []
+            return
+        if not isinstance(marginalise, dict):
+            marginalise = {name: None for name in marginalise}
+        not_linear = set(marginalise) - set(self.linear_parameters)
+        if not_linear:
+            raise ValueError(
+                f"Cannot marginalise {sorted(not_linear)}, only "
+                f"{self.linear_parameters} enter the signal linearly"
+            )
+        self.marginalised = [n for n in self.names if n in marginalise]
+        if len(self.names) - len(self.marginalised) < 2:
+            raise ValueError(
+                "At least two parameters must not be marginalised since "
+                "nessai does not support one-dimensional models"
+            )
+        self.marginalised_bounds = {
+            n: self.bounds[n] for n in self.marginalised
+        }
+        self.marginalised_priors = {
+            n: marginalise[n] for n in self.marginalised
+        }
+        self._uniform = np.array(
+            [marginalise[n] is None for n in self.marginalised]
+        )
+        if np.sum(self._uniform) > 2:
+            raise ValueError(
+                "At most two parameters with uniform priors can be "
+                "marginalised"
+            )
+        gaussian = [
+            marginalise[n] for n in self.marginalised if marginalise[n]
+        ]
+        gaussian_mean, gaussian_sigma = np.reshape(
+            np.array(gaussian, dtype=float), (-1, 2)
+        ).T
+        if np.any(gaussian_sigma <= 0):
+            raise ValueError(
+                "Standard deviation of the prior must be positive"
+            )
+        self._prior_mean = np.zeros(len(self.marginalised))
+        self._prior_precision = np.zeros(len(self.marginalised))
+        self._prior_mean[~self._uniform] = gaussian_mean
+        self._prior_precision[~self._uniform] = gaussian_sigma**-2.0
+        lower, upper = np.array(
+            [self.marginalised_bounds[n] for n in self.marginalised],
+            dtype=float,
+        ).T
+        self._prior_lower = lower[self._uniform]
+        self._prior_upper = upper[self._uniform]
+        self._log_prior_norm = -np.sum(
+            np.log(self._prior_upper - self._prior_lower)
+        ) - 0.5 * np.sum(np.log(2 * np.pi * gaussian_sigma**2))
+
+        self.full_names = list(self.names)
+        self.names = [n for n in self.names if n not in self.marginalised]
+        self.bounds = {n: self.bounds[n] for n in self.names}
+
+    def generate_noise(self) -> np.ndarray:
+        """Generate a realisation of the noise.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of noise with the same shape as :code:`x`.
+        """
+        if self.noise_covariance is not None:
+            return self.noise_covariance.sample().reshape(self.x.shape)
+        return self.sigma * np.random.randn(*self.x.shape)
 
     @abstractmethod
     def signal_model(self):
@@ -63,23 +198,295 @@ class GaussianNoisePlusSignal(UniformPriorMixin, BaseModel):
         """
         raise NotImplementedError
 
+    def linear_basis(self, name: str, **kwargs) -> np.ndarray:
+        """Derivative of the signal with respect to a linear parameter.
+
+        Defaults to the difference between the signal with the parameter set
+        to one and zero. Child classes can override this. Should be defined
+        using named arguments.
+
+        Parameters
+        ----------
+        name : str
+            Name of the linear parameter.
+        kwargs :
+            Values of the other parameters.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array that broadcasts with the output of :code:`signal_model`.
+        """
+        return self.signal_model(**kwargs, **{name: 1.0}) - self.signal_model(
+            **kwargs, **{name: 0.0}
+        )
+
     def log_likelihood(self, x: np.ndarray) -> np.ndarray:
         """Compute the log-likelihood"""
-        fits = self.signal_model(**{n: x[n] for n in self.names})
+        if self.skip_out_of_prior:
+            return super().log_likelihood(x)
+        return self._log_likelihood({n: x[n] for n in self.names})
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Compute the log-likelihood for an unstructured array"""
+        return self._log_likelihood(
+            {n: x[..., i] for i, n in enumerate(self.names)}
+        )
+
+    def _log_likelihood(self, parameters: Dict[str, np.ndarray]) -> np.ndarray:
+        if self.marginalised:
+            return self._marginalised_log_likelihood(parameters)
+        fits = self.signal_model(**parameters)
+        if self.noise_covariance is not None:
+            whitened = self.noise_covariance.whiten(self.data - fits)
+            return -0.5 * (
+                np.sum(whitened**2, axis=0)
+                + self.noise_covariance.log_det
+                + self.x.shape[0] * np.log(2 * np.pi)
+            )
         log_l = np.sum(
             -0.5 * (((self.data - fits) / self.sigma) ** 2)
-            - np.log(2 * np.pi * self.sigma**2),
+            - 0.5 * np.log(2 * np.pi * self.sigma**2),
             axis=0,
         )
         return log_l
 
+    def _whiten(self, x: np.ndarray) -> np.ndarray:
+        if self.noise_covariance is not None:
+            return self.noise_covariance.whiten(x)
+        return x / self.sigma
+
+    def _log_norm(self) -> float:
+        """Constant in the log-likelihood that does not depend on the
+        parameters."""
+        if self.noise_covariance is not None:
+            return -0.5 * (
+                self.noise_covariance.log_det
+                + self.x.shape[0] * np.log(2 * np.pi)
+            )
+        return -0.5 * self.x.shape[0] * np.log(2 * np.pi * self.sigma**2)
+
+    def _conditional_posterior(self, parameters: Dict[str, np.ndarray]):
+        """Gaussian conditional posterior of the marginalised parameters.
+
+        The uniform priors are not included, i.e. this is the posterior
+        before truncating to the prior bounds.
+
+        Returns
+        -------
+        mean : numpy.ndarray
+            Mean with shape (n_samples, n_marginalised).
+        precision : numpy.ndarray
+            Precision matrix with shape
+            (n_samples, n_marginalised, n_marginalised).
+        chi2 : numpy.ndarray
+            Sum of the squared whitened residuals at the mean, including the
+            Gaussian priors.
+        """
+        zeros = {n: 0.0 for n in self.marginalised}
+        residual = self.data - self.signal_model(**parameters, **zeros)
+        shape = np.broadcast_shapes(
+            residual.shape, *(np.shape(v) for v in parameters.values())
+        )
+        residual = np.broadcast_to(residual, shape)
+        basis = np.stack(
+            [
+                np.broadcast_to(
+                    self.linear_basis(
+                        name,
+                        **parameters,
+                        **{n: 0.0 for n in self.marginalised if n != name},
+                    ),
+                    residual.shape,
+                )
+                for name in self.marginalised
+            ],
+            axis=-1,
+        )
+        residual = self._whiten(residual)
+        basis = self._whiten(basis)
+        b = np.einsum("...k,...->...k", basis, residual).sum(axis=0)
+        b += self._prior_precision * self._prior_mean
+        precision = np.einsum("...k,...l->...kl", basis, basis).sum(axis=0)
+        diagonal = np.arange(len(self.marginalised))
+        # Regularises directions the data do not constrain, e.g. the
+        # amplitude of a sinusoid with zero frequency. For a uniform prior
+        # this gives the correct limit.
+        precision[..., diagonal, diagonal] += (
+            self._prior_precision
+            + 1e-12
+            * np.max(
+                precision[..., diagonal, diagonal], axis=-1, keepdims=True
+            )
+            + np.finfo(float).tiny
+        )
+        mean = np.linalg.solve(precision, b[..., np.newaxis])[..., 0]
+        chi2 = (
+            np.sum(residual**2, axis=0)
+            + np.sum(self._prior_precision * self._prior_mean**2)
+            - np.sum(b * mean, axis=-1)
+        )
+        return mean, precision, chi2
+
+    def _marginalised_log_likelihood(
+        self, parameters: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        mean, precision, chi2 = self._conditional_posterior(parameters)
+        chol = np.linalg.cholesky(precision)
+        log_det = 2 * np.sum(np.log(np.einsum("...kk->...k", chol)), axis=-1)
+        k = len(self.marginalised)
+        log_l = (
+            self._log_norm()
+            + self._log_prior_norm
+            - 0.5 * chi2
+            + 0.5 * k * np.log(2 * np.pi)
+            - 0.5 * log_det
+        )
+        if np.any(self._uniform):
+            cov = np.linalg.inv(precision)[..., self._uniform, :][
+                ..., self._uniform
+            ]
+            log_l += _log_box_probability(
+                mean[..., self._uniform],
+                cov,
+                self._prior_lower,
+                self._prior_upper,
+            )
+        return log_l
+
+    def reconstruct_marginalised_parameters(
+        self,
+        samples: np.ndarray,
+        random_state: Optional[np.random.Generator] = None,
+        max_iterations: int = 1000,
+    ) -> np.ndarray:
+        """Draw the marginalised parameters for each sample.
+
+        Each set of marginalised parameters is drawn from the conditional
+        posterior given the other parameters, which is a Gaussian truncated
+        to the prior bounds of any parameters with uniform priors. Applied
+        to samples from the posterior of the marginalised model, this gives
+        samples from the full posterior.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            Structured array of samples, e.g. the posterior samples from
+            nessai.
+        random_state : Optional[numpy.random.Generator]
+            Random number generator. If not specified, the global numpy
+            random state is used.
+        max_iterations : int
+            Maximum number of iterations of rejection sampling used when two
+            parameters with uniform priors are marginalised.
+
+        Returns
+        -------
+        numpy.ndarray
+            Structured array with all of the parameters, followed by any
+            other fields in :code:`samples`.
+
+        Raises
+        ------
+        RuntimeError
+            If the rejection sampling does not finish within
+            :code:`max_iterations`.
+        """
+        if not self.marginalised:
+            raise RuntimeError("No parameters have been marginalised")
+        samples = np.atleast_1d(samples)
+        parameters = {n: samples[n] for n in self.names}
+        mean, precision, _ = self._conditional_posterior(parameters)
+        cov = np.linalg.inv(precision)
+        if random_state is None:
+            normal = np.random.standard_normal
+        else:
+            normal = random_state.standard_normal
+
+        u = self._uniform
+        n = len(samples)
+        theta = np.empty((n, len(self.marginalised)))
+        if np.any(u):
+            mean_u = mean[:, u]
+            cov_u = cov[:, u][:, :, u]
+            if np.sum(u) == 1:
+                scale = np.sqrt(cov_u[:, 0, 0])
+                theta[:, u] = truncnorm.rvs(
+                    (self._prior_lower - mean_u[:, 0]) / scale,
+                    (self._prior_upper - mean_u[:, 0]) / scale,
+                    loc=mean_u[:, 0],
+                    scale=scale,
+                    random_state=random_state,
+                )[:, np.newaxis]
+            else:
+                chol = np.linalg.cholesky(cov_u)
+                theta_u = np.empty_like(mean_u)
+                remaining = np.arange(n)
+                for _ in range(max_iterations):
+                    draw = mean_u[remaining] + np.einsum(
+                        "...kl,...l->...k",
+                        chol[remaining],
+                        normal(mean_u[remaining].shape),
+                    )
+                    accept = np.all(
+                        (draw >= self._prior_lower)
+                        & (draw <= self._prior_upper),
+                        axis=-1,
+                    )
+                    theta_u[remaining[accept]] = draw[accept]
+                    remaining = remaining[~accept]
+                    if not remaining.size:
+                        break
+                else:
+                    raise RuntimeError(
+                        "Rejection sampling did not finish within "
+                        f"{max_iterations} iterations"
+                    )
+                theta[:, u] = theta_u
+        g = ~u
+        if np.any(g):
+            mean_g = mean[:, g]
+            cov_g = cov[:, g][:, :, g]
+            if np.any(u):
+                # Condition on the parameters with uniform priors
+                cov_ug = cov[:, u][:, :, g]
+                gain = np.linalg.solve(cov_u, cov_ug)
+                mean_g = mean_g + np.einsum(
+                    "...kl,...k->...l", gain, theta[:, u] - mean_u
+                )
+                cov_g = cov_g - np.einsum("...kl,...km->...lm", cov_ug, gain)
+            chol = np.linalg.cholesky(cov_g)
+            theta[:, g] = mean_g + np.einsum(
+                "...kl,...l->...k", chol, normal(mean_g.shape)
+            )
+
+        extra = [
+            (name, samples.dtype[name])
+            for name in samples.dtype.names
+            if name not in self.full_names
+        ]
+        out = np.empty(
+            n, dtype=[(name, "f8") for name in self.full_names] + extra
+        )
+        for name in self.names:
+            out[name] = samples[name]
+        for i, name in enumerate(self.marginalised):
+            out[name] = theta[:, i]
+        for name, _ in extra:
+            out[name] = samples[name]
+        return out
+
 
 class LinearSignal(GaussianNoisePlusSignal):
     """Linear signal model in Gaussian noise.
 
     Parameter names are: m, c
+
+    Keyword arguments are passed to :py:class:`GaussianNoisePlusSignal`.
     """
 
+    linear_parameters = ["m", "c"]
+
     def __init__(
         self,
         truth: Optional[Dict] = None,
@@ -88,6 +495,7 @@ class LinearSignal(GaussianNoisePlusSignal):
         n_points: int = 100,
         start: float = 0,
         end: float = 10,
+        **kwargs,
     ) -> None:
         names = ["m", "c"]
         if bounds is None:
@@ -104,17 +512,444 @@ class LinearSignal(GaussianNoisePlusSignal):
             n_points=n_points,
             start=start,
             end=end,
+            **kwargs,
         )
 
     def signal_model(self, *, m, c) -> np.ndarray:
         """Linear signal model."""
         return m * self.x + c
 
+    def linear_basis(self, name: str, **kwargs) -> np.ndarray:
+        """Derivative of the signal with respect to m or c."""
+        if name == "m":
+            return self.x
+        return np.ones_like(self.x)
+
 
 class SinusoidalSignal(GaussianNoisePlusSignal):
     """Sinusoidal signal model in Gaussian noise.
 
     Parameter names are: amp, phase, f, offset
+
+    The amplitude and offset are linear and can be marginalised, which
+    leaves a two-dimensional problem in frequency and phase, see
+    :py:class:`GaussianNoisePlusSignal`. Keyword arguments are passed to
+    :py:class:`GaussianNoisePlusSignal`.
+    """
+
+    linear_parameters = ["amp", "offset"]
+
+    def __init__(
+        self,
+        truth: Optional[Dict] = None,
+        sigma: float = 1,
+        bounds: Optional[Dict] = None,
+        n_points: int = 100,
+        start: float = 0,
+        end: float = 10,
+        **kwargs,
+    ) -> None:
+        names = ["amp", "phase", "f", "offset"]
+        if bounds is None:
+            bounds = dict(
+                amp=[0, 1],
+                f=[0, 5],
+                phase=[0, 2 * np.pi],
+                offset=[0, 5],
+            )
+
+        super().__init__(
+            names=names,
+            truth=truth,
+            sigma=sigma,
+            bounds=bounds,
+            n_points=n_points,
+            start=start,
+            end=end,
+            **kwargs,
+        )
+
+    def signal_model(self, *, amp, f, phase, offset) -> np.ndarray:
+        """Sinusoidal signal model."""
+        return amp * np.sin(2 * np.pi * f * self.x + phase) + offset
+
+    def linear_basis(self, name: str, *, f, phase, **kwargs) -> np.ndarray:
+        """Derivative of the signal with respect to amp or offset."""
+        if name == "amp":
+            return np.sin(2 * np.pi * f * self.x + phase)
+        return np.ones_like(self.x)
+
+
+class MultiRealisationMixin:
+    """Mixin for signal models with several realisations of the data.
+
+    Holds :code:`n_realisations` realisations of the data, each with its own
+    true parameters and noise, in a single array with shape
+    (n_realisations, n_points). This is intended for probability-probability
+    (PP) tests, where the same analysis is repeated for many injections.
+    The true parameters are drawn from the prior and the noise is drawn
+    using a :py:class:`numpy.random.Generator`, so the realisations are
+    reproducible given the seed.
+
+    :py:meth:`log_likelihood` and :py:meth:`log_likelihood_array` use the
+    realisation selected by :py:attr:`realisation`, so the model can be
+    passed directly to nessai. :py:meth:`log_likelihood_realisations_array`
+    evaluates a batch of samples for all or some of the realisations with a
+    single matrix product.
+
+    Must be used with a subclass of :py:class:`GaussianNoisePlusSignal`
+    that sets the parameter names and prior bounds. Analytic marginalisation
+    is not supported.
+
+    Parameters
+    ----------
+    n_realisations : int
+        Number of realisations of the data.
+    seed : Optional[int]
+        Seed for the random number generator used to draw the true
+        parameters and the noise. If not specified, a seed is drawn from
+        the global numpy random number generator.
+    truths : Optional[Dict]
+        Dictionary mapping each parameter to an array of true values with
+        length :code:`n_realisations`. If not specified, the true values are
+        drawn from the prior.
+    realisation : int
+        Index of the realisation used by :py:meth:`log_likelihood`.
+    kwargs :
+        Keyword arguments passed to the signal model.
+    """
+
+    def __init__(
+        self,
+        n_realisations: int = 100,
+        seed: Optional[int] = None,
+        truths: Optional[Dict[str, Sequence[float]]] = None,
+        realisation: int = 0,
+        **kwargs,
+    ) -> None:
+        if n_realisations < 1:
+            raise ValueError("n_realisations must be positive")
+        if kwargs.get("truth") is not None:
+            raise ValueError(
+                "Specify the true parameters of each realisation with truths"
+            )
+        if kwargs.get("marginalise"):
+            raise ValueError(
+                "Marginalisation is not supported with multiple realisations"
+            )
+        if seed is None:
+            seed = np.random.randint(2**31)
+        self.n_realisations = n_realisations
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self._truths = truths
+        self._realisation = self._check_realisation(realisation)
+        super().__init__(**kwargs)
+
+    def _get_init_kwargs(self) -> Dict:
+        kwargs = super()._get_init_kwargs()
+        kwargs["realisation"] = self.realisation
+        return kwargs
+
+    def _check_realisation(self, index: int) -> int:
+        index = int(index)
+        if not -self.n_realisations <= index < self.n_realisations:
+            raise IndexError(
+                f"Realisation {index} is out of range for "
+                f"{self.n_realisations} realisations"
+            )
+        return index % self.n_realisations
+
+    def _draw_truth(self, bounds: Dict) -> Dict:
+        if self._truths is None:
+            self.truths = {
+                k: self.rng.uniform(*bounds[k], size=self.n_realisations)
+                for k in self.names
+            }
+        else:
+            if list(self._truths.keys()) != self.names:
+                raise ValueError(
+                    "Keys in truths dictionary do not match names"
+                )
+            self.truths = {
+                k: np.asarray(v, dtype=float) for k, v in self._truths.items()
+            }
+            if any(
+                v.shape != (self.n_realisations,) for v in self.truths.values()
+            ):
+                raise ValueError(
+                    "Each array in truths must have length n_realisations"
+                )
+        return {k: float(v[self.realisation]) for k, v in self.truths.items()}
+
+    def _generate_data(self) -> np.ndarray:
+        signal = self.signal_model(
+            **{k: v[np.newaxis, :] for k, v in self.truths.items()}
+        ).T
+        if self.noise_covariance is not None:
+            noise = self.noise_covariance.sample(
+                self.n_realisations, rng=self.rng
+            )
+        else:
+            noise = self.sigma * self.rng.standard_normal(signal.shape)
+        self.data_realisations = np.ascontiguousarray(signal + noise)
+        # The whitened data and their norms are reused by every call to
+        # log_likelihood_realisations_array
+        self._whitened_realisations = np.ascontiguousarray(
+            self._whiten(self.data_realisations.T).T
+        )
+        self._whitened_norms = np.sum(self._whitened_realisations**2, axis=1)
+        return self.data_realisations[self.realisation][:, np.newaxis]
+
+    @property
+    def realisation(self) -> int:
+        """Index of the realisation used by :py:meth:`log_likelihood`.
+
+        Setting the index also updates :code:`data` and :code:`truth`.
+        """
+        return self._realisation
+
+    @realisation.setter
+    def realisation(self, index: int) -> None:
+        index = self._check_realisation(index)
+        self._realisation = index
+        self.truth = {k: float(v[index]) for k, v in self.truths.items()}
+        self.data = self.data_realisations[index][:, np.newaxis]
+
+    def log_likelihood_realisations_array(
+        self,
+        x: np.ndarray,
+        realisations: Optional[Union[int, Sequence[int], slice]] = None,
+    ) -> np.ndarray:
+        """Log-likelihood of a batch of samples for several realisations.
+
+        The squared norm of the whitened residuals is expanded as
+        :code:`|d|^2 - 2 d.s + |s|^2`, where the norms of the whitened data
+        are precomputed, so the signal is computed once per sample and all
+        the realisations are evaluated with a single matrix product. The
+        expansion can differ from :py:meth:`log_likelihood_array` by a few
+        units in the last place relative to the squared norm of the data.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Unstructured array of samples with shape (n_samples, dims) or
+            (dims,).
+        realisations : Optional[Union[int, Sequence[int], slice]]
+            Index of the realisations to evaluate. If not specified, all
+            the realisations are evaluated.
+
+        Returns
+        -------
+        numpy.ndarray
+            Log-likelihood with shape (n_realisations, n_samples). The
+            first dimension is dropped if :code:`realisations` is an integer
+            and the last dimension is dropped if :code:`x` is a single
+            sample.
+        """
+        x = np.asarray(x)
+        single = x.ndim == 1
+        x = np.atleast_2d(x)
+        fits = self._whiten(
+            self.signal_model(**{n: x[:, i] for i, n in enumerate(self.names)})
+        )
+        if realisations is None:
+            data = self._whitened_realisations
+            norms = self._whitened_norms
+        else:
+            data = self._whitened_realisations[realisations]
+            norms = self._whitened_norms[realisations]
+        chi_squared = (
+            np.asarray(norms)[..., np.newaxis]
+            - 2 * (data @ fits)
+            + np.sum(fits**2, axis=0)
+        )
+        log_l = self._log_norm() - 0.5 * chi_squared
+        return log_l[..., 0] if single else log_l
+
+    def log_likelihood_realisations(
+        self,
+        x: np.ndarray,
+        realisations: Optional[Union[int, Sequence[int], slice]] = None,
+    ) -> np.ndarray:
+        """Log-likelihood of a batch of structured samples for several
+        realisations.
+
+        See :py:meth:`log_likelihood_realisations_array`.
+        """
+        return self.log_likelihood_realisations_array(
+            self.unstructured_view(x), realisations=realisations
+        )
+
+
+class MultiRealisationLinearSignal(MultiRealisationMixin, LinearSignal):
+    """Linear signal model with several realisations of the data.
+
+    See :py:class:`MultiRealisationMixin` and :py:class:`LinearSignal`.
+    """
+
+
+class MultiRealisationSinusoidalSignal(
+    MultiRealisationMixin, SinusoidalSignal
+):
+    """Sinusoidal signal model with several realisations of the data.
+
+    See :py:class:`MultiRealisationMixin` and
+    :py:class:`SinusoidalSignal`.
+    """
+
+
+class FrequencyDomainGaussianNoisePlusSignal(GaussianNoisePlusSignal):
+    """Signal in stationary Gaussian noise with a frequency-domain likelihood.
+
+    The data are Fourier transformed once at construction and the
+    log-likelihood is the noise-weighted inner product of the residual
+    restricted to the frequency band :code:`[f_min, f_max]`. The
+    log-likelihood is defined up to a constant that does not depend on the
+    parameters.
+
+    Child classes must implement :code:`signal_model` and can implement
+    :code:`frequency_domain_signal_model` to avoid computing the signal in
+    the time domain.
+
+    Parameters
+    ----------
+    names : List[str]
+        Names of the parameters
+    truth : dict
+        Dictionary contain the true value for the injected signal.
+    sigma : float
+        Standard deviation of the Gaussian noise. Only used if :code:`psd`
+        is not specified.
+    bounds : Dict
+        Prior bounds for the parameters.
+    n_points : int
+        The number of data points to use.
+    start : float
+        The starting x-value.
+    end : float
+        The ending x-value.
+    psd : Optional[Union[Callable, numpy.ndarray]]
+        One-sided power spectral density of the noise. Either a function of
+        frequency or an array evaluated at the frequencies given by
+        :code:`numpy.fft.rfftfreq(n_points, dx)`. If not specified, white
+        noise with standard deviation :code:`sigma` is used, which
+        corresponds to a PSD of :code:`2 * sigma ** 2 * dx`.
+    f_min : Optional[float]
+        Minimum frequency included in the likelihood.
+    f_max : Optional[float]
+        Maximum frequency included in the likelihood.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        truth: Optional[Dict] = None,
+        sigma: float = 1.0,
+        bounds: Dict = None,
+        n_points: int = 100,
+        start: float = 0.0,
+        end: float = 1.0,
+        psd: Optional[Union[Callable, np.ndarray]] = None,
+        f_min: Optional[float] = None,
+        f_max: Optional[float] = None,
+    ) -> None:
+        self.dx = (end - start) / (n_points - 1)
+        self.frequencies = np.fft.rfftfreq(n_points, self.dx)
+        if psd is None:
+            self.psd = 2 * sigma**2 * self.dx * np.ones(len(self.frequencies))
+        elif callable(psd):
+            self.psd = np.asarray(psd(self.frequencies), dtype=float)
+        else:
+            self.psd = np.asarray(psd, dtype=float)
+        if self.psd.shape != self.frequencies.shape:
+            raise ValueError(
+                "psd must have the same length as the number of frequencies"
+            )
+
+        f_min = 0.0 if f_min is None else f_min
+        f_max = self.frequencies[-1] if f_max is None else f_max
+        self.band = np.flatnonzero(
+            (self.frequencies >= f_min) & (self.frequencies <= f_max)
+        )
+        if not self.band.size:
+            raise ValueError("No frequencies between f_min and f_max")
+        if np.any(self.psd[self.band] <= 0):
+            raise ValueError("psd must be positive between f_min and f_max")
+
+        super().__init__(
+            names=names,
+            truth=truth,
+            sigma=sigma,
+            bounds=bounds,
+            n_points=n_points,
+            start=start,
+            end=end,
+        )
+
+        # Variance of the noise in each frequency bin, the zero and Nyquist
+        # frequencies are real and are only counted once.
+        variance = n_points * self.psd[self.band] / (2 * self.dx)
+        counts = np.where(
+            (self.band == 0) | (2 * self.band == n_points), 1.0, 2.0
+        )
+        self.weights = (counts / variance)[:, np.newaxis]
+        self.data_fd = np.fft.rfft(self.data, axis=0)[self.band]
+
+    def generate_noise(self) -> np.ndarray:
+        """Generate a realisation of the noise from the PSD.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of noise with the same shape as :code:`x`.
+        """
+        n = self.x.shape[0]
+        scale = np.sqrt(n * self.psd / (4 * self.dx))
+        noise = scale * (
+            np.random.randn(len(self.frequencies))
+            + 1j * np.random.randn(len(self.frequencies))
+        )
+        # The zero and Nyquist frequencies must be real
+        noise[0] = np.sqrt(2) * scale[0] * np.random.randn()
+        if n % 2 == 0:
+            noise[-1] = np.sqrt(2) * scale[-1] * np.random.randn()
+        return np.fft.irfft(noise, n=n)[:, np.newaxis]
+
+    def frequency_domain_signal_model(self, **kwargs) -> np.ndarray:
+        """Discrete Fourier transform of the signal in the frequency band.
+
+        Defaults to transforming the output of :code:`signal_model`. Should
+        be defined using named arguments.
+
+        Returns
+        -------
+        numpy.ndarray
+            Complex array with shape (# frequencies, # samples).
+        """
+        return np.fft.rfft(self.signal_model(**kwargs), axis=0)[self.band]
+
+    def _log_likelihood(self, parameters: Dict[str, np.ndarray]) -> np.ndarray:
+        residual = self.data_fd - self.frequency_domain_signal_model(
+            **parameters
+        )
+        return -0.5 * np.sum(
+            self.weights * (residual.real**2 + residual.imag**2), axis=0
+        )
+
+
+class FrequencyDomainSinusoidalSignal(FrequencyDomainGaussianNoisePlusSignal):
+    """Sinusoidal signal model in stationary Gaussian noise with a
+    frequency-domain likelihood.
+
+    The Fourier transform of the signal is computed analytically at only the
+    frequencies in the band, so the cost of the likelihood scales with the
+    number of frequencies in the band rather than :code:`n_points`.
+
+    Parameter names are: amp, phase, f, offset
+
+    See :py:class:`FrequencyDomainGaussianNoisePlusSignal` for details of
+    :code:`psd`, :code:`f_min` and :code:`f_max`.
     """
 
     def __init__(
@@ -125,6 +960,9 @@ class SinusoidalSignal(GaussianNoisePlusSignal):
         n_points: int = 100,
         start: float = 0,
         end: float = 10,
+        psd: Optional[Union[Callable, np.ndarray]] = None,
+        f_min: Optional[float] = None,
+        f_max: Optional[float] = None,
     ) -> None:
         names = ["amp", "phase", "f", "offset"]
         if bounds is None:
@@ -143,8 +981,108 @@ class SinusoidalSignal(GaussianNoisePlusSignal):
             n_points=n_points,
             start=start,
             end=end,
+            psd=psd,
+            f_min=f_min,
+            f_max=f_max,
         )
+        self._start = start
+        self._k = 2 * np.pi * self.band[:, np.newaxis] / n_points
 
     def signal_model(self, *, amp, f, phase, offset) -> np.ndarray:
         """Sinusoidal signal model."""
         return amp * np.sin(2 * np.pi * f * self.x + phase) + offset
+
+    def frequency_domain_signal_model(
+        self, *, amp, f, phase, offset
+    ) -> np.ndarray:
+        """Analytic discrete Fourier transform of the sinusoidal signal."""
+        n = self.x.shape[0]
+        omega = 2 * np.pi * np.asarray(f) * self.dx
+        theta = np.exp(1j * (2 * np.pi * f * self._start + phase))
+        h = (amp / 2j) * (
+            theta * _geometric_sum(omega - self._k, n)
+            - _geometric_sum(-omega - self._k, n) / theta
+        )
+        return h + np.where(self.band == 0, n, 0)[:, np.newaxis] * offset
+
+
+def _geometric_sum(alpha: np.ndarray, n: int) -> np.ndarray:
+    """Compute sum_{j=0}^{n-1} exp(i alpha j) using the Dirichlet kernel."""
+    half = 0.5 * alpha
+    den = np.sin(half)
+    small = np.abs(den) < 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(
+            small,
+            n * np.cos(n * half) / np.cos(half),
+            np.sin(n * half) / den,
+        )
+    return np.exp(1j * half * (n - 1)) * ratio
+
+
+@lru_cache()
+def _gauss_legendre(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    return np.polynomial.legendre.leggauss(n)
+
+
+def _log_box_probability(
+    mean: np.ndarray,
+    cov: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+) -> np.ndarray:
+    """Log-probability that a one or two-dimensional Gaussian is within a
+    box.
+
+    The two-dimensional case integrates the marginal of the first parameter
+    times the probability of the conditional of the second using
+    Gauss-Legendre quadrature, restricted to where the marginal is
+    non-negligible.
+
+    Parameters
+    ----------
+    mean : numpy.ndarray
+        Means with shape (..., k).
+    cov : numpy.ndarray
+        Covariance matrices with shape (..., k, k).
+    lower, upper : numpy.ndarray
+        Bounds of the box with shape (k,).
+
+    Returns
+    -------
+    numpy.ndarray
+        Log-probabilities with shape (...).
+    """
+    sigma = np.sqrt(cov[..., 0, 0])
+    if mean.shape[-1] == 1:
+        return log_normal_probability(
+            (lower[0] - mean[..., 0]) / sigma,
+            (upper[0] - mean[..., 0]) / sigma,
+        )
+    # Limit the integral to within 10 sigma unless this does not overlap
+    # with the bounds
+    a = np.maximum(lower[0], mean[..., 0] - 10 * sigma)
+    b = np.minimum(upper[0], mean[..., 0] + 10 * sigma)
+    outside = a >= b
+    a = np.where(outside, lower[0], a)[..., np.newaxis]
+    b = np.where(outside, upper[0], b)[..., np.newaxis]
+    nodes, weights = _gauss_legendre(N_BOX_NODES)
+    half_width = 0.5 * (b - a)
+    theta = a + half_width * (nodes + 1)
+    z = (theta - mean[..., :1]) / sigma[..., np.newaxis]
+    log_marginal = (
+        -0.5 * z**2 - 0.5 * np.log(2 * np.pi) - np.log(sigma)[..., np.newaxis]
+    )
+    slope = (cov[..., 0, 1] / cov[..., 0, 0])[..., np.newaxis]
+    conditional_mean = mean[..., 1:] + slope * (theta - mean[..., :1])
+    conditional_sigma = np.sqrt(
+        cov[..., 1, 1] - cov[..., 0, 1] ** 2 / cov[..., 0, 0]
+    )[..., np.newaxis]
+    log_conditional = log_normal_probability(
+        (lower[1] - conditional_mean) / conditional_sigma,
+        (upper[1] - conditional_mean) / conditional_sigma,
+    )
+    return logsumexp(
+        log_marginal + log_conditional + np.log(half_width * weights),
+        axis=-1,
+    )
@@ -1,15 +1,16 @@
-from .gaussianmixture import GaussianMixture
+from .gaussianmixture import ConcentricGaussianMixture, GaussianMixture
 import numpy as np
 
 
-class SlabSpike(GaussianMixture):
+class SlabSpike(ConcentricGaussianMixture):
     def __init__(self, dims=3, spike_scale=1e-3, **kwargs):
-        if "config" not in kwargs.keys():
-            mu = np.zeros(dims)
-            cov_slab = np.diag(np.ones(dims))
-            cov_spike = np.diag(np.ones(dims) * spike_scale)
-            kwargs["config"] = [
-                dict(mean=mu, cov=cov_slab),
-                dict(mean=mu, cov=cov_spike),
-            ]
-        return super().__init__(dims=dims, **kwargs)
+        if "config" in kwargs.keys():
+            self.scales = None
+            return GaussianMixture.__init__(self, dims=dims, **kwargs)
+        return super().__init__(dims=dims, scales=[1.0, spike_scale], **kwargs)
+
+    def _log_likelihood_block(self, x: np.ndarray) -> np.ndarray:
+        # Fallback to the generic mixture if a config was specified
+        if self.scales is None:
+            return GaussianMixture._log_likelihood_block(self, x)
+        return super()._log_likelihood_block(x)
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+Surrogate likelihoods interpolated from an adaptive grid.
+"""
+import hashlib
+import itertools
+import json
+import os
+from typing import List, Optional, Tuple
+import warnings
+
+import numpy as np
+
+from .base import BaseModel, ModelWrapper
+from .utils import get_cache_dir, get_model_hash
+
+MAX_TABULATED_DIMS = 3
+"""Maximum number of dimensions for a tabulated model."""
+
+
+class TabulatedModel(ModelWrapper):
+    """Wrapper that interpolates the log-likelihood of a model from a grid.
+
+    The log-likelihood is tabulated once on a rectilinear grid over the
+    prior bounds and later evaluations use multilinear interpolation, which
+    is much faster than expensive likelihoods, e.g.
+    :py:class:`nessai_models.SinusoidalSignal` with many data points.
+
+    The grid is refined adaptively. Starting from :code:`n_initial` nodes
+    per dimension, the log-likelihood is evaluated at the midpoint of every
+    interval along each dimension and intervals where the error of the
+    linear interpolation is larger than :code:`tolerance / dims` are split,
+    reusing the midpoints as new nodes. This is repeated until no interval
+    is split. :code:`error_estimate` is the sum over dimensions of the
+    largest midpoint error in the final grid, which approximates the
+    maximum absolute error in the log-likelihood.
+
+    Where the log-likelihood is not finite at any of the surrounding nodes,
+    e.g. at the edge of the support of a distribution, the wrapped model is
+    evaluated instead, as it is for samples outside the prior bounds.
+
+    Grids are cached in the cache directory (see
+    :py:func:`nessai_models.utils.get_cache_dir`), keyed by the hash of the
+    wrapped model (see :py:func:`nessai_models.utils.get_model_hash`) and
+    a hash of the settings. When pickled, e.g. to send the model to a worker
+    process, the grid is reloaded from disk rather than copied if the cache
+    file is unchanged.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to wrap. Must have at most three dimensions.
+    n_initial : int
+        Initial number of nodes per dimension.
+    tolerance : float
+        Target for the maximum absolute error in the log-likelihood.
+    max_depth : int
+        Maximum number of times an interval of the initial grid can be
+        split.
+    max_evaluations : int
+        Maximum number of likelihood evaluations used to build the grid.
+        If the tolerance has not been reached before this is exceeded, the
+        refinement stops with a warning.
+    batch_size : int
+        Number of nodes per call to the likelihood. Models that compute
+        arrays with shape (n_data, batch_size), e.g. the signal models,
+        need small batches.
+    cache : bool
+        If True, read and write cached grids.
+
+    Attributes
+    ----------
+    nodes : List[numpy.ndarray]
+        Nodes of the grid in each dimension.
+    values : numpy.ndarray
+        Log-likelihood at the nodes.
+    errors : numpy.ndarray
+        Largest midpoint error in each dimension.
+    error_estimate : float
+        Estimate of the maximum absolute error in the log-likelihood.
+    converged : bool
+        Whether the error in every dimension is less than
+        :code:`tolerance / dims`.
+    n_evaluations : int
+        Number of likelihood evaluations used to build the grid.
+    """
+
+    def __init__(
+        self,
+        model: BaseModel,
+        n_initial: int = 17,
+        tolerance: float = 1e-3,
+        max_depth: int = 12,
+        max_evaluations: int = 2**22,
+        batch_size: int = 1024,
+        cache: bool = True,
+    ) -> None:
+        super().__init__(model)
+        dims = len(self.names)
+        if dims > MAX_TABULATED_DIMS:
+            raise ValueError(
+                "Tabulated models support at most "
+                f"{MAX_TABULATED_DIMS} dimensions"
+            )
+        if n_initial < 2:
+            raise ValueError("n_initial must be at least 2")
+        if tolerance <= 0:
+            raise ValueError("tolerance must be positive")
+        self.settings = dict(
+            n_initial=n_initial,
+            tolerance=tolerance,
+            max_depth=max_depth,
+            max_evaluations=max_evaluations,
+        )
+        self.batch_size = batch_size
+        self.cache_file = None
+        self._cache_stat = None
+        if cache:
+            self.cache_file = self._get_cache_file()
+            if self.cache_file is not None and self._load(self.cache_file):
+                return
+        self._build()
+        if self.cache_file is not None:
+            self._save(self.cache_file)
+
+    def _get_cache_file(self) -> Optional[str]:
+        """Name of the cache file, keyed by the hash of the wrapped model
+        and the settings. Returns None if the model cannot be hashed or the
+        cache directory cannot be created.
+        """
+        try:
+            model_hash = get_model_hash(self.model)
+            cache_dir = get_cache_dir()
+        except (OSError, TypeError) as e:
+            warnings.warn(f"Could not cache the tabulated grid: {e}")
+            return None
+        settings_hash = hashlib.sha256(
+            json.dumps(self.settings, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        return os.path.join(
+            cache_dir, "tabulated", f"{model_hash}-{settings_hash}.npz"
+        )
+
+    def _evaluate_grid(
+        self,
+        nodes: List[np.ndarray],
+        previous: Optional[Tuple[List[np.ndarray], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """Evaluate the log-likelihood of the wrapped model on a grid.
+
+        Values at the nodes of a previous grid are reused rather than
+        evaluated again.
+        """
+        shape = tuple(n.size for n in nodes)
+        values = np.empty(shape)
+        known = np.zeros(shape, dtype=bool)
+        if previous is not None:
+            index_new, index_old = zip(
+                *(
+                    np.intersect1d(new, old, return_indices=True)[1:]
+                    for new, old in zip(nodes, previous[0])
+                )
+            )
+            values[np.ix_(*index_new)] = previous[1][np.ix_(*index_old)]
+            known[np.ix_(*index_new)] = True
+        missing = np.flatnonzero(~known)
+        for start in range(0, missing.size, self.batch_size):
+            index = np.unravel_index(
+                missing[start : start + self.batch_size], shape
+            )
+            x = np.stack([n[i] for n, i in zip(nodes, index)], axis=-1)
+            values[index] = self.model.log_likelihood_array(x)
+        self.n_evaluations += missing.size
+        return values
+
+    def _build(self) -> None:
+        """Tabulate the log-likelihood on an adaptive grid."""
+        n_initial = self.settings["n_initial"]
+        lower, upper = self.lower_bounds, self.upper_bounds
+        dims = lower.size
+        tolerance = self.settings["tolerance"] / dims
+        min_width = (upper - lower) / (n_initial - 1)
+        min_width *= 2.0 ** -self.settings["max_depth"]
+
+        self.n_evaluations = 0
+        self.nodes = [
+            np.linspace(lo, hi, n_initial) for lo, hi in zip(lower, upper)
+        ]
+        self.values = self._evaluate_grid(self.nodes)
+        self.errors = np.full(dims, np.inf)
+        # Largest error in the last pass, including intervals being split
+        measured = np.full(dims, np.inf)
+        # Midpoint grids from the previous pass, so only the midpoints of
+        # new intervals and at new nodes are evaluated
+        previous = dims * [None]
+        self.converged = False
+        while True:
+            split_any = False
+            for d in range(dims):
+                nodes = self.nodes[d]
+                midpoints = 0.5 * (nodes[:-1] + nodes[1:])
+                grid = self.nodes[:d] + [midpoints] + self.nodes[d + 1 :]
+                n_new = np.prod([n.size for n in grid])
+                if previous[d] is not None:
+                    n_new -= np.prod(
+                        [
+                            np.intersect1d(new, old).size
+                            for new, old in zip(grid, previous[d][0])
+                        ]
+                    )
+                if (
+                    self.n_evaluations + n_new
+                    > self.settings["max_evaluations"]
+                ):
+                    warnings.warn(
+                        "Reached the maximum number of evaluations before "
+                        "the tabulated log-likelihood reached the tolerance"
+                    )
+                    self.error_estimate = float(np.sum(measured))
+                    return
+                mid_values = self._evaluate_grid(grid, previous[d])
+                previous[d] = (grid, mid_values)
+                errors = self._midpoint_errors(mid_values, d)
+                measured[d] = np.max(errors)
+                split = (errors > tolerance) & (
+                    np.diff(nodes) > 1.5 * min_width[d]
+                )
+                self.errors[d] = np.max(errors[~split], initial=0.0)
+                if split.any():
+                    split_any = True
+                    index = np.flatnonzero(split)
+                    self.nodes[d] = np.insert(
+                        nodes, index + 1, midpoints[index]
+                    )
+                    self.values = np.insert(
+                        self.values,
+                        index + 1,
+                        np.take(mid_values, index, axis=d),
+                        axis=d,
+                    )
+            if not split_any:
+                break
+        self.converged = bool(np.all(self.errors <= tolerance))
+        self.error_estimate = float(np.sum(self.errors))
+        if not self.converged:
+            warnings.warn(
+                "Reached the maximum depth before the tabulated "
+                "log-likelihood reached the tolerance"
+            )
+
+    def _midpoint_errors(self, mid_values: np.ndarray, d: int) -> np.ndarray:
+        """Largest error of the linear interpolation at the midpoints of
+        each interval along dimension :code:`d`.
+
+        Intervals with a non-finite node are not interpolated, so have no
+        error.
+        """
+        n = mid_values.shape[d]
+        lo = np.take(self.values, np.arange(n), axis=d)
+        hi = np.take(self.values, np.arange(1, n + 1), axis=d)
+        nodes_finite = np.isfinite(lo) & np.isfinite(hi)
+        with np.errstate(invalid="ignore"):
+            error = np.abs(mid_values - 0.5 * (lo + hi))
+        error = np.where(nodes_finite, error, 0.0)
+        axes = tuple(i for i in range(mid_values.ndim) if i != d)
+        return np.max(error, axis=axes)
+
+    def _get_cache_stat(self, filename: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _save(self, filename: str) -> None:
+        tmp = f"{filename}.{os.getpid()}.npz"
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            np.savez(
+                tmp,
+                settings=json.dumps(self.settings),
+                values=self.values,
+                errors=self.errors,
+                error_estimate=self.error_estimate,
+                converged=self.converged,
+                n_evaluations=self.n_evaluations,
+                **{f"nodes_{i}": n for i, n in enumerate(self.nodes)},
+            )
+            os.replace(tmp, filename)
+        except OSError as e:
+            warnings.warn(f"Could not cache the tabulated grid: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self._cache_stat = self._get_cache_stat(filename)
+
+    def _load(self, filename: str) -> bool:
+        """Load a cached grid. Returns False if there is no matching
+        grid.
+        """
+        try:
+            with np.load(filename) as data:
+                if json.loads(str(data["settings"])) != self.settings:
+                    return False
+                self.values = data["values"]
+                self.errors = data["errors"]
+                self.error_estimate = float(data["error_estimate"])
+                self.converged = bool(data["converged"])
+                self.n_evaluations = int(data["n_evaluations"])
+                self.nodes = [
+                    data[f"nodes_{i}"] for i in range(self.values.ndim)
+                ]
+        except (OSError, ValueError, KeyError):
+            return False
+        self._cache_stat = self._get_cache_stat(filename)
+        return True
+
+    def interpolate(self, x: np.ndarray) -> np.ndarray:
+        """Interpolate the log-likelihood from the grid.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims) within the prior bounds.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of interpolated log-likelihoods. The value is NaN if the
+            log-likelihood is not finite at any of the surrounding nodes.
+        """
+        x = np.atleast_2d(x)
+        index = []
+        weights = []
+        for d, nodes in enumerate(self.nodes):
+            i = np.searchsorted(nodes, x[:, d], side="right") - 1
+            i = np.clip(i, 0, nodes.size - 2)
+            index.append(i)
+            weights.append((x[:, d] - nodes[i]) / (nodes[i + 1] - nodes[i]))
+        values = self.values.ravel()
+        strides = np.cumprod((self.values.shape + (1,))[:0:-1])[::-1]
+        out = np.zeros(x.shape[0])
+        finite = np.ones(x.shape[0], dtype=bool)
+        for corner in itertools.product((0, 1), repeat=len(self.nodes)):
+            flat = sum((i + c) * s for i, c, s in zip(index, corner, strides))
+            weight = np.prod(
+                [w if c else 1 - w for w, c in zip(weights, corner)], axis=0
+            )
+            v = values[flat]
+            ok = np.isfinite(v)
+            finite &= ok
+            out += weight * np.where(ok, v, 0.0)
+        out[~finite] = np.nan
+        return out
+
+    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+        """Interpolated log-likelihood."""
+        return self.log_likelihood_array(self.unstructured_view(x))
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Interpolated log-likelihood for an unstructured array.
+
+        Samples outside the prior bounds or where the log-likelihood is
+        not finite at any of the surrounding nodes use the wrapped model.
+        """
+        single = np.ndim(x) < 2
+        x = np.atleast_2d(x)
+        inside = np.all(
+            (x >= self.lower_bounds) & (x <= self.upper_bounds), axis=-1
+        )
+        log_l = np.full(x.shape[0], np.nan)
+        log_l[inside] = self.interpolate(x[inside])
+        exact = np.isnan(log_l)
+        if exact.any():
+            log_l[exact] = self.model.log_likelihood_array(x[exact])
+        return log_l[0] if single else log_l
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # The grid is only reloaded if the file is the one loaded or saved
+        # by this instance, since it could have been replaced
+        if self._cache_stat is not None and (
+            self._get_cache_stat(self.cache_file) == self._cache_stat
+        ):
+            state.pop("values")
+            state.pop("nodes")
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "values" not in state and not self._load(self.cache_file):
+            raise RuntimeError(
+                f"Could not load the tabulated grid from {self.cache_file}"
+            )
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Tempered likelihoods for a ladder of inverse temperatures.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .base import BaseModel, ModelWrapper
+
+
+def _temper(log_l: np.ndarray, betas: np.ndarray) -> np.ndarray:
+    """Multiply the log-likelihood by each inverse temperature.
+
+    Beta equal to zero always gives zero, even if the log-likelihood is
+    infinite.
+    """
+    betas = betas.reshape(betas.shape + (1,) * np.ndim(log_l))
+    with np.errstate(invalid="ignore"):
+        return np.where(betas == 0, 0.0, betas * log_l)
+
+
+class TemperedModel(ModelWrapper):
+    """Wrapper for a model with a tempered likelihood.
+
+    The log-likelihood is the log-likelihood of the wrapped model
+    multiplied by the inverse temperature :code:`beta`. The methods
+    :py:meth:`log_likelihood_ladder` and
+    :py:meth:`log_likelihood_array_ladder` return the tempered
+    log-likelihood for every inverse temperature in a ladder while only
+    evaluating the wrapped model once per batch.
+
+    :code:`ln_evidence` is set for :code:`beta` if the wrapped model has an
+    analytic tempered evidence, see
+    :py:meth:`nessai_models.base.BaseModel.tempered_ln_evidence`. Note that
+    :py:meth:`tempered_ln_evidence` and :py:meth:`ladder_ln_evidence` are
+    defined relative to the likelihood of the wrapped model.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to wrap.
+    beta : float
+        Inverse temperature used for :py:meth:`log_likelihood`.
+    betas : Optional[Sequence[float]]
+        Ladder of inverse temperatures. If not specified, only :code:`beta`
+        is used.
+    """
+
+    def __init__(
+        self,
+        model: BaseModel,
+        beta: float = 1.0,
+        betas: Optional[Sequence[float]] = None,
+    ) -> None:
+        super().__init__(model)
+        if betas is None:
+            betas = [beta]
+        self.betas = np.asarray(betas, dtype=float)
+        if self.betas.ndim != 1:
+            raise ValueError("betas must be one-dimensional")
+        if np.any(self.betas < 0):
+            raise ValueError("betas cannot be negative")
+        self.beta = beta
+
+    @property
+    def beta(self) -> float:
+        """Inverse temperature used for :py:meth:`log_likelihood`."""
+        return self._beta
+
+    @beta.setter
+    def beta(self, beta: float) -> None:
+        if beta < 0:
+            raise ValueError("beta cannot be negative")
+        self._beta = float(beta)
+        try:
+            self.ln_evidence = float(self.tempered_ln_evidence(self._beta))
+        except NotImplementedError:
+            self.ln_evidence = None
+
+    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+        """Tempered log-likelihood."""
+        return _temper(self.model.log_likelihood(x), np.asarray(self.beta))
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Tempered log-likelihood for an unstructured array."""
+        return _temper(
+            self.model.log_likelihood_array(x), np.asarray(self.beta)
+        )
+
+    def log_likelihood_ladder(
+        self, x: np.ndarray, betas: Optional[Sequence[float]] = None
+    ) -> np.ndarray:
+        """Tempered log-likelihood for each inverse temperature.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Structured array of samples.
+        betas : Optional[Sequence[float]]
+            Inverse temperatures. If not specified, :code:`betas` is used.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-likelihoods with shape (len(betas), ...).
+        """
+        return _temper(self.model.log_likelihood(x), self._get_betas(betas))
+
+    def log_likelihood_array_ladder(
+        self, x: np.ndarray, betas: Optional[Sequence[float]] = None
+    ) -> np.ndarray:
+        """Tempered log-likelihood for each inverse temperature for an
+        unstructured array.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Array of samples with shape (n, dims).
+        betas : Optional[Sequence[float]]
+            Inverse temperatures. If not specified, :code:`betas` is used.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-likelihoods with shape (len(betas), n).
+        """
+        return _temper(
+            self.model.log_likelihood_array(x), self._get_betas(betas)
+        )
+
+    def ladder_ln_evidence(
+        self, betas: Optional[Sequence[float]] = None
+    ) -> np.ndarray:
+        """Log-evidence for each inverse temperature.
+
+        Parameters
+        ----------
+        betas : Optional[Sequence[float]]
+            Inverse temperatures. If not specified, :code:`betas` is used.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of log-evidences.
+
+        Raises
+        ------
+        NotImplementedError
+            If the wrapped model does not have an analytic tempered
+            evidence.
+        """
+        return np.asarray(self.tempered_ln_evidence(self._get_betas(betas)))
+
+    def _get_betas(self, betas: Optional[Sequence[float]]) -> np.ndarray:
+        if betas is None:
+            return self.betas
+        return np.asarray(betas, dtype=float)
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only binary trace of the points evaluated by a model.
+
+A trace is a directory containing a JSON header and one binary file per
+writer, named :code:`trace-<pid>-<token>.bin` with a random token so a file
+is never appended to by a process that reuses the ID of an earlier one.
+Each binary file is a sequence of fixed-width records with the data type
+returned by :py:func:`get_trace_dtype`, so the files can be memory-mapped
+without parsing and a partially written record at the end of a file, e.g.
+from a worker that was killed, is simply ignored.
+"""
+import json
+import multiprocessing.util
+import os
+import secrets
+import threading
+import time
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from .base import BaseModel, ModelWrapper
+
+TRACE_HEADER = "header.json"
+"""Name of the header file in a trace directory."""
+
+TRACE_VERSION = 1
+"""Version of the trace format."""
+
+
+def get_trace_dtype(dims: int) -> np.dtype:
+    """Data type of the records in a trace.
+
+    Parameters
+    ----------
+    dims : int
+        Number of dimensions of the model.
+
+    Returns
+    -------
+    numpy.dtype
+        Little-endian structured data type with fields :code:`time` (Unix
+        time at the start of the batch), :code:`duration` (wall time to
+        evaluate the batch), :code:`batch` (index of the batch in the
+        process), :code:`logL`, :code:`logP` and :code:`x`.
+    """
+    return np.dtype(
+        [
+            ("time", "<f8"),
+            ("duration", "<f8"),
+            ("batch", "<i8"),
+            ("logL", "<f8"),
+            ("logP", "<f8"),
+            ("x", "<f8", (dims,)),
+        ]
+    )
+
+
+class _TraceWriter:
+    """Writer for the trace file of a single process.
+
+    Records are copied through a fixed-size buffer and the buffer is written
+    at the end of each batch.
+    """
+
+    def __init__(self, filename: str, dtype: np.dtype, buffer_size: int):
+        self.filename = filename
+        self.buffer = np.empty(buffer_size, dtype=dtype)
+        self.n_buffered = 0
+        self.n_batches = 0
+        self.handle = None
+
+    def write(self, records: np.ndarray) -> None:
+        if self.handle is None:
+            # Unbuffered since records are buffered in memory and each
+            # flush is then a single write of whole records
+            self.handle = open(self.filename, "ab", buffering=0)
+        self.handle.write(records.tobytes())
+
+    def append(self, start, duration, log_l, log_p, x) -> None:
+        n = len(log_l)
+        log_p = np.broadcast_to(log_p, (n,))
+        batch = self.n_batches
+        self.n_batches += 1
+        # Large batches are copied through the buffer in chunks so no new
+        # memory is allocated
+        done = 0
+        while done < n:
+            m = min(n - done, self.buffer.size - self.n_buffered)
+            records = self.buffer[self.n_buffered : self.n_buffered + m]
+            records["time"] = start
+            records["duration"] = duration
+            records["batch"] = batch
+            records["logL"] = log_l[done : done + m]
+            records["logP"] = log_p[done : done + m]
+            records["x"] = x[done : done + m]
+            self.n_buffered += m
+            done += m
+            if self.n_buffered == self.buffer.size:
+                self.flush()
+        self.flush()
+
+    def flush(self) -> None:
+        if self.n_buffered:
+            self.write(self.buffer[: self.n_buffered])
+            self.n_buffered = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+class TracedModel(ModelWrapper):
+    """Wrapper that records every point evaluated by a model.
+
+    Each call to :py:meth:`log_likelihood` or
+    :py:meth:`log_likelihood_array` appends the samples, log-likelihoods,
+    log-priors and timings to a trace that can be read with
+    :py:func:`read_trace`. Records are copied through a buffer of
+    :code:`buffer_size` records and written at the end of each call, so the
+    overhead is a copy of the inputs and outputs plus the evaluation of the
+    log-prior, and a process that is killed only loses the records of the
+    call in progress.
+
+    Each process writes to its own file in the trace directory, so the
+    wrapper can be used with a pool of workers, e.g. :code:`n_pool` in
+    nessai.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to wrap.
+    path : str
+        Trace directory. Created if it does not exist. If it contains an
+        existing trace for a model with the same parameters, new records are
+        appended.
+    buffer_size : int
+        Maximum number of records copied into memory before they are
+        written.
+    log_prior : bool
+        If True, evaluate and record the log-prior of each point. Otherwise
+        the log-prior is recorded as NaN.
+    """
+
+    def __init__(
+        self,
+        model: BaseModel,
+        path: str,
+        buffer_size: int = 4096,
+        log_prior: bool = True,
+    ) -> None:
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be positive")
+        super().__init__(model)
+        self.path = path
+        self.buffer_size = buffer_size
+        self.record_log_prior = log_prior
+        self.dtype = get_trace_dtype(len(self.names))
+        os.makedirs(path, exist_ok=True)
+        self._write_header()
+        self._writer = None
+        self._writer_pid = None
+        self._lock = threading.Lock()
+
+    def _write_header(self) -> None:
+        header = dict(
+            version=TRACE_VERSION,
+            names=self.names,
+            dtype=self.dtype.descr,
+        )
+        filename = os.path.join(self.path, TRACE_HEADER)
+        try:
+            with open(filename, "r") as f:
+                existing = json.load(f)
+        except FileNotFoundError:
+            existing = None
+        if existing is not None:
+            if existing.get("version") != TRACE_VERSION or (
+                existing.get("names") != self.names
+            ):
+                raise ValueError(
+                    f"{self.path} contains a trace for a different model"
+                )
+            return
+        try:
+            header["model"] = self.model.get_config()
+        except TypeError:
+            pass
+        tmp = f"{filename}.{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(header, f, indent=4)
+        os.replace(tmp, filename)
+
+    def _get_writer(self) -> _TraceWriter:
+        pid = os.getpid()
+        if self._writer_pid != pid:
+            # A writer inherited from the parent process is discarded so
+            # each process writes to a new file
+            self._writer = _TraceWriter(
+                os.path.join(
+                    self.path, f"trace-{pid}-{secrets.token_hex(4)}.bin"
+                ),
+                self.dtype,
+                self.buffer_size,
+            )
+            self._writer_pid = pid
+            multiprocessing.util.Finalize(
+                self, self._writer.close, exitpriority=10
+            )
+        return self._writer
+
+    def _record(self, x, log_l, start, duration) -> None:
+        x = np.atleast_2d(x)
+        if self.record_log_prior:
+            log_p = self.model.log_prior_array(x)
+        else:
+            log_p = np.nan
+        with self._lock:
+            self._get_writer().append(
+                start, duration, np.atleast_1d(log_l), log_p, x
+            )
+
+    def log_likelihood(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood of the wrapped model. The samples are recorded."""
+        start = time.time()
+        t0 = time.perf_counter()
+        log_l = self.model.log_likelihood(x)
+        duration = time.perf_counter() - t0
+        self._record(self.unstructured_view(x), log_l, start, duration)
+        return log_l
+
+    def log_likelihood_array(self, x: np.ndarray) -> np.ndarray:
+        """Log-likelihood of the wrapped model for an unstructured array. The
+        samples are recorded.
+        """
+        start = time.time()
+        t0 = time.perf_counter()
+        log_l = self.model.log_likelihood_array(x)
+        duration = time.perf_counter() - t0
+        self._record(x, log_l, start, duration)
+        return log_l
+
+    def flush(self) -> None:
+        """Write any buffered records for the current process."""
+        with self._lock:
+            if self._writer_pid == os.getpid():
+                self._writer.flush()
+
+    def close(self) -> None:
+        """Write any buffered records and close the file for the current
+        process.
+        """
+        with self._lock:
+            if self._writer_pid == os.getpid():
+                self._writer.close()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_lock", None)
+        state["_writer"] = None
+        state["_writer_pid"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def read_trace(
+    path: str, concatenate: bool = True
+) -> Union[np.ndarray, Dict[str, np.memmap]]:
+    """Read a trace written by :py:class:`TracedModel`.
+
+    Parameters
+    ----------
+    path : str
+        Trace directory.
+    concatenate : bool
+        If True, return a single array with the records from all files
+        sorted by time. Otherwise return the memory-mapped records for each
+        file, which does not read the data into memory.
+
+    Returns
+    -------
+    Union[numpy.ndarray, Dict[str, numpy.memmap]]
+        Array of records or dictionary of memory-mapped records keyed by
+        the ID of the writer, :code:`<pid>-<token>`. See
+        :py:func:`get_trace_dtype` for the fields.
+    """
+    with open(os.path.join(path, TRACE_HEADER), "r") as f:
+        header = json.load(f)
+    if header.get("version") != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version: {header.get('version')}")
+    dtype = get_trace_dtype(len(header["names"]))
+    records = {}
+    for filename in sorted(os.listdir(path)):
+        if not (filename.startswith("trace-") and filename.endswith(".bin")):
+            continue
+        writer = filename[len("trace-") : -len(".bin")]
+        n = os.path.getsize(os.path.join(path, filename)) // dtype.itemsize
+        if n == 0:
+            records[writer] = np.empty(0, dtype=dtype)
+        else:
+            records[writer] = np.memmap(
+                os.path.join(path, filename), dtype=dtype, mode="r", shape=(n,)
+            )
+    if not concatenate:
+        return records
+    if not records:
+        return np.empty(0, dtype=dtype)
+    out = np.concatenate(list(records.values()))
+    return out[np.argsort(out["time"], kind="stable")]
+
+
+def load_trace_model(path: str) -> Optional[BaseModel]:
+    """Rebuild the model that was traced, if its configuration was saved.
+
+    Parameters
+    ----------
+    path : str
+        Trace directory.
+
+    Returns
+    -------
+    Optional[nessai_models.base.BaseModel]
+        The wrapped model or None if its configuration could not be saved.
+    """
+    from .config import model_from_config
+
+    with open(os.path.join(path, TRACE_HEADER), "r") as f:
+        config = json.load(f).get("model")
+    if config is None:
+        return None
+    return model_from_config(config)
@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""
+Utilities shared between models.
+"""
+from concurrent.futures import Executor
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+import warnings
+
+import numpy as np
+from scipy.special import log_ndtr
+
+BLOCK_BYTES_CANDIDATES = [2**n for n in range(14, 25)]
+"""Block sizes, in bytes, that are considered when tuning the block size."""
+
+DEFAULT_BLOCK_BYTES = 2**20
+"""Block size, in bytes, used if the block size has not been tuned."""
+
+_block_bytes = None
+
+
+def get_cache_dir() -> str:
+    """Get the directory used to cache data between runs.
+
+    Defaults to :code:`~/.cache/nessai_models` but can be changed by setting
+    the :code:`NESSAI_MODELS_CACHE_DIR` environment variable. The directory
+    is created if it does not exist.
+
+    Returns
+    -------
+    str
+        Path to the cache directory.
+    """
+    cache_dir = os.environ.get(
+        "NESSAI_MODELS_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "nessai_models"),
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def iter_chunks(x: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    """Iterate over chunks of an array along the first axis.
+
+    The chunks are views, so for memory-mapped arrays the data is only read
+    when the chunk is used.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Array to split, including memory-mapped arrays.
+    chunk_size : int
+        Number of samples per chunk.
+
+    Yields
+    ------
+    numpy.ndarray
+        Chunk of the array.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    for start in range(0, len(x), chunk_size):
+        yield x[start : start + chunk_size]
+
+
+def load_chunk(x: np.ndarray) -> np.ndarray:
+    """Load a chunk of a memory-mapped array into memory.
+
+    Other arrays are returned unchanged.
+    """
+    if isinstance(x, np.memmap):
+        return np.array(x)
+    return x
+
+
+def read_ahead(
+    iterable: Iterable,
+    n: int = 1,
+    func: Optional[Callable] = None,
+) -> Iterator:
+    """Iterate over an iterable while reading ahead on a background thread.
+
+    Up to :code:`n` items are read ahead of the consumer, so the time spent
+    producing the items, e.g. reading from disk, overlaps with the time
+    spent using them.
+
+    Parameters
+    ----------
+    iterable : Iterable
+        Items to iterate over.
+    n : int
+        Maximum number of items to read ahead. If zero, the items are read
+        on the calling thread.
+    func : Optional[Callable]
+        Function applied to each item on the background thread, e.g. to
+        load a chunk of a memory-mapped array into memory.
+
+    Yields
+    ------
+    object
+        Items from the iterable, with :code:`func` applied if specified.
+    """
+    if func is None:
+
+        def func(item):
+            return item
+
+    if n < 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    items = queue.Queue(maxsize=n)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader() -> None:
+        try:
+            for item in iterable:
+                if not put((func(item), None)):
+                    return
+        except BaseException as e:
+            put((None, e))
+            return
+        put((done, None))
+
+    thread = threading.Thread(
+        target=reader, name="nessai_models_read_ahead", daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def evaluate_in_blocks(
+    func: Callable,
+    x: np.ndarray,
+    block_size: int,
+    out: Optional[np.ndarray] = None,
+    executor: Optional[Executor] = None,
+) -> np.ndarray:
+    """Evaluate a function on blocks of samples.
+
+    Parameters
+    ----------
+    func : Callable
+        Function that takes an array of samples with shape (n, dims) and
+        returns an array of shape (n,).
+    x : numpy.ndarray
+        Array of samples with shape (n, dims).
+    block_size : int
+        Maximum number of samples per block.
+    out : Optional[numpy.ndarray]
+        Array of shape (n,) for the output. If not specified, a new array is
+        allocated.
+    executor : Optional[concurrent.futures.Executor]
+        Executor used to evaluate the blocks concurrently. Each block writes
+        directly to its slice of the output.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of outputs.
+    """
+    if x.ndim < 2 or x.shape[0] <= block_size:
+        if out is None:
+            return func(x)
+        out[...] = func(x)
+        return out
+    n = x.shape[0]
+    if out is None:
+        out = np.empty(n)
+    if executor is None:
+        for start in range(0, n, block_size):
+            _evaluate_block(func, x, out, start, start + block_size)
+    else:
+        futures = [
+            executor.submit(
+                _evaluate_block, func, x, out, start, start + block_size
+            )
+            for start in range(0, n, block_size)
+        ]
+        for future in futures:
+            future.result()
+    return out
+
+
+def _evaluate_block(
+    func: Callable, x: np.ndarray, out: np.ndarray, start: int, end: int
+) -> None:
+    out[start:end] = func(x[start:end])
+
+
+def _reference_kernel(x: np.ndarray) -> np.ndarray:
+    """Kernel used to tune the block size.
+
+    Mimics the n-dimensional likelihoods with several full-size temporaries.
+    """
+    return -np.sum(
+        100.0 * (x[..., 1:] - x[..., :-1] ** 2.0) ** 2.0
+        + (1.0 - x[..., :-1]) ** 2.0,
+        axis=-1,
+    )
+
+
+def tune_block_bytes(
+    n_bytes: int = 2**25,
+    dims: int = 8,
+    candidates: Optional[list] = None,
+    n_repeats: int = 3,
+) -> int:
+    """Determine the block size, in bytes, with the highest throughput.
+
+    Parameters
+    ----------
+    n_bytes : int
+        Total size of the test array in bytes.
+    dims : int
+        Number of dimensions for the test array.
+    candidates : Optional[list]
+        List of block sizes in bytes to try. If not specified,
+        :py:data:`BLOCK_BYTES_CANDIDATES` is used.
+    n_repeats : int
+        Number of times each candidate is timed. The fastest time is used.
+
+    Returns
+    -------
+    int
+        Block size in bytes.
+    """
+    if candidates is None:
+        candidates = BLOCK_BYTES_CANDIDATES
+    # A separate generator so the global random state is not changed
+    x = np.random.default_rng(0).random((max(n_bytes // (8 * dims), 1), dims))
+    out = np.empty(x.shape[0])
+    times = []
+    for block_bytes in candidates:
+        block_size = max(block_bytes // (8 * dims), 1)
+        best = np.inf
+        for _ in range(n_repeats):
+            start = time.perf_counter()
+            evaluate_in_blocks(_reference_kernel, x, block_size, out=out)
+            best = min(best, time.perf_counter() - start)
+        times.append(best)
+    return int(candidates[int(np.argmin(times))])
+
+
+def _block_bytes_file() -> str:
+    return os.path.join(get_cache_dir(), "block_bytes.json")
+
+
+def get_block_bytes() -> int:
+    """Get the block size in bytes for block-wise evaluation.
+
+    The value is determined in the following order: the
+    :code:`NESSAI_MODELS_BLOCK_BYTES` environment variable, the value already
+    determined by this process, the value cached on disk by
+    :py:func:`save_block_bytes` and finally
+    :py:data:`DEFAULT_BLOCK_BYTES`. The block size is never tuned
+    implicitly, since this is slow.
+
+    Returns
+    -------
+    int
+        Block size in bytes.
+    """
+    global _block_bytes
+    if "NESSAI_MODELS_BLOCK_BYTES" in os.environ:
+        return int(os.environ["NESSAI_MODELS_BLOCK_BYTES"])
+    if _block_bytes is not None:
+        return _block_bytes
+    try:
+        with open(_block_bytes_file(), "r") as f:
+            _block_bytes = int(json.load(f)["block_bytes"])
+    except (OSError, ValueError, KeyError):
+        _block_bytes = DEFAULT_BLOCK_BYTES
+    return _block_bytes
+
+
+def save_block_bytes(block_bytes: Optional[int] = None) -> int:
+    """Tune the block size for this machine and cache it on disk.
+
+    The cached value is used by :py:func:`get_block_bytes` in this and any
+    later process. If the cache directory cannot be written, the value is
+    only used by this process.
+
+    Parameters
+    ----------
+    block_bytes : Optional[int]
+        Block size in bytes. If not specified, it is determined by calling
+        :py:func:`tune_block_bytes`.
+
+    Returns
+    -------
+    int
+        Block size in bytes.
+    """
+    global _block_bytes
+    if block_bytes is None:
+        block_bytes = tune_block_bytes()
+    _block_bytes = int(block_bytes)
+    try:
+        filename = _block_bytes_file()
+        tmp = f"{filename}.{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump({"block_bytes": _block_bytes}, f)
+        os.replace(tmp, filename)
+    except OSError as e:
+        warnings.warn(f"Could not cache the block size: {e}")
+    return _block_bytes
+
+
+def _update_hash(h, value, name: str = "value") -> None:
+    """Add a value to a hash.
+
+    Values are tagged with their type so, for example, a list and an array
+    with the same values give different hashes. Arrays are hashed using
+    their dtype, shape and contents.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, np.ndarray):
+        h.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"list:{len(value)};".encode())
+        for v in value:
+            _update_hash(h, v, name)
+    elif isinstance(value, dict):
+        h.update(f"dict:{len(value)};".encode())
+        for k in sorted(value, key=str):
+            h.update(f"{k};".encode())
+            _update_hash(h, value[k], name)
+    elif hasattr(value, "_get_init_kwargs"):
+        cls = value.__class__
+        h.update(f"model:{cls.__module__}.{cls.__name__};".encode())
+        _update_hash(h, value._get_init_kwargs(), name)
+        _update_hash(h, value._init_random_state, name)
+    else:
+        raise TypeError(f"Cannot hash {name} of type {type(value).__name__}")
+
+
+def get_model_hash(model) -> str:
+    """Compute a hash that identifies a model.
+
+    The hash is computed from the class, the arguments used to create the
+    model, including the contents of any arrays, and, for models that draw
+    random numbers when they are created, the state of the global numpy
+    random number generator. This is the same information that is saved in
+    the configuration (see
+    :py:meth:`nessai_models.base.BaseModel.get_config`), so changes to the
+    model made after it was created are not included.
+
+    Parameters
+    ----------
+    model : nessai_models.base.BaseModel
+        Model to hash.
+
+    Returns
+    -------
+    str
+        Hexadecimal hash.
+
+    Raises
+    ------
+    TypeError
+        If any of the arguments cannot be hashed, e.g. functions.
+    """
+    h = hashlib.sha256()
+    _update_hash(h, model, "model")
+    return h.hexdigest()
+
+
+def log_normal_probability(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Log-probability that a standard normal variable is in an interval.
+
+    Computed from the log-CDF, or the log-survival function for intervals
+    above zero, so it is accurate far into the tails.
+
+    Parameters
+    ----------
+    lower : numpy.ndarray
+        Lower bounds of the intervals.
+    upper : numpy.ndarray
+        Upper bounds of the intervals. Must be greater than :code:`lower`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Natural log of :code:`Phi(upper) - Phi(lower)`.
+    """
+    flip = (lower + upper) > 0
+    lo = np.where(flip, -upper, lower)
+    hi = np.where(flip, -lower, upper)
+    log_hi = log_ndtr(hi)
+    with np.errstate(divide="ignore"):
+        return log_hi + np.log1p(-np.exp(log_ndtr(lo) - log_hi))
+
+
+def gauss_legendre_nodes(
+    lower: float, upper: float, n_intervals: int, order: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Nodes and log-weights for composite Gauss-Legendre quadrature.
+
+    Parameters
+    ----------
+    lower, upper : float
+        Limits of the integral.
+    n_intervals : int
+        Number of equal-width intervals.
+    order : int
+        Number of nodes per interval.
+
+    Returns
+    -------
+    numpy.ndarray
+        Nodes.
+    numpy.ndarray
+        Natural log of the weights.
+    """
+    x, w = np.polynomial.legendre.leggauss(order)
+    edges = np.linspace(lower, upper, n_intervals + 1)
+    half_width = 0.5 * np.diff(edges)[:, np.newaxis]
+    centre = 0.5 * (edges[1:] + edges[:-1])[:, np.newaxis]
+    nodes = (centre + half_width * x).ravel()
+    log_weights = np.log(half_width * w).ravel()
+    return nodes, log_weights
@@ -2,37 +2,61 @@
 
 from nessai_models import (
     Brewer,
+    ConcentricGaussianMixture,
     EggBox,
+    FrequencyDomainSinusoidalSignal,
     Gaussian,
     GaussianMixture,
     GaussianMixtureWithData,
+    GaussianShell,
     HalfGaussian,
     LinearSignal,
+    LowRankGaussian,
     MixtureOfDistributions,
+    MultiRealisationLinearSignal,
+    NealsFunnel,
     Pyramid,
+    Rastrigin,
     Rosenbrock,
     SinusoidalSignal,
     SlabSpike,
+    StudentT,
 )
 import pytest
 
 
 all_models = [
     Brewer,
+    ConcentricGaussianMixture,
     EggBox,
+    FrequencyDomainSinusoidalSignal,
     Gaussian,
     GaussianMixture,
     GaussianMixtureWithData,
+    GaussianShell,
     HalfGaussian,
     LinearSignal,
+    LowRankGaussian,
     MixtureOfDistributions,
+    MultiRealisationLinearSignal,
+    NealsFunnel,
     Pyramid,
+    Rastrigin,
     Rosenbrock,
     SinusoidalSignal,
     SlabSpike,
+    StudentT,
 ]
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Use a temporary directory for any cached data."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("NESSAI_MODELS_CACHE_DIR", str(path))
+    return path
+
+
 @pytest.fixture(params=all_models)
 def ModelClass(request):
     """Model classes fixture.
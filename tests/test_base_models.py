@@ -1,25 +1,62 @@
 # -*- coding: utf-8 -*-
 """Tests the base models from `nessai_models.base`."""
+import threading
+
+from nessai.livepoint import numpy_array_to_live_points, unstructured_view
 import numpy as np
 import pytest
-from unittest.mock import MagicMock, create_autospec
+from unittest.mock import MagicMock, create_autospec, patch
 
 from nessai_models.base import (
+    BaseModel,
     NDimensionalModel,
     UniformPriorMixin,
 )
 
 
+class NDModel(UniformPriorMixin, NDimensionalModel):
+    def log_likelihood_array(self, x):
+        return np.zeros(x.shape[:-1])
+
+
 @pytest.mark.parametrize("bounds", [[-10.0, 10.0], np.array([-10.0, 10.0])])
 def test_n_dimensional_model_bounds(bounds):
     """Test the n-dimensional model init."""
-    model = create_autospec(NDimensionalModel)
-    NDimensionalModel.__init__(model, 2, bounds)
+    model = NDModel(2, bounds)
     assert model.names == ["x_0", "x_1"]
     np.testing.assert_equal(model.bounds["x_0"], [-10.0, 10.0])
     np.testing.assert_equal(model.bounds["x_1"], [-10.0, 10.0])
 
 
+def test_n_dimensional_model_arrays():
+    """Assert the bounds are stored as arrays without creating the names"""
+    model = NDModel(1000, [-1.0, 2.0])
+    assert model._names is None
+    assert model._bounds is None
+    assert model.dims == 1000
+    np.testing.assert_equal(model.lower_bounds, -np.ones(1000))
+    np.testing.assert_equal(model.upper_bounds, 2 * np.ones(1000))
+    assert len(model.names) == 1000
+    assert model.names[-1] == "x_999"
+
+
+def test_n_dimensional_model_set_bounds():
+    """Assert the bound arrays are reset if the bounds are set"""
+    model = NDModel(2, [-1.0, 1.0])
+    model.bounds = {"x_0": [-2, 2], "x_1": [0, 1]}
+    np.testing.assert_equal(model.lower_bounds, [-2, 0])
+    np.testing.assert_equal(model.upper_bounds, [2, 1])
+
+
+def test_n_dimensional_model_in_bounds():
+    """Assert the vectorised in_bounds is correct"""
+    model = NDModel(2, [-1.0, 1.0])
+    x = numpy_array_to_live_points(
+        np.array([[0.0, 0.0], [0.0, 2.0], [-1.5, 0.0]]), model.names
+    )
+    np.testing.assert_array_equal(model.in_bounds(x), [True, False, False])
+
+
 def test_n_dimensional_model_bounds_invalid_type():
     """Assert an error is raised in the bounds are the incorrect type."""
     model = create_autospec(NDimensionalModel)
@@ -75,8 +112,9 @@ def test_uniform_prior_mixin_out_of_bounds():
 def test_uniform_prior_mixin_to_unit_hypercube():
     """Assert samples are transformed to the correct range"""
     obj = create_autospec(UniformPriorMixin)
-    obj.bounds = {"x": np.array([-10, 10])}
-    obj.names = ["x"]
+    obj.lower_bounds = np.array([-10])
+    obj.upper_bounds = np.array([10])
+    obj.unstructured_view = lambda x: unstructured_view(x, names=["x"])
 
     x = np.array([(-10,), (0,), (10,)], dtype=[("x", "f8")])
 
@@ -88,11 +126,162 @@ def test_uniform_prior_mixin_to_unit_hypercube():
 def test_uniform_prior_mixin_from_unit_hypercube():
     """Assert samples are transformed to the correct range"""
     obj = create_autospec(UniformPriorMixin)
-    obj.bounds = {"x": np.array([-10, 10])}
-    obj.names = ["x"]
+    obj.lower_bounds = np.array([-10])
+    obj.upper_bounds = np.array([10])
+    obj.unstructured_view = lambda x: unstructured_view(x, names=["x"])
 
     x = np.array([(0.0,), (0.5,), (1,)], dtype=[("x", "f8")])
 
     out = UniformPriorMixin.from_unit_hypercube(obj, x)
 
     np.testing.assert_array_equal(out["x"], np.array([-10.0, 0.0, 10.0]))
+
+
+def test_n_dimensional_model_get_block_size():
+    """Assert the block size is computed from the block size in bytes"""
+    model = create_autospec(NDimensionalModel)
+    model.block_size = None
+    model.dims = 4
+    with patch("nessai_models.base.get_block_bytes", return_value=2**10):
+        out = NDimensionalModel.get_block_size(model)
+    assert out == 32
+
+
+def test_n_dimensional_model_get_block_size_set():
+    """Assert the block size is used if set"""
+    model = create_autospec(NDimensionalModel)
+    model.block_size = 10
+    assert NDimensionalModel.get_block_size(model) == 10
+
+
+@pytest.mark.parametrize("n", [10, 10_000])
+def test_n_dimensional_model_evaluate_in_blocks(n):
+    """Assert the blocked result matches direct evaluation"""
+    model = create_autospec(NDimensionalModel)
+    model.block_size = None
+    model.get_block_size = MagicMock(return_value=128)
+    model.get_thread_pool = MagicMock(return_value=None)
+    x = np.random.randn(n, 2)
+    out = NDimensionalModel.evaluate_in_blocks(
+        model, lambda y: y.sum(axis=-1), x
+    )
+    np.testing.assert_array_equal(out, x.sum(axis=-1))
+    if n == 10:
+        model.get_block_size.assert_not_called()
+    else:
+        model.get_block_size.assert_called_once()
+
+
+def test_base_model_log_likelihood():
+    """Assert the structured log-likelihood calls the array version"""
+    model = create_autospec(BaseModel)
+    model.skip_out_of_prior = False
+    model.unstructured_view = MagicMock(return_value="view")
+    model.log_likelihood_array = MagicMock(return_value=1.0)
+    out = BaseModel.log_likelihood(model, "x")
+    model.unstructured_view.assert_called_once_with("x")
+    model.log_likelihood_array.assert_called_once_with("view")
+    assert out == 1.0
+
+
+def test_base_model_log_likelihood_skip_out_of_prior():
+    """Assert the structured log-likelihood calls the masked version"""
+    model = create_autospec(BaseModel)
+    model.skip_out_of_prior = True
+    model.unstructured_view = MagicMock(return_value="view")
+    model.masked_log_likelihood_array = MagicMock(return_value=1.0)
+    out = BaseModel.log_likelihood(model, "x")
+    model.masked_log_likelihood_array.assert_called_once_with("view")
+    model.log_likelihood_array.assert_not_called()
+    assert out == 1.0
+
+
+def test_uniform_prior_mixin_log_prior_array():
+    """Assert the array log-prior is correct"""
+    obj = create_autospec(UniformPriorMixin)
+    obj.lower_bounds = np.array([-10, -2])
+    obj.upper_bounds = np.array([10, 1])
+    x = np.array([[0.0, 0.0], [0.0, 2.0]])
+    out = UniformPriorMixin.log_prior_array(obj, x)
+    np.testing.assert_equal(out, [-np.log(20) - np.log(3), -np.inf])
+
+
+def test_base_model_thread_pool():
+    """Assert the thread pool is persistent and resized with n_threads"""
+    model = create_autospec(BaseModel)
+    model._thread_pool = None
+    model._thread_pool_lock = threading.Lock()
+    model._thread_pool_pid = None
+    model._thread_pool_key = None
+    model.n_blas_threads = None
+    model.get_blas_threads = lambda n: BaseModel.get_blas_threads(model, n)
+    model.n_threads = 1
+    assert BaseModel.get_thread_pool(model) is None
+    model.n_threads = 2
+    pool = BaseModel.get_thread_pool(model)
+    assert pool._max_workers == 2
+    assert BaseModel.get_thread_pool(model) is pool
+    model.n_threads = 3
+    assert BaseModel.get_thread_pool(model)._max_workers == 3
+    BaseModel.close_thread_pool(model)
+    assert model._thread_pool is None
+
+
+@pytest.mark.parametrize("n_threads", [1, 3])
+def test_base_model_evaluate_in_threads(n_threads):
+    """Assert the output is correct when splitting between threads"""
+    model = create_autospec(BaseModel)
+    model._thread_pool = None
+    model._thread_pool_lock = threading.Lock()
+    model._thread_pool_pid = None
+    model._thread_pool_key = None
+    model.n_threads = n_threads
+    model.get_thread_pool = lambda: BaseModel.get_thread_pool(model)
+    model.n_blas_threads = "auto"
+    model.get_blas_threads = lambda n: BaseModel.get_blas_threads(model, n)
+    x = np.random.randn(10, 2)
+    out = np.empty(10)
+    res = BaseModel.evaluate_in_threads(
+        model, lambda y: y.sum(axis=-1), x, out=out
+    )
+    assert res is out
+    np.testing.assert_array_equal(out, x.sum(axis=-1))
+    BaseModel.close_thread_pool(model)
+
+
+@pytest.mark.parametrize("n_inside", [0, 3, 5])
+def test_masked_log_likelihood_array(n_inside):
+    """Assert the log-likelihood is only called for the samples in the
+    prior"""
+    model = create_autospec(BaseModel)
+    x = np.random.randn(5, 2)
+    mask = np.arange(5) < n_inside
+    model.log_likelihood_array = MagicMock(
+        side_effect=lambda x: np.zeros(len(x))
+    )
+    out = BaseModel.masked_log_likelihood_array(model, x, mask)
+    expected = np.where(mask, 0.0, -np.inf)
+    np.testing.assert_array_equal(out, expected)
+    if n_inside:
+        np.testing.assert_array_equal(
+            model.log_likelihood_array.call_args[0][0], x[:n_inside]
+        )
+    else:
+        model.log_likelihood_array.assert_not_called()
+
+
+def test_log_posterior_array():
+    """Assert the log-prior is evaluated once and used as the mask"""
+    model = create_autospec(BaseModel)
+    x = np.random.randn(4, 2)
+    log_p = np.array([0.0, -np.inf, 1.0, -np.inf])
+    model.log_prior_array = MagicMock(return_value=log_p)
+    model.masked_log_likelihood_array = MagicMock(
+        return_value=np.array([1.0, -np.inf, 2.0, -np.inf])
+    )
+    out = BaseModel.log_posterior_array(model, x)
+    model.log_prior_array.assert_called_once_with(x)
+    np.testing.assert_array_equal(
+        model.masked_log_likelihood_array.call_args[0][1], np.isfinite(log_p)
+    )
+    np.testing.assert_array_equal(out, [1.0, -np.inf, 3.0, -np.inf])
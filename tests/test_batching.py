@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Tests for the likelihood batcher."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from nessai_models import Gaussian
+from nessai_models.batching import LikelihoodBatcher
+
+
+@pytest.fixture
+def model():
+    return Gaussian(dims=2)
+
+
+async def _gather(batcher, points):
+    return await asyncio.gather(*(batcher.log_likelihood(p) for p in points))
+
+
+@pytest.mark.parametrize("max_batch_size", [1, 4, 100])
+def test_batcher_structured(model, max_batch_size):
+    """Assert the results match and the calls are coalesced"""
+    x = model.new_point(10)
+    batcher = LikelihoodBatcher(model, max_batch_size=max_batch_size)
+    out = asyncio.run(
+        _gather(batcher, [x[i : i + 1].squeeze() for i in range(10)])
+    )
+    np.testing.assert_allclose(out, model.log_likelihood(x))
+    assert all(isinstance(v, float) for v in out)
+    assert batcher.n_samples == 10
+    assert batcher.n_batches == int(np.ceil(10 / max_batch_size))
+
+
+def test_batcher_array(model):
+    """Assert unstructured single points and batches can be mixed"""
+    x = np.random.randn(5, 2)
+    batcher = LikelihoodBatcher(model, max_batch_size=100)
+    out = asyncio.run(_gather(batcher, [x[0], x[1:3], x[3:]]))
+    expected = model.log_likelihood_array(x)
+    assert out[0] == pytest.approx(expected[0])
+    np.testing.assert_allclose(out[1], expected[1:3])
+    np.testing.assert_allclose(out[2], expected[3:])
+    assert batcher.n_batches == 1
+
+
+def test_batcher_executor(model):
+    """Assert the batches can be evaluated in an executor"""
+    x = np.random.randn(8, 2)
+    with ThreadPoolExecutor(1) as executor:
+        batcher = LikelihoodBatcher(model, max_batch_size=3, executor=executor)
+        out = asyncio.run(_gather(batcher, list(x)))
+    np.testing.assert_allclose(out, model.log_likelihood_array(x))
+    assert batcher.n_batches == 3
+    assert batcher.n_samples == 8
+
+
+def test_batcher_exception():
+    """Assert exceptions are propagated to all of the callers"""
+    model = MagicMock()
+    model.log_likelihood_array = MagicMock(side_effect=RuntimeError("fail"))
+    batcher = LikelihoodBatcher(model, max_batch_size=2)
+    with pytest.raises(RuntimeError, match="fail"):
+        asyncio.run(_gather(batcher, list(np.random.randn(2, 2))))
+
+
+@pytest.mark.parametrize(
+    "kwargs", [dict(max_batch_size=0), dict(max_latency=-1.0)]
+)
+def test_batcher_invalid(kwargs):
+    """Assert invalid settings raise an error"""
+    with pytest.raises(ValueError):
+        LikelihoodBatcher(MagicMock(), **kwargs)
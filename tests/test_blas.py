@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Tests for controlling the number of BLAS threads."""
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from nessai_models import Gaussian
+from nessai_models import blas
+from nessai_models.blas import (
+    BLAS_ENVIRONMENT_VARIABLES,
+    blas_threads,
+    get_auto_blas_threads,
+    get_blas_threads,
+    limit_blas_threads,
+)
+
+threadpoolctl = pytest.importorskip("threadpoolctl")
+
+
+@pytest.fixture()
+def n_cpus():
+    with patch("nessai_models.blas.get_cpu_count", return_value=8):
+        yield 8
+
+
+@pytest.fixture(autouse=True)
+def restore_blas_threads():
+    n = get_blas_threads()
+    environment = {k: os.environ.get(k) for k in BLAS_ENVIRONMENT_VARIABLES}
+    yield
+    blas._get_controller().limit(limits=n)
+    blas._restore_environment(environment)
+
+
+def _get_worker_blas_threads(_):
+    return get_blas_threads()
+
+
+@pytest.mark.parametrize(
+    "n_workers, expected", [(1, 8), (2, 4), (3, 2), (16, 1)]
+)
+def test_get_auto_blas_threads(n_cpus, n_workers, expected):
+    assert get_auto_blas_threads(n_workers) == expected
+
+
+def test_blas_threads():
+    """Assert the context manager sets and restores the limit and the
+    environment variables.
+    """
+    n = get_blas_threads()
+    os.environ.pop("OMP_NUM_THREADS", None)
+    with blas_threads(n + 1):
+        assert get_blas_threads() == n + 1
+        for key in BLAS_ENVIRONMENT_VARIABLES:
+            assert os.environ[key] == str(n + 1)
+    assert get_blas_threads() == n
+    assert "OMP_NUM_THREADS" not in os.environ
+
+
+def test_blas_threads_none():
+    """Assert nothing is changed if the number of threads is None"""
+    n = get_blas_threads()
+    os.environ.pop("OPENBLAS_NUM_THREADS", None)
+    with blas_threads(None):
+        assert get_blas_threads() == n
+        assert "OPENBLAS_NUM_THREADS" not in os.environ
+
+
+def test_blas_threads_no_environment():
+    os.environ.pop("MKL_NUM_THREADS", None)
+    with blas_threads(3, environment=False):
+        assert get_blas_threads() == 3
+        assert "MKL_NUM_THREADS" not in os.environ
+
+
+def test_limit_blas_threads():
+    limit_blas_threads(3)
+    assert get_blas_threads() == 3
+    assert os.environ["OPENBLAS_NUM_THREADS"] == "3"
+
+
+def test_limit_blas_threads_without_threadpoolctl():
+    """Assert a warning is raised if threadpoolctl is not installed"""
+    with patch("nessai_models.blas.ThreadpoolController", None):
+        assert get_blas_threads() is None
+        with pytest.warns(UserWarning, match="threadpoolctl is not installed"):
+            limit_blas_threads(2)
+    assert os.environ["OMP_NUM_THREADS"] == "2"
+
+
+@pytest.mark.parametrize("n_blas_threads, expected", [("auto", 4), (3, 3)])
+def test_configure_pool(n_cpus, n_blas_threads, expected):
+    """Assert the workers in the pool created by nessai inherit the limit
+    and the limit in the main process is restored.
+    """
+    n = get_blas_threads()
+    model = Gaussian(dims=2)
+    model.n_blas_threads = n_blas_threads
+    model.configure_pool(n_pool=2)
+    try:
+        assert model.pool.map(_get_worker_blas_threads, range(2)) == 2 * [
+            expected
+        ]
+    finally:
+        model.close_pool()
+    assert get_blas_threads() == n
+
+
+def test_configure_pool_none():
+    """Assert the limits are not changed if n_blas_threads is None"""
+    model = Gaussian(dims=2)
+    model.n_blas_threads = None
+    with patch("nessai_models.base.blas_threads") as mock_blas_threads:
+        model.configure_pool(n_pool=2)
+    model.close_pool()
+    mock_blas_threads.assert_called_once_with(None)
+
+
+def test_evaluate_in_threads(n_cpus):
+    """Assert the BLAS threads are limited when evaluating in threads"""
+    model = Gaussian(dims=2)
+    model.n_threads = 2
+    model.n_blas_threads = 4
+    n_threads = []
+
+    def func(x):
+        n_threads.append(get_blas_threads())
+        return x.sum(axis=-1)
+
+    x = np.random.randn(10, 2)
+    try:
+        np.testing.assert_array_equal(
+            model.evaluate_in_threads(func, x), x.sum(axis=-1)
+        )
+    finally:
+        model.close_thread_pool()
+    assert n_threads == [4, 4]
+
+
+def test_evaluate_in_threads_limit_once(n_cpus):
+    """Assert the BLAS threads are limited when the thread pool starts and
+    not for every call.
+    """
+    model = Gaussian(dims=2)
+    model.n_threads = 2
+    model.n_blas_threads = 4
+    x = np.random.randn(10, 2)
+    with patch("nessai_models.base.limit_blas_threads") as mock_limit:
+        try:
+            for _ in range(5):
+                model.evaluate_in_threads(lambda y: y.sum(axis=-1), x)
+            assert 1 <= mock_limit.call_count <= 2
+            mock_limit.assert_called_with(4, False)
+            model.n_blas_threads = 1
+            model.evaluate_in_threads(lambda y: y.sum(axis=-1), x)
+            mock_limit.assert_called_with(1, False)
+        finally:
+            model.close_thread_pool()
+
+
+def test_evaluate_in_threads_auto(n_cpus):
+    """Assert the thread pool does not change the process-wide limit if
+    n_blas_threads is auto.
+    """
+    model = Gaussian(dims=2)
+    model.n_threads = 2
+    x = np.random.randn(10, 2)
+    n = get_blas_threads()
+    with patch("nessai_models.base.limit_blas_threads") as mock_limit:
+        try:
+            model.evaluate_in_threads(lambda y: y.sum(axis=-1), x)
+        finally:
+            model.close_thread_pool()
+    mock_limit.assert_not_called()
+    assert get_blas_threads() == n
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Tests for re-evaluating nessai result files."""
+import json
+import pickle
+import threading
+from unittest.mock import patch
+
+from nessai.livepoint import live_points_to_dict
+from nessai.utils.io import save_dict_to_hdf5
+import numpy as np
+import pytest
+
+from nessai_models import CostModel, LinearSignal, Rosenbrock
+from nessai_models.cli import evaluate_result_file, main
+from nessai_models.config import load_config, model_from_config, save_config
+
+
+@pytest.fixture(params=[Rosenbrock, LinearSignal])
+def model(request):
+    return request.param()
+
+
+@pytest.fixture
+def result_file(tmp_path, model):
+    samples = model.new_point(250)
+    filename = tmp_path / "result.hdf5"
+    save_dict_to_hdf5(
+        dict(posterior_samples=samples, nested_samples=samples[:50]),
+        str(filename),
+    )
+    save_config(model, tmp_path / "model_config.json")
+    return filename, samples
+
+
+def test_config_round_trip(model, tmp_path):
+    """Assert the rebuilt model has the same likelihood"""
+    save_config(model, tmp_path / "config.json")
+    new = load_config(tmp_path / "config.json")
+    x = model.new_point(10)
+    np.testing.assert_array_equal(
+        new.log_likelihood(x), model.log_likelihood(x)
+    )
+
+
+def test_config_wrapper():
+    """Assert wrapped models are rebuilt"""
+    model = CostModel(Rosenbrock(dims=3), cost=0.0)
+    new = model_from_config(json.loads(json.dumps(model.get_config())))
+    assert isinstance(new.model, Rosenbrock)
+    assert new.model.dims == 3
+
+
+def test_config_random_state():
+    """Assert the random state is only saved for models that use it"""
+    assert "random_state" not in Rosenbrock().get_config()
+    assert "random_state" in LinearSignal().get_config()
+
+
+def test_config_not_pickled():
+    """Assert the arguments are not pickled with the model"""
+    model = LinearSignal()
+    state = model.__getstate__()
+    assert not {"_init_args", "_init_kwargs", "_init_random_state"} & set(
+        state
+    )
+    with pytest.raises(TypeError, match="after it has been pickled"):
+        pickle.loads(pickle.dumps(model)).get_config()
+
+
+def test_config_invalid():
+    with pytest.raises(ValueError, match="Unknown model"):
+        model_from_config(dict(name="NotAModel"))
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_evaluate_result_file(result_file, model, tmp_path, n_workers):
+    """Assert the results match evaluating the samples directly"""
+    filename, samples = result_file
+    out = evaluate_result_file(
+        filename,
+        tmp_path / "out.npy",
+        chunk_size=40,
+        n_workers=n_workers,
+        verbose=False,
+    )
+    np.testing.assert_array_equal(out["logL"], model.log_likelihood(samples))
+    np.testing.assert_array_equal(out["logP"], model.log_prior(samples))
+    saved = np.load(tmp_path / "out.npy", mmap_mode="r")
+    np.testing.assert_array_equal(saved, out)
+
+
+def test_evaluate_result_file_json(model, tmp_path):
+    samples = model.new_point(20)
+    filename = tmp_path / "result.json"
+    with open(filename, "w") as f:
+        json.dump(
+            dict(
+                posterior_samples={
+                    k: v.tolist()
+                    for k, v in live_points_to_dict(samples).items()
+                }
+            ),
+            f,
+        )
+    out = evaluate_result_file(
+        filename, tmp_path / "out.npy", model=model, verbose=False
+    )
+    np.testing.assert_allclose(out["logL"], model.log_likelihood(samples))
+
+
+def test_evaluate_result_file_missing_parameters(result_file, tmp_path):
+    filename, _ = result_file
+    with pytest.raises(ValueError, match="missing parameters"):
+        evaluate_result_file(
+            filename,
+            tmp_path / "out.npy",
+            model=Rosenbrock(dims=10),
+            verbose=False,
+        )
+
+
+def test_evaluate_result_file_error(result_file, model, tmp_path):
+    """Assert the read-ahead thread is stopped if the evaluation fails"""
+    filename, _ = result_file
+    with patch.object(
+        model, "log_likelihood_array", side_effect=RuntimeError("failed")
+    ):
+        with pytest.raises(RuntimeError, match="failed"):
+            evaluate_result_file(
+                filename,
+                tmp_path / "out.npy",
+                model=model,
+                chunk_size=10,
+                n_read_ahead=2,
+                verbose=False,
+            )
+    assert not any(
+        t.name == "nessai_models_read_ahead" for t in threading.enumerate()
+    )
+
+
+def test_main(result_file, model, tmp_path, capsys):
+    """Assert the CLI evaluates the nested samples and reports the
+    throughput.
+    """
+    filename, samples = result_file
+    main([str(filename), str(tmp_path / "out.npy"), "--key", "nested_samples"])
+    out = np.load(tmp_path / "out.npy")
+    np.testing.assert_array_equal(
+        out["logL"], model.log_likelihood(samples[:50])
+    )
+    assert "samples/s" in capsys.readouterr().err
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Tests for the synthetic cost wrapper."""
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from nessai_models import CostModel, Gaussian, LinearSignal
+
+
+@pytest.fixture(params=[Gaussian, LinearSignal])
+def wrapped(request):
+    return request.param()
+
+
+@pytest.mark.parametrize("mode", ["busy", "sleep"])
+def test_cost_model_matches_wrapped(wrapped, mode):
+    """Assert the wrapper does not change the model"""
+    model = CostModel(wrapped, cost=1e-5, mode=mode)
+    assert model.names == wrapped.names
+    assert model.bounds == wrapped.bounds
+    assert model.ln_evidence == wrapped.ln_evidence
+    x = wrapped.new_point(10)
+    np.testing.assert_array_equal(
+        model.log_likelihood(x), wrapped.log_likelihood(x)
+    )
+    np.testing.assert_array_equal(model.log_prior(x), wrapped.log_prior(x))
+    x_array = wrapped.unstructured_view(x)
+    np.testing.assert_array_equal(
+        model.log_likelihood_array(x_array),
+        wrapped.log_likelihood_array(x_array),
+    )
+
+
+@pytest.mark.parametrize("mode", ["busy", "sleep"])
+def test_cost_model_cost(mode):
+    """Assert the evaluation takes at least the specified cost"""
+    model = CostModel(Gaussian(), cost=1e-3, mode=mode)
+    x = model.new_point(20)
+    start = time.perf_counter()
+    model.log_likelihood(x)
+    assert time.perf_counter() - start >= 0.02
+
+
+def test_cost_model_jitter():
+    """Assert the jittered cost has the correct mean"""
+    model = CostModel(Gaussian(), cost=1e-3, jitter=0.5, seed=1234)
+    costs = [model.sample_cost(1) for _ in range(10_000)]
+    assert np.std(costs) > 0
+    assert np.mean(costs) == pytest.approx(1e-3, rel=0.05)
+
+
+def test_cost_model_expected_time():
+    model = CostModel(Gaussian(), cost=1e-3)
+    assert model.expected_time(10) == pytest.approx(1e-2)
+    assert model.expected_time(10, n_workers=4) == pytest.approx(3e-3)
+    assert model.ideal_speedup(12, 4) == pytest.approx(4.0)
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(cost=-1), "cost cannot be negative"),
+        (dict(jitter=-1), "jitter cannot be negative"),
+        (dict(mode="spin"), "Unknown mode"),
+    ],
+)
+def test_cost_model_invalid(kwargs, msg):
+    with pytest.raises(ValueError, match=msg):
+        CostModel(Gaussian(), **kwargs)
+
+
+def test_cost_model_pickle():
+    """Assert the wrapper can be pickled for use with multiprocessing"""
+    model = CostModel(Gaussian(), cost=1e-5, jitter=0.1)
+    x = model.new_point(5)
+    new = pickle.loads(pickle.dumps(model))
+    np.testing.assert_array_equal(
+        new.log_likelihood(x), model.log_likelihood(x)
+    )
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""Tests for the multivariate normal with deferred factorisation."""
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from scipy.stats import multivariate_normal
+
+from nessai_models import distributions
+from nessai_models.distributions import (
+    LowRankMultivariateNormal,
+    MultivariateNormal,
+    clear_factorisation_cache,
+    get_cholesky_factor,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_factorisation_cache()
+    yield
+    clear_factorisation_cache()
+
+
+@pytest.fixture
+def cov():
+    rng = np.random.default_rng(1234)
+    a = rng.normal(size=(5, 5))
+    return a @ a.T + np.eye(5)
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_logpdf(cov, diagonal):
+    """Assert the log-probability matches scipy"""
+    if diagonal:
+        cov = np.diag(np.diag(cov))
+    mean = np.arange(5.0)
+    dist = MultivariateNormal(mean=mean, cov=cov)
+    expected = multivariate_normal(mean=mean, cov=cov)
+    x = np.random.randn(10, 5)
+    np.testing.assert_allclose(dist.logpdf(x), expected.logpdf(x))
+    assert dist.logpdf(x[0]) == pytest.approx(expected.logpdf(x[0]))
+    np.testing.assert_allclose(dist.pdf(x), expected.pdf(x))
+
+
+def test_scalar_cov():
+    """Assert a scalar covariance is interpreted as isotropic"""
+    dist = MultivariateNormal(mean=1.0, cov=2.0, dims=3)
+    expected = multivariate_normal(mean=np.ones(3), cov=2.0 * np.eye(3))
+    x = np.random.randn(10, 3)
+    np.testing.assert_allclose(dist.logpdf(x), expected.logpdf(x))
+    np.testing.assert_array_equal(dist.cov, 2.0 * np.eye(3))
+
+
+def test_deferred_factorisation(cov):
+    """Assert the covariance is only factorised on the first call"""
+    with patch(
+        "nessai_models.distributions.cholesky", wraps=distributions.cholesky
+    ) as mock:
+        dist = MultivariateNormal(cov=cov)
+        assert not dist.factorised
+        mock.assert_not_called()
+        dist.logpdf(np.zeros(5))
+        assert dist.factorised
+        dist.logpdf(np.zeros(5))
+        MultivariateNormal(cov=cov.copy()).logpdf(np.zeros(5))
+    mock.assert_called_once()
+
+
+def test_cache_bytes(cov):
+    """Assert the least recently used factorisations are discarded once
+    the cache exceeds the maximum size.
+    """
+    with patch.object(distributions, "FACTORISATION_CACHE_BYTES", 2 * 200):
+        for i in range(4):
+            get_cholesky_factor(cov + i * np.eye(5))
+    assert len(distributions._factorisation_cache) == 2
+    assert distributions._factorisation_cache_bytes == 2 * 200
+
+
+def test_cache_bytes_env(cov, monkeypatch):
+    """Assert the size of the cache can be set with an environment
+    variable.
+    """
+    monkeypatch.setenv("NESSAI_MODELS_FACTORISATION_CACHE_BYTES", "100")
+    get_cholesky_factor(cov)
+    assert len(distributions._factorisation_cache) == 0
+    assert distributions._factorisation_cache_bytes == 0
+
+
+def test_disk_cache(cov, cache_dir, monkeypatch):
+    """Assert factorisations are read from disk when enabled"""
+    monkeypatch.setenv("NESSAI_MODELS_CACHE_FACTORISATIONS", "1")
+    factor, log_det = get_cholesky_factor(cov)
+    assert len(list((cache_dir / "factorisations").iterdir())) == 1
+    clear_factorisation_cache()
+    with patch("nessai_models.distributions.cholesky") as mock:
+        factor_disk, log_det_disk = get_cholesky_factor(cov)
+    mock.assert_not_called()
+    np.testing.assert_array_equal(factor_disk, factor)
+    assert log_det_disk == log_det
+
+
+def test_disk_cache_wrong_shape(cov, cache_dir, monkeypatch):
+    """Assert cached factorisations with the wrong shape are ignored"""
+    monkeypatch.setenv("NESSAI_MODELS_CACHE_FACTORISATIONS", "1")
+    factor, _ = get_cholesky_factor(cov)
+    (filename,) = (cache_dir / "factorisations").iterdir()
+    np.save(filename, np.eye(3))
+    clear_factorisation_cache()
+    factor_new, _ = get_cholesky_factor(cov)
+    np.testing.assert_array_equal(factor_new, factor)
+    np.testing.assert_array_equal(np.load(filename), factor)
+
+
+def test_disk_cache_disabled(cov, cache_dir):
+    get_cholesky_factor(cov)
+    assert not (cache_dir / "factorisations").exists()
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(mean=np.zeros(2), cov=np.eye(3)), "cov must have shape"),
+        (dict(mean=np.zeros(2), dims=3), "mean must have shape"),
+        (dict(cov=np.ones((2, 2, 2))), "at most 2-dimensional"),
+        (dict(cov=-1.0, dims=2), "must be positive"),
+    ],
+)
+def test_invalid(kwargs, msg):
+    with pytest.raises(ValueError, match=msg):
+        MultivariateNormal(**kwargs)
+
+
+def test_low_rank_logpdf():
+    """Assert the low-rank distribution matches scipy"""
+    rng = np.random.default_rng(1234)
+    factor = rng.normal(size=(20, 3))
+    diagonal = rng.uniform(0.5, 2.0, 20)
+    dist = LowRankMultivariateNormal(1.0, diagonal, factor)
+    expected = multivariate_normal(
+        np.ones(20), np.diag(diagonal) + factor @ factor.T
+    )
+    x = rng.normal(size=(10, 20))
+    np.testing.assert_allclose(dist.logpdf(x), expected.logpdf(x))
+    assert dist.logpdf(x[0]) == pytest.approx(expected.logpdf(x[0]))
+    assert dist.log_det == pytest.approx(np.linalg.slogdet(dist.cov)[1])
+
+
+def test_low_rank_rvs():
+    """Assert samples have the correct covariance"""
+    rng = np.random.default_rng(1234)
+    dist = LowRankMultivariateNormal(0.0, 1.0, rng.normal(size=(4, 2)))
+    samples = dist.rvs(100_000, random_state=rng)
+    assert samples.shape == (100_000, 4)
+    np.testing.assert_allclose(
+        np.cov(samples, rowvar=False), dist.cov, atol=0.1
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(diagonal=1.0, factor=np.ones(3)), "2-dimensional"),
+        (dict(diagonal=0.0, factor=np.ones((3, 1))), "must be positive"),
+    ],
+)
+def test_low_rank_invalid(kwargs, msg):
+    with pytest.raises(ValueError, match=msg):
+        LowRankMultivariateNormal(mean=0.0, **kwargs)
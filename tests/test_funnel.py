@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Tests for Neal's funnel"""
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from nessai_models.funnel import NealsFunnel
+from nessai_models.reference import compute_reference
+
+
+@pytest.mark.parametrize("dims", [2, 5])
+def test_log_likelihood(dims):
+    """Assert the log-likelihood matches the product of normal
+    distributions.
+    """
+    model = NealsFunnel(dims=dims, scale=2.0)
+    x = np.random.uniform(-5, 5, size=(10, dims))
+    expected = norm(0, 2.0).logpdf(x[:, 0]) + np.sum(
+        norm(0, np.exp(0.5 * x[:, :1])).logpdf(x[:, 1:]), axis=-1
+    )
+    np.testing.assert_allclose(model.log_likelihood_array(x), expected)
+
+
+@pytest.mark.parametrize(
+    "dims, kwargs",
+    [(2, dict(bounds=[-6, 6])), (3, dict(bounds=[-3, 5], scale=1.5))],
+)
+def test_ln_evidence(dims, kwargs):
+    """Assert the ln-evidence matches quadrature"""
+    model = NealsFunnel(dims=dims, **kwargs)
+    reference = compute_reference(
+        model, n_intervals=8, order=8, tolerance=1e-5, cache=False
+    )
+    assert reference.converged
+    assert model.ln_evidence == pytest.approx(reference.ln_evidence, abs=1e-5)
+
+
+def test_ln_evidence_high_dimensions():
+    """Assert the ln-evidence is finite in high dimensions"""
+    model = NealsFunnel(dims=10_000)
+    assert np.isfinite(model.ln_evidence)
@@ -6,8 +6,9 @@ import numpy as np
 import pytest
 from unittest.mock import MagicMock, create_autospec, patch
 
-from nessai_models import Gaussian
+from nessai_models import Gaussian, LowRankGaussian
 from nessai_models.gaussian import compute_gaussian_ln_evidence
+from nessai_models.reference import compute_reference
 
 
 @pytest.fixture
@@ -82,18 +83,15 @@ def test_init_cov(model, cov, expected):
 def test_log_likelihood(model):
     """Test the log-likelihood"""
     x = np.random.randn(4, 2)
-    x_view = np.random.randn(4, 2)
     log_l = np.array([1, 2, 3, 4])
-    model.unstructured_view = MagicMock(return_value=x_view)
     model.dist = MagicMock()
-    model.dist.logpdf = MagicMock(return_value=log_l)
+    model.evaluate_in_blocks = MagicMock(return_value=log_l)
     model._norm_const = 1
 
-    out = Gaussian.log_likelihood(model, x)
+    out = Gaussian.log_likelihood_array(model, x)
     np.testing.assert_equal(out, np.array([0, 1, 2, 3]))
 
-    model.unstructured_view.assert_called_once_with(x)
-    model.dist.logpdf.assert_called_once_with(x_view)
+    model.evaluate_in_blocks.assert_called_once_with(model.dist.logpdf, x)
 
 
 @pytest.mark.parametrize(
@@ -122,3 +120,38 @@ def test_gaussian_ln_evidence_dims_wrong():
     with pytest.raises(ValueError) as excinfo:
         compute_gaussian_ln_evidence(np.array([[-5, 5], [-5, 5]]), 3)
     assert "dims must match the first dimension" in str(excinfo.value)
+
+
+def test_low_rank_gaussian_log_likelihood():
+    """Assert the low-rank Gaussian matches the dense Gaussian"""
+    model = LowRankGaussian(dims=10, rank=3, diagonal=0.5, mean=1.0)
+    dense = Gaussian(10, mean=1.0, cov=model.dist.cov)
+    x = model.new_point(20)
+    np.testing.assert_allclose(
+        model.log_likelihood(x), dense.log_likelihood(x), rtol=1e-12
+    )
+
+
+def test_low_rank_gaussian_ln_evidence():
+    """Assert the evidence matches the reference quadrature for wide
+    bounds.
+    """
+    model = LowRankGaussian(dims=2, rank=1, bounds=[-15, 15])
+    reference = compute_reference(model, cache=False)
+    assert reference.ln_evidence == pytest.approx(model.ln_evidence, abs=1e-3)
+    np.testing.assert_allclose(reference.covariance, model.dist.cov, atol=1e-3)
+
+
+def test_low_rank_gaussian_high_dimensions():
+    """Assert the dense covariance is never formed for high dimensions"""
+    model = LowRankGaussian(dims=50_000, rank=4)
+    x = np.zeros((2, 50_000))
+    log_l = model.log_likelihood_array(x)
+    assert log_l.shape == (2,)
+    assert model.dist.factor.shape == (50_000, 4)
+
+
+def test_low_rank_gaussian_invalid_factor():
+    """Assert a factor with the wrong shape is rejected"""
+    with pytest.raises(ValueError, match="factor must have shape"):
+        LowRankGaussian(dims=4, factor=np.ones((3, 2)))
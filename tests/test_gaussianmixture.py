@@ -7,7 +7,10 @@ import numpy as np
 from scipy.stats import multivariate_normal
 import pytest
 
-from nessai_models.gaussianmixture import GaussianMixture
+from nessai_models.gaussianmixture import (
+    GaussianMixture,
+    GaussianMixtureWithData,
+)
 
 
 @pytest.mark.integration_test
@@ -44,3 +47,76 @@ def test_weighted_gm():
     assert out.shape == (n_points,)
 
     np.testing.assert_array_almost_equal_nulp(out, expected)
+
+
+@pytest.fixture()
+def binned_models():
+    np.random.seed(1234)
+    unbinned = GaussianMixtureWithData(n=10_000)
+    np.random.seed(1234)
+    binned = GaussianMixtureWithData(n=10_000, n_bins=1000)
+    return unbinned, binned
+
+
+def test_binned_data(binned_models):
+    """Assert the binned data matches the data."""
+    unbinned, binned = binned_models
+    np.testing.assert_array_equal(binned.data, unbinned.data)
+    assert binned.bin_counts.sum() == unbinned.data.size
+    assert np.all(binned.bin_counts > 0)
+    assert np.all(
+        (unbinned.data.min() >= binned.bin_lower[0])
+        & (unbinned.data.max() <= binned.bin_upper[-1])
+    )
+
+
+def test_binned_likelihood_accuracy(binned_models):
+    """Assert the binned log-likelihood is close to the unbinned
+    log-likelihood near the truth, up to a constant offset.
+    """
+    unbinned, binned = binned_models
+    truth = np.array([unbinned.truth[n] for n in unbinned.names])
+    scale = np.array([0.005, 0.003, 0.005, 0.0003, 0.003])
+    x = truth + scale * np.random.randn(100, 5)
+    expected = unbinned.log_likelihood_array(x)
+    out = binned.log_likelihood_array(x)
+    assert out.shape == (100,)
+    diff = out - expected
+    assert np.std(diff) < 0.05 * np.std(expected)
+    assert np.std(diff) < 0.1
+    assert abs(np.mean(diff)) < 1.0
+
+
+def test_binned_likelihood_tails(binned_models):
+    """Assert the binned log-likelihood is finite far from the data."""
+    unbinned, binned = binned_models
+    x = np.array(
+        [
+            [3.0, 0.01, -3.0, 0.01, 0.5],
+            [-3.0, 0.01, 3.0, 0.01, 0.5],
+            [0.5, 1.0, -1.5, 1.0, 0.5],
+        ]
+    )
+    out = binned.log_likelihood_array(x)
+    assert np.all(np.isfinite(out))
+    np.testing.assert_allclose(
+        out, unbinned.log_likelihood_array(x), rtol=0.05
+    )
+
+
+def test_binned_likelihood_structured(binned_models):
+    """Assert the structured log-likelihood uses the binned likelihood."""
+    _, binned = binned_models
+    x = binned.new_point(5)
+    np.testing.assert_array_equal(
+        binned.log_likelihood(x),
+        binned.log_likelihood_array(
+            np.stack([x[n] for n in binned.names], axis=-1)
+        ),
+    )
+
+
+def test_binned_invalid_n_bins():
+    """Assert the number of bins must be positive"""
+    with pytest.raises(ValueError, match="n_bins must be at least 1"):
+        GaussianMixtureWithData(n=10, n_bins=0)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Tests for the memory measurement utilities."""
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from nessai_models import Gaussian, Pyramid, Rosenbrock
+from nessai_models.base import BaseModel
+from nessai_models.memory import (
+    assert_memory_budget,
+    measure_log_likelihood_memory,
+)
+
+
+class TemporariesModel(BaseModel):
+    """Model that allocates a known number of full-size temporaries"""
+
+    def __init__(self, n_temporaries=4, n_retained=0):
+        self.names = ["x", "y"]
+        self.bounds = {"x": [0, 1], "y": [0, 1]}
+        self.n_temporaries = n_temporaries
+        self.n_retained = n_retained
+        self.retained = []
+
+    def log_prior(self, x):
+        return np.zeros(x.size)
+
+    def log_likelihood_array(self, x):
+        tmp = np.ones((x.shape[0], self.n_temporaries))
+        self.retained = [np.ones(10) for _ in range(self.n_retained)]
+        return tmp.sum(axis=1)
+
+
+@pytest.mark.parametrize("array", [False, True])
+def test_measure_memory(array):
+    """Assert the peak memory includes the temporaries and the output"""
+    model = TemporariesModel(4)
+    report = measure_log_likelihood_memory(model, n=10_000, array=array)
+    assert report.n_samples == 10_000
+    assert report.output_bytes == 80_000
+    assert report.peak_bytes_per_sample == pytest.approx(40.0, rel=0.05)
+    assert report.retained_bytes < 10_000
+    assert report.n_allocations == 1
+
+
+@pytest.mark.parametrize("n_retained", [0, 3])
+def test_measure_memory_allocations(n_retained):
+    """Assert the number of arrays still allocated after the call is
+    counted.
+    """
+    model = TemporariesModel(4, n_retained=n_retained)
+    report = measure_log_likelihood_memory(model, n=1000, array=True)
+    assert report.n_allocations == 1 + n_retained
+
+
+def test_measure_memory_already_tracing():
+    """Assert measuring works if tracemalloc is already running and does
+    not stop it.
+    """
+    tracemalloc.start()
+    try:
+        # The call before measuring sets the peak of the caller
+        with pytest.warns(UserWarning, match="lower bound"):
+            report = measure_log_likelihood_memory(TemporariesModel(4), n=1000)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert report.peak_bytes >= report.output_bytes
+    assert report.n_allocations == 1
+
+
+def test_measure_memory_keeps_peak():
+    """Assert the peak of a caller that is already tracing is not reset"""
+    tracemalloc.start()
+    try:
+        x = np.ones(1_000_000)
+        del x
+        peak = tracemalloc.get_traced_memory()[1]
+        with pytest.warns(UserWarning, match="lower bound"):
+            measure_log_likelihood_memory(TemporariesModel(4), n=1000)
+        assert tracemalloc.get_traced_memory()[1] >= peak
+    finally:
+        tracemalloc.stop()
+
+
+def test_assert_memory_budget():
+    """Assert an error is raised if the budget is exceeded"""
+    model = TemporariesModel(4)
+    report = assert_memory_budget(model, 1000, budget=50_000)
+    assert report.peak_bytes <= 50_000
+    with pytest.raises(AssertionError, match="exceeds the budget"):
+        assert_memory_budget(model, 1000, budget=20_000)
+
+
+@pytest.mark.parametrize("ModelClass", [Gaussian, Pyramid, Rosenbrock])
+def test_block_evaluation_memory_budget(ModelClass):
+    """Assert block-wise evaluation bounds the temporaries allocated for
+    large batches.
+    """
+    model = ModelClass(dims=8)
+    model.block_size = 256
+    n = 100_000
+    assert_memory_budget(model, n, budget=8 * n + 64 * 8 * 256, array=True)
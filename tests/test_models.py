@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Basic tests for all models."""
+import numpy as np
 import pytest
 
 
@@ -15,3 +16,41 @@ def test_model_likelihood_and_prior(ModelClass, n):
     log_l = model.log_likelihood(x)
     assert log_p.size == n
     assert log_l.size == n
+
+
+@pytest.mark.parametrize("n", [1, 10])
+def test_model_array_methods(ModelClass, n):
+    """Assert the array methods match the structured-array methods."""
+    model = ModelClass()
+    x = model.new_point(n)
+    x_array = model.unstructured_view(x).copy()
+    np.testing.assert_array_equal(
+        model.log_likelihood_array(x_array), model.log_likelihood(x)
+    )
+    np.testing.assert_array_equal(
+        model.log_prior_array(x_array), model.log_prior(x)
+    )
+
+
+def test_model_masked_log_likelihood(ModelClass):
+    """Assert the likelihood is only used for samples in the prior and the
+    log-posterior matches the log-prior plus log-likelihood."""
+    model = ModelClass()
+    x = model.unstructured_view(model.new_point(10)).copy()
+    x[::2, 0] = model.bounds[model.names[0]][1] + 1.0
+    log_p = model.log_prior_array(x)
+    inside = np.isfinite(log_p)
+    assert not inside[::2].any()
+
+    log_l = model.masked_log_likelihood_array(x)
+    assert np.all(log_l[~inside] == -np.inf)
+    np.testing.assert_array_equal(
+        log_l[inside], model.log_likelihood_array(x[inside])
+    )
+    np.testing.assert_array_equal(model.log_posterior_array(x), log_p + log_l)
+
+    x_live = model.new_point(10)
+    model.unstructured_view(x_live)[...] = x
+    np.testing.assert_array_equal(model.log_posterior(x_live), log_p + log_l)
+    model.skip_out_of_prior = True
+    np.testing.assert_array_equal(model.log_likelihood(x_live), log_l)
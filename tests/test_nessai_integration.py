@@ -27,3 +27,27 @@ def test_sampling(tmp_path, ModelClass):
     fs.run(plot=False)
     # Make sure a result is produced
     assert os.path.isfile(os.path.join(output, "result.hdf5"))
+
+
+@pytest.mark.slow_integration_test
+def test_sampling_with_pool(tmp_path):
+    """Run a short sampling run with a pool of workers and a model with a
+    synthetic cost.
+    """
+    from nessai_models import CostModel, Gaussian
+
+    output = tmp_path / "test_sampling_with_pool"
+    output.mkdir()
+    fs = FlowSampler(
+        CostModel(Gaussian(), cost=1e-5),
+        nlive=100,
+        poolsize=100,
+        output=output,
+        resume=False,
+        max_iteration=200,
+        stopping=1.0,
+        plot=False,
+        n_pool=2,
+    )
+    fs.run(plot=False)
+    assert os.path.isfile(os.path.join(output, "result.hdf5"))
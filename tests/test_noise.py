@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the structured covariance matrices.
+"""
+import numpy as np
+import pytest
+from scipy.linalg import toeplitz
+
+from nessai_models.noise import BandedCovariance, ToeplitzCovariance
+
+
+def banded_to_dense(banded):
+    n = banded.shape[1]
+    cov = np.zeros((n, n))
+    for i in range(banded.shape[0]):
+        idx = np.arange(n - i)
+        cov[idx + i, idx] = banded[i, : n - i]
+        cov[idx, idx + i] = banded[i, : n - i]
+    return cov
+
+
+@pytest.fixture
+def autocovariance():
+    return 0.8 ** np.arange(50)
+
+
+@pytest.fixture
+def banded_covariance():
+    banded = np.zeros((3, 50))
+    banded[0] = 2.0
+    banded[1] = 0.5
+    banded[2] = 0.2
+    return banded
+
+
+@pytest.fixture(params=["toeplitz", "banded"])
+def covariance(request, autocovariance, banded_covariance):
+    if request.param == "toeplitz":
+        return ToeplitzCovariance(autocovariance), toeplitz(autocovariance)
+    else:
+        return (
+            BandedCovariance(banded_covariance),
+            banded_to_dense(banded_covariance),
+        )
+
+
+def test_log_det(covariance):
+    """Assert the log-determinant matches the dense matrix"""
+    structured, dense = covariance
+    assert structured.log_det == pytest.approx(np.linalg.slogdet(dense)[1])
+
+
+def test_whiten(covariance):
+    """Assert the squared norm of the whitened residuals matches the dense
+    quadratic form.
+    """
+    structured, dense = covariance
+    x = np.random.randn(structured.n_points, 4)
+    expected = np.sum(x * np.linalg.solve(dense, x), axis=0)
+    np.testing.assert_allclose(
+        np.sum(structured.whiten(x) ** 2, axis=0), expected
+    )
+
+
+def test_sample(covariance):
+    """Assert samples have the correct shape and covariance"""
+    structured, dense = covariance
+    np.random.seed(1234)
+    samples = np.array([structured.sample() for _ in range(5000)])
+    assert samples.shape == (5000, structured.n_points)
+    np.testing.assert_allclose(
+        np.cov(samples[:, :5], rowvar=False), dense[:5, :5], atol=0.15
+    )
+
+
+@pytest.mark.parametrize(
+    "autocovariance",
+    [[1.0, 1.5, 0.0], [0.0, 0.5, 0.1], [-1.0, 0.0], [1.0, 1.0, 1.0], [0.0]],
+)
+def test_toeplitz_not_positive_definite(autocovariance):
+    """Assert an error is raised if the autocovariance is invalid"""
+    with pytest.raises(ValueError, match="not positive definite"):
+        ToeplitzCovariance(autocovariance)
+
+
+def test_toeplitz_not_finite():
+    """Assert an error is raised if the autocovariance is not finite"""
+    with pytest.raises(ValueError, match="must be finite"):
+        ToeplitzCovariance([1.0, np.nan])
+
+
+@pytest.mark.parametrize(
+    "cls, value", [(ToeplitzCovariance, np.eye(2)), (BandedCovariance, [1.0])]
+)
+def test_invalid_dimensions(cls, value):
+    """Assert an error is raised if the input has the wrong dimensions"""
+    with pytest.raises(ValueError, match="-dimensional"):
+        cls(value)
+
+
+def test_sample_generator(covariance):
+    """Assert several realisations can be drawn with a generator and match
+    the realisations drawn one at a time.
+    """
+    structured, dense = covariance
+    samples = structured.sample(2000, rng=np.random.default_rng(1234))
+    assert samples.shape == (2000, structured.n_points)
+    np.testing.assert_allclose(
+        np.cov(samples[:, :5], rowvar=False), dense[:5, :5], atol=0.2
+    )
+    rng = np.random.default_rng(1234)
+    single = np.array([structured.sample(rng=rng) for _ in range(3)])
+    np.testing.assert_allclose(samples[:3], single, rtol=1e-12, atol=1e-14)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Tests for the Rastrigin likelihood"""
+import numpy as np
+import pytest
+
+from nessai_models.rastrigin import Rastrigin, rastrigin
+from nessai_models.reference import compute_reference
+
+
+def test_rastrigin_minima():
+    """Assert there is a global minimum at the origin and local minima at
+    the integers.
+    """
+    assert rastrigin(np.zeros(3)) == 0.0
+    np.testing.assert_allclose(rastrigin(np.array([1.0, -2.0, 0.0])), 5.0)
+
+
+def test_log_likelihood():
+    model = Rastrigin(dims=4, amplitude=5.0)
+    x = np.random.uniform(-5, 5, size=(10, 4))
+    np.testing.assert_array_equal(
+        model.log_likelihood_array(x), -rastrigin(x, 5.0)
+    )
+
+
+@pytest.mark.parametrize("amplitude", [1.0, 10.0])
+def test_ln_evidence(amplitude):
+    """Assert the ln-evidence matches quadrature"""
+    model = Rastrigin(dims=2, amplitude=amplitude)
+    reference = compute_reference(
+        model, n_intervals=128, order=8, tolerance=1e-5, cache=False
+    )
+    assert reference.converged
+    assert model.ln_evidence == pytest.approx(reference.ln_evidence, abs=1e-5)
+
+
+def test_ln_evidence_separable():
+    """Assert the ln-evidence scales with the number of dimensions"""
+    assert Rastrigin(dims=100).ln_evidence == pytest.approx(
+        50 * Rastrigin(dims=2).ln_evidence
+    )
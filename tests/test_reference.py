@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Tests for the reference quadrature."""
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from nessai_models import (
+    Gaussian,
+    GaussianMixture,
+    HalfGaussian,
+    LinearSignal,
+    Rosenbrock,
+    SlabSpike,
+)
+from nessai_models.reference import compute_reference
+from nessai_models.utils import get_model_hash
+
+
+@pytest.mark.parametrize("ModelClass", [Gaussian, HalfGaussian])
+def test_reference_evidence(ModelClass):
+    """Assert the reference matches the analytic evidence"""
+    model = ModelClass(2)
+    reference = compute_reference(model, cache=False)
+    assert reference.converged
+    assert reference.ln_evidence == pytest.approx(
+        model.tempered_ln_evidence(1.0), abs=1e-3
+    )
+
+
+def test_reference_moments():
+    """Assert the posterior moments are correct for a correlated
+    Gaussian.
+    """
+    mean = np.array([1.0, -0.5])
+    cov = np.array([[1.0, 0.5], [0.5, 2.0]])
+    model = Gaussian(2, mean=mean, cov=cov)
+    reference = compute_reference(model, cache=False, batch_size=1000)
+    np.testing.assert_allclose(reference.mean, mean, atol=1e-6)
+    np.testing.assert_allclose(reference.covariance, cov, atol=1e-6)
+
+
+def test_reference_cache(cache_dir):
+    """Assert the cached reference is used for the same model and
+    settings.
+    """
+    model = Rosenbrock(2)
+    expected = compute_reference(model)
+    assert len(list((cache_dir / "reference").iterdir())) == 1
+    with patch("nessai_models.reference._integrate") as mock:
+        out = compute_reference(model)
+    mock.assert_not_called()
+    assert out.ln_evidence == expected.ln_evidence
+    np.testing.assert_array_equal(out.covariance, expected.covariance)
+
+
+def test_reference_cache_settings():
+    """Assert the cache is not used if the settings are different"""
+    model = Gaussian(2)
+    compute_reference(model)
+    out = compute_reference(model, order=3)
+    assert out.converged
+
+
+def test_reference_not_converged():
+    """Assert a warning is raised if the quadrature does not converge"""
+    model = Rosenbrock(2)
+    with pytest.warns(UserWarning, match="maximum number of evaluations"):
+        reference = compute_reference(
+            model, cache=False, max_evaluations=10_000
+        )
+    assert not reference.converged
+
+
+def test_reference_too_many_dimensions():
+    with pytest.raises(ValueError, match="exceeds the maximum number"):
+        compute_reference(Gaussian(12), cache=False)
+
+
+def test_model_hash():
+    """Assert the hash depends on the likelihood but is reproducible"""
+    assert get_model_hash(Gaussian(2)) == get_model_hash(Gaussian(2))
+    assert get_model_hash(Gaussian(2)) != get_model_hash(Gaussian(2, mean=1.0))
+    assert get_model_hash(Gaussian(2)) != get_model_hash(Gaussian(3))
+
+
+def test_model_hash_narrow_component():
+    """Assert the hash changes for models that only differ in a narrow
+    component.
+    """
+
+    def mixture(mean):
+        config = [
+            dict(mean=np.zeros(2), cov=1.0),
+            dict(mean=np.full(2, mean), cov=1e-6),
+        ]
+        return GaussianMixture(2, config=config)
+
+    assert get_model_hash(mixture(3.0)) != get_model_hash(mixture(-3.0))
+    assert get_model_hash(SlabSpike(2, spike_scale=1e-2)) != get_model_hash(
+        SlabSpike(2, spike_scale=1e-3)
+    )
+
+
+def test_model_hash_random_state():
+    """Assert the random state is only included for models that use it
+    when they are created.
+    """
+    np.random.seed(1)
+    gaussian = get_model_hash(Gaussian(2))
+    signal = get_model_hash(LinearSignal())
+    np.random.seed(2)
+    assert get_model_hash(Gaussian(2)) == gaussian
+    assert get_model_hash(LinearSignal()) != signal
+
+
+def test_reference_not_hashable(cache_dir):
+    """Assert the reference is not cached if the model cannot be hashed"""
+    model = Gaussian(2)
+    model._init_kwargs = dict(mean=lambda x: x)
+    with pytest.warns(UserWarning, match="Could not cache the reference"):
+        compute_reference(model)
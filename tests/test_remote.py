@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Tests for the remote evaluation server and client."""
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from nessai_models import Gaussian, RemoteModel, SinusoidalSignal
+from nessai_models.remote import (
+    ModelServer,
+    _EVALUATE,
+    _ERROR,
+    _SHAPE,
+    _recv,
+    _send,
+    local_servers,
+    parse_address,
+)
+
+
+@pytest.fixture
+def addresses():
+    """Two servers running on threads in the current process."""
+    servers = [ModelServer() for _ in range(2)]
+    threads = [threading.Thread(target=s.serve_forever) for s in servers]
+    for t in threads:
+        t.start()
+    yield [s.address for s in servers]
+    for s, t in zip(servers, threads):
+        s.shutdown()
+        s.server_close()
+        t.join()
+
+
+@pytest.mark.parametrize(
+    "address, expected",
+    [
+        ("localhost:5000", ("localhost", 5000)),
+        ("::1:5000", ("::1", 5000)),
+        (("127.0.0.1", "10"), ("127.0.0.1", 10)),
+    ],
+)
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected
+
+
+def test_parse_address_invalid():
+    with pytest.raises(ValueError, match="Invalid address"):
+        parse_address("5000")
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 7])
+def test_remote_model(addresses, chunk_size):
+    """Assert the remote log-likelihood matches the local log-likelihood
+    and is in order"""
+    np.random.seed(1234)
+    wrapped = SinusoidalSignal()
+    with RemoteModel(wrapped, addresses, chunk_size=chunk_size) as model:
+        assert model.connected
+        x = wrapped.new_point(50)
+        # Chunks are evaluated separately, which can change the rounding
+        np.testing.assert_allclose(
+            model.log_likelihood(x), wrapped.log_likelihood(x), rtol=1e-14
+        )
+        x_array = wrapped.unstructured_view(x)
+        assert model.log_likelihood_array(x_array[0]) == (
+            wrapped.log_likelihood_array(x_array[:1])[0]
+        )
+        np.testing.assert_array_equal(model.log_prior(x), wrapped.log_prior(x))
+    assert not model.connected
+
+
+def test_remote_model_concurrent_calls(addresses):
+    """Assert concurrent calls with different batch sizes do not interleave
+    the messages on the shared connections.
+    """
+    wrapped = Gaussian(dims=2)
+    samples = [
+        wrapped.unstructured_view(wrapped.new_point(n)) for n in 4 * [3, 2000]
+    ]
+    with RemoteModel(wrapped, addresses) as model:
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(model.log_likelihood_array, samples))
+    for x, out in zip(samples, results):
+        np.testing.assert_allclose(
+            out, wrapped.log_likelihood_array(x), rtol=1e-14
+        )
+
+
+def test_remote_model_error(addresses):
+    """Assert errors on the server are raised by the client"""
+    model = RemoteModel(Gaussian(dims=2), addresses)
+    with pytest.raises(RuntimeError, match="raised an error"):
+        model.log_likelihood_array(np.zeros((4, 3)))
+    assert not model.connected
+    np.testing.assert_array_equal(
+        model.log_likelihood_array(np.zeros((4, 2))),
+        Gaussian(dims=2).log_likelihood_array(np.zeros((4, 2))),
+    )
+    model.close()
+
+
+def test_server_requires_config(addresses):
+    """Assert the server returns an error if no model is configured"""
+    with socket.create_connection(addresses[0]) as sock:
+        _send(sock, _EVALUATE, _SHAPE.pack(1, 2), np.zeros(2))
+        message_type, payload = _recv(sock)
+    assert message_type == _ERROR
+    assert b"No model" in payload
+
+
+def test_remote_model_invalid():
+    with pytest.raises(ValueError, match="At least one address"):
+        RemoteModel(Gaussian(), [])
+    with pytest.raises(ValueError, match="chunk_size"):
+        RemoteModel(Gaussian(), ["localhost:1"], chunk_size=0)
+
+
+def test_remote_model_pickle(addresses):
+    """Assert the connections are not pickled"""
+    model = RemoteModel(Gaussian(), addresses)
+    model.connect()
+    other = pickle.loads(pickle.dumps(model))
+    assert not other.connected
+    x = np.zeros((3, 2))
+    np.testing.assert_array_equal(
+        other.log_likelihood_array(x), model.log_likelihood_array(x)
+    )
+    model.close()
+    other.close()
+
+
+def test_local_servers():
+    """Assert the model can be evaluated on servers in local processes"""
+    wrapped = Gaussian(dims=4)
+    with local_servers(2) as addresses:
+        assert len(set(addresses)) == 2
+        with RemoteModel(wrapped, addresses, chunk_size=10) as model:
+            x = np.random.randn(100, 4)
+            np.testing.assert_array_equal(
+                model.log_likelihood_array(x), wrapped.log_likelihood_array(x)
+            )
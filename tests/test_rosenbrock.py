@@ -69,11 +69,19 @@ def test_init(model, uncoupled):
 def test_log_likelihood(model):
     """Assert the correct functions are called."""
     logL = 1.0
-    model._fn = MagicMock(return_value=logL)
-    model.unstructured_view = MagicMock(return_value="view")
-    x = "input"
-    out = Rosenbrock.log_likelihood(model, x)
+    model.evaluate_in_blocks = MagicMock(return_value=logL)
+    out = Rosenbrock.log_likelihood_array(model, "view")
+
+    assert out == logL
+    model.evaluate_in_blocks.assert_called_once_with(
+        model._log_likelihood_block, "view"
+    )
+
 
+def test_log_likelihood_block(model):
+    """Assert the block log-likelihood is the negative of the function"""
+    logL = 1.0
+    model._fn = MagicMock(return_value=logL)
+    out = Rosenbrock._log_likelihood_block(model, "block")
     assert out == -logL
-    model.unstructured_view.assert_called_once_with(x)
-    model._fn.assert_called_once_with("view")
+    model._fn.assert_called_once_with("block")
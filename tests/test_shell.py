@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Tests for the Gaussian shell likelihood"""
+import numpy as np
+import pytest
+
+from nessai_models.reference import compute_reference
+from nessai_models.shell import GaussianShell
+
+
+def test_log_likelihood():
+    """Assert the log-likelihood is maximised on the shell"""
+    model = GaussianShell(dims=3, radius=2.0, width=0.1, centre=1.0)
+    direction = np.random.randn(10, 3)
+    direction /= np.linalg.norm(direction, axis=-1, keepdims=True)
+    x = 1.0 + 2.0 * direction
+    np.testing.assert_allclose(
+        model.log_likelihood_array(x), -0.5 * np.log(2 * np.pi * 0.01)
+    )
+    np.testing.assert_allclose(
+        model.log_likelihood_array(1.0 + 2.1 * direction),
+        -0.5 - 0.5 * np.log(2 * np.pi * 0.01),
+    )
+
+
+@pytest.mark.parametrize(
+    "dims, kwargs",
+    [(2, {}), (2, dict(radius=1.0, width=0.3)), (3, dict(width=0.3))],
+)
+def test_ln_evidence(dims, kwargs):
+    """Assert the ln-evidence matches quadrature"""
+    model = GaussianShell(dims=dims, **kwargs)
+    reference = compute_reference(
+        model, n_intervals=8, order=8, tolerance=1e-5, cache=False
+    )
+    assert reference.converged
+    assert model.ln_evidence == pytest.approx(reference.ln_evidence, abs=1e-5)
+
+
+def test_ln_evidence_not_contained():
+    """Assert the ln-evidence is not set if the shell is not contained
+    within the prior bounds.
+    """
+    model = GaussianShell(dims=2, radius=2.0, centre=[4.0, 0.0])
+    assert model.ln_evidence is None
@@ -2,10 +2,17 @@
 
 import numpy as np
 import pytest
+from scipy.linalg import toeplitz
+from scipy.special import logsumexp
+from scipy.stats import multivariate_normal, norm
 
 from nessai_models.signals import (
+    FrequencyDomainSinusoidalSignal,
     LinearSignal,
+    MultiRealisationLinearSignal,
+    MultiRealisationSinusoidalSignal,
     SinusoidalSignal,
+    _log_box_probability,
 )
 
 all_models = [
@@ -29,6 +36,431 @@ def test_max_likelihood(SignalModelClass, n_points, sigma):
     """
     model = SignalModelClass(n_points=n_points, sigma=sigma)
     model.data = model.signal_model(**model.truth)
-    expected = n_points * -np.log(2 * np.pi * sigma**2)
+    expected = -0.5 * n_points * np.log(2 * np.pi * sigma**2)
     actual = model.log_likelihood(model.truth)
     np.testing.assert_almost_equal(actual, expected, decimal=12)
+
+
+def test_frequency_domain_signal_model():
+    """Assert the analytic Fourier transform matches the FFT"""
+    model = FrequencyDomainSinusoidalSignal(n_points=101, start=1.0, end=9.0)
+    x = model.new_point(10)
+    parameters = {n: x[n] for n in model.names}
+    expected = np.fft.rfft(model.signal_model(**parameters), axis=0)
+    np.testing.assert_allclose(
+        model.frequency_domain_signal_model(**parameters),
+        expected,
+        atol=1e-10,
+    )
+
+
+@pytest.mark.parametrize("n_points", [100, 101])
+def test_frequency_domain_matches_time_domain(n_points):
+    """Assert the frequency-domain log-likelihood matches the time-domain
+    log-likelihood up to a constant for white noise.
+    """
+    model = FrequencyDomainSinusoidalSignal(n_points=n_points, sigma=0.5)
+    x = model.new_point(10)
+    expected = SinusoidalSignal._log_likelihood(
+        model, {n: x[n] for n in model.names}
+    )
+    out = model.log_likelihood(x)
+    np.testing.assert_allclose(out - out[0], expected - expected[0])
+
+
+def test_frequency_domain_band():
+    """Assert only the frequencies in the band are used"""
+    model = FrequencyDomainSinusoidalSignal(
+        n_points=1000, f_min=1.0, f_max=2.0, psd=lambda f: 1.0 + f**2
+    )
+    assert model.frequencies[model.band].min() >= 1.0
+    assert model.frequencies[model.band].max() <= 2.0
+    assert model.data_fd.shape == (model.band.size, 1)
+    model.data = model.signal_model(**model.truth)
+    model.data_fd = np.fft.rfft(model.data, axis=0)[model.band]
+    np.testing.assert_allclose(
+        model.log_likelihood(model.truth), 0.0, atol=1e-12
+    )
+
+
+def test_frequency_domain_noise_variance():
+    """Assert the white noise generated from the PSD has the correct
+    variance
+    """
+    model = FrequencyDomainSinusoidalSignal(n_points=100_000, sigma=2.0)
+    assert np.var(model.generate_noise()) == pytest.approx(4.0, rel=0.05)
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(psd=np.ones(3)), "same length"),
+        (dict(f_min=100.0), "No frequencies"),
+        (dict(psd=lambda f: f), "must be positive"),
+    ],
+)
+def test_frequency_domain_invalid(kwargs, msg):
+    with pytest.raises(ValueError, match=msg):
+        FrequencyDomainSinusoidalSignal(**kwargs)
+
+
+@pytest.mark.parametrize("kind", ["autocovariance", "banded_covariance"])
+def test_correlated_noise(SignalModelClass, kind):
+    """Assert the log-likelihood with correlated noise matches the dense
+    multivariate normal.
+    """
+    n_points = 50
+    autocovariance = np.zeros(n_points)
+    autocovariance[:3] = [2.0, 0.5, 0.2]
+    if kind == "autocovariance":
+        noise = autocovariance
+    else:
+        noise = np.tile(autocovariance[:3, np.newaxis], (1, n_points))
+    model = SignalModelClass(n_points=n_points, **{kind: noise})
+    x = model.new_point(5)
+    cov = toeplitz(autocovariance)
+    fits = model.signal_model(**{n: x[n] for n in model.names})
+    expected = [
+        multivariate_normal(f, cov).logpdf(model.data[:, 0]) for f in fits.T
+    ]
+    np.testing.assert_allclose(model.log_likelihood(x), expected)
+
+
+@pytest.mark.parametrize("kind", ["autocovariance", "banded_covariance"])
+@pytest.mark.parametrize(
+    "ModelClass, marginalise",
+    [
+        (LinearSignal, None),
+        (SinusoidalSignal, None),
+        (SinusoidalSignal, ["amp", "offset"]),
+    ],
+)
+def test_diagonal_covariance_matches_white_noise(
+    ModelClass, marginalise, kind
+):
+    """Assert a diagonal noise covariance gives the same log-likelihood as
+    white noise with the same variance.
+    """
+    n_points = 50
+    sigma = 2.0
+    if kind == "autocovariance":
+        noise = np.zeros(n_points)
+        noise[0] = sigma**2
+    else:
+        noise = np.full((1, n_points), sigma**2)
+    kwargs = dict(n_points=n_points, marginalise=marginalise)
+    white = ModelClass(sigma=sigma, **kwargs)
+    correlated = ModelClass(**{kind: noise}, **kwargs)
+    correlated.data = white.data
+    x = white.new_point(10)
+    np.testing.assert_allclose(
+        correlated.log_likelihood(x), white.log_likelihood(x), rtol=1e-12
+    )
+
+
+def test_correlated_noise_invalid():
+    with pytest.raises(ValueError, match="Specify only one"):
+        LinearSignal(
+            autocovariance=np.ones(100), banded_covariance=np.ones((1, 100))
+        )
+    with pytest.raises(ValueError, match="does not match n_points"):
+        LinearSignal(n_points=10, autocovariance=np.eye(1, 5)[0])
+
+
+def _marginalise_numerically(model, marginalised_model, x, priors):
+    """Marginalise the amplitude and offset of a sinusoid on a grid using
+    the trapezium rule.
+    """
+    parameters = dict(zip(marginalised_model.names, x))
+    axes, log_weights = [], []
+    for name in ["amp", "offset"]:
+        if name not in priors:
+            axes.append(np.array([parameters[name]]))
+            log_weights.append(np.zeros(1))
+            continue
+        if priors[name] is None:
+            lower, upper = model.bounds[name]
+            grid = np.linspace(lower, upper, 401)
+            log_prior = -np.log(upper - lower)
+        else:
+            mean, sigma = priors[name]
+            grid = np.linspace(mean - 8 * sigma, mean + 8 * sigma, 401)
+            log_prior = norm(mean, sigma).logpdf(grid)
+        weights = np.full(grid.size, grid[1] - grid[0])
+        weights[[0, -1]] *= 0.5
+        axes.append(grid)
+        log_weights.append(np.log(weights) + log_prior)
+    amp, offset = np.meshgrid(*axes, indexing="ij")
+    samples = np.stack(
+        [
+            amp.ravel(),
+            np.full(amp.size, parameters["phase"]),
+            np.full(amp.size, parameters["f"]),
+            offset.ravel(),
+        ],
+        axis=-1,
+    )
+    log_w = log_weights[0][:, np.newaxis] + log_weights[1]
+    log_w = model.log_likelihood_array(samples) + log_w.ravel()
+    log_z = logsumexp(log_w)
+    posterior_mean = np.exp(log_w - log_z) @ samples[:, [0, 3]]
+    return log_z, posterior_mean
+
+
+@pytest.mark.parametrize(
+    "priors",
+    [
+        {"amp": None, "offset": None},
+        {"offset": None},
+        {"amp": (0.5, 0.2), "offset": None},
+        {"amp": (0.5, 0.2), "offset": (2.0, 1.0)},
+    ],
+)
+@pytest.mark.parametrize("correlated", [False, True])
+def test_marginalised_likelihood(priors, correlated):
+    """Assert the marginalised likelihood matches numerically marginalising
+    the full likelihood.
+    """
+    kwargs = dict(n_points=30)
+    if correlated:
+        kwargs["autocovariance"] = 0.8 ** np.arange(30)
+    np.random.seed(3)
+    model = SinusoidalSignal(**kwargs)
+    np.random.seed(3)
+    marginalised_model = SinusoidalSignal(marginalise=priors, **kwargs)
+    assert marginalised_model.marginalised == [
+        n for n in model.names if n in priors
+    ]
+    x = np.array(
+        [
+            [model.truth[n] for n in marginalised_model.names],
+            [0.9 * model.truth[n] for n in marginalised_model.names],
+        ]
+    )
+    expected = [
+        _marginalise_numerically(model, marginalised_model, xi, priors)[0]
+        for xi in x
+    ]
+    np.testing.assert_allclose(
+        marginalised_model.log_likelihood_array(x), expected, rtol=1e-5
+    )
+
+
+def test_marginalised_names():
+    """Assert marginalising the amplitude and offset of a sinusoid leaves
+    the frequency and phase.
+    """
+    model = SinusoidalSignal(marginalise=["amp", "offset"])
+    assert model.names == ["phase", "f"]
+    assert model.full_names == ["amp", "phase", "f", "offset"]
+    assert list(model.bounds) == ["phase", "f"]
+    assert model.dims == 2
+    x = model.new_point(10)
+    out = model.log_likelihood(x)
+    assert out.shape == (10,)
+    assert np.all(np.isfinite(out))
+    np.testing.assert_array_equal(
+        out,
+        model.log_likelihood_array(
+            np.stack([x[n] for n in model.names], axis=-1)
+        ),
+    )
+
+
+def test_marginalised_unconstrained():
+    """Assert the likelihood is finite when the data do not constrain the
+    amplitude.
+    """
+    np.random.seed(3)
+    model = SinusoidalSignal(marginalise=["amp", "offset"])
+    np.random.seed(3)
+    full_model = SinusoidalSignal()
+    out = model.log_likelihood_array(np.array([[0.0, 0.0]]))
+    offsets = np.linspace(0, 5, 10001)
+    log_l = full_model.log_likelihood_array(
+        np.stack([np.zeros_like(offsets)] * 3 + [offsets], axis=-1)
+    )
+    expected = logsumexp(log_l) + np.log(offsets[1] - offsets[0]) - np.log(5)
+    np.testing.assert_allclose(out, expected, rtol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "priors",
+    [
+        {"amp": None, "offset": None},
+        {"offset": None},
+        {"amp": (0.5, 0.2), "offset": None},
+        {"amp": (0.5, 0.2), "offset": (2.0, 1.0)},
+    ],
+)
+def test_reconstruct_marginalised_parameters(priors):
+    """Assert the reconstructed parameters are drawn from the conditional
+    posterior.
+    """
+    np.random.seed(3)
+    model = SinusoidalSignal(n_points=30, marginalise=priors)
+    sample = np.array(
+        [tuple(model.truth[n] for n in model.names) + (-1.0,)],
+        dtype=[(n, "f8") for n in model.names] + [("logL", "f8")],
+    )
+    samples = np.repeat(sample, 20_000)
+    rng = np.random.default_rng(1234)
+    out = model.reconstruct_marginalised_parameters(samples, random_state=rng)
+    assert out.dtype.names == tuple(model.full_names) + ("logL",)
+    for name in model.names + ["logL"]:
+        np.testing.assert_array_equal(out[name], samples[name])
+    for name, prior in model.marginalised_priors.items():
+        if prior is None:
+            lower, upper = model.marginalised_bounds[name]
+            assert np.all((out[name] >= lower) & (out[name] <= upper))
+
+    np.random.seed(3)
+    full_model = SinusoidalSignal(n_points=30)
+    _, expected = _marginalise_numerically(
+        full_model, model, sample[model.names].tolist()[0], priors
+    )
+    expected = [e for n, e in zip(["amp", "offset"], expected) if n in priors]
+    np.testing.assert_allclose(
+        [out[n].mean() for n in model.marginalised], expected, atol=0.01
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(marginalise=["f"]), "Cannot marginalise"),
+        (dict(marginalise={"amp": (0.0, -1.0)}), "must be positive"),
+    ],
+)
+def test_marginalise_invalid(kwargs, msg):
+    with pytest.raises(ValueError, match=msg):
+        SinusoidalSignal(**kwargs)
+
+
+def test_marginalise_one_dimensional():
+    with pytest.raises(ValueError, match="At least two parameters"):
+        LinearSignal(marginalise=["c"])
+
+
+def test_log_box_probability():
+    """Assert the probability a correlated 2-dimensional Gaussian is in a box
+    matches the multivariate normal CDF.
+    """
+    rng = np.random.default_rng(1234)
+    lower = np.array([0.0, 0.0])
+    upper = np.array([1.0, 5.0])
+    for _ in range(20):
+        mean = rng.uniform([-0.5, -1.0], [1.5, 6.0])
+        sigma = 10 ** rng.uniform(-2, 0.5, 2)
+        rho = rng.uniform(-0.99, 0.99)
+        cov = np.outer(sigma, sigma) * np.array([[1, rho], [rho, 1]])
+        dist = multivariate_normal(mean, cov)
+        expected = (
+            dist.cdf(upper)
+            - dist.cdf([lower[0], upper[1]])
+            - dist.cdf([upper[0], lower[1]])
+            + dist.cdf(lower)
+        )
+        out = _log_box_probability(mean, cov, lower, upper)
+        np.testing.assert_allclose(np.exp(out), expected, atol=1e-8)
+
+
+@pytest.fixture(
+    params=[
+        (MultiRealisationLinearSignal, LinearSignal),
+        (MultiRealisationSinusoidalSignal, SinusoidalSignal),
+    ]
+)
+def MultiRealisationClasses(request):
+    """Multi-realisation and single realisation model classes fixture."""
+    return request.param
+
+
+@pytest.mark.parametrize("kind", [None, "autocovariance", "banded_covariance"])
+def test_multi_realisation_likelihood(MultiRealisationClasses, kind):
+    """Assert the vectorised log-likelihood for all realisations matches
+    the single realisation models.
+    """
+    MultiRealisationClass, SingleClass = MultiRealisationClasses
+    n_points = 50
+    kwargs = {}
+    if kind == "autocovariance":
+        kwargs[kind] = 0.5 ** np.arange(n_points)
+    elif kind == "banded_covariance":
+        kwargs[kind] = np.tile([[2.0], [0.5]], (1, n_points))
+    model = MultiRealisationClass(
+        n_realisations=8, seed=1234, n_points=n_points, **kwargs
+    )
+    assert model.data_realisations.shape == (8, n_points)
+    x = model.new_point(10)
+    expected = []
+    for i in range(8):
+        truth = {n: model.truths[n][i] for n in model.names}
+        single = SingleClass(truth=truth, n_points=n_points, **kwargs)
+        single.data = model.data_realisations[i][:, np.newaxis]
+        expected.append(single.log_likelihood(x))
+    expected = np.array(expected)
+    np.testing.assert_allclose(
+        model.log_likelihood_realisations(x), expected, rtol=1e-12
+    )
+    np.testing.assert_allclose(
+        model.log_likelihood_realisations(x, realisations=[2, 5]),
+        expected[[2, 5]],
+        rtol=1e-12,
+    )
+    np.testing.assert_allclose(
+        model.log_likelihood_realisations(x[3], realisations=4),
+        expected[4, 3],
+        rtol=1e-12,
+    )
+    model.realisation = 6
+    assert model.truth == {n: model.truths[n][6] for n in model.names}
+    np.testing.assert_array_equal(model.log_likelihood(x), expected[6])
+
+
+def test_multi_realisation_seed():
+    """Assert the realisations are reproducible given the seed and do not
+    use the global random number generator.
+    """
+    np.random.seed(1234)
+    state = np.random.get_state()[1].copy()
+    a = MultiRealisationLinearSignal(n_realisations=4, seed=10)
+    np.testing.assert_array_equal(np.random.get_state()[1], state)
+    b = MultiRealisationLinearSignal(n_realisations=4, seed=10)
+    c = MultiRealisationLinearSignal(n_realisations=4, seed=11)
+    np.testing.assert_array_equal(a.data_realisations, b.data_realisations)
+    assert not np.array_equal(a.data_realisations, c.data_realisations)
+    for name, (lower, upper) in a.bounds.items():
+        assert np.all((a.truths[name] >= lower) & (a.truths[name] <= upper))
+
+
+def test_multi_realisation_truths():
+    """Assert the true parameters can be specified."""
+    truths = dict(m=[0.1, 0.2, 0.3], c=[0.0, -0.5, 0.5])
+    model = MultiRealisationLinearSignal(
+        n_realisations=3, truths=truths, realisation=-1, sigma=1e-12
+    )
+    assert model.realisation == 2
+    assert model.truth == dict(m=0.3, c=0.5)
+    np.testing.assert_allclose(
+        model.data_realisations,
+        (model.x * truths["m"] + truths["c"]).T,
+        atol=1e-10,
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs, error, msg",
+    [
+        (dict(n_realisations=0), ValueError, "must be positive"),
+        (dict(truth=dict(m=0.0, c=0.0)), ValueError, "truths"),
+        (dict(marginalise=["c"]), ValueError, "not supported"),
+        (dict(truths=dict(c=[0.0], m=[0.0])), ValueError, "do not match"),
+        (dict(truths=dict(m=[0.0], c=[0.0])), ValueError, "length"),
+        (dict(realisation=2), IndexError, "out of range"),
+    ],
+)
+def test_multi_realisation_invalid(kwargs, error, msg):
+    kwargs.setdefault("n_realisations", 2)
+    with pytest.raises(error, match=msg):
+        MultiRealisationLinearSignal(**kwargs)
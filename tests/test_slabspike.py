@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Tests for the SlabSpike and concentric Gaussian mixture models."""
+import numpy as np
+import pytest
+
+from nessai_models.gaussianmixture import (
+    ConcentricGaussianMixture,
+    GaussianMixture,
+)
+from nessai_models.slabspike import SlabSpike
+
+
+@pytest.mark.parametrize("dims", [2, 10, 100])
+@pytest.mark.parametrize("weights", [None, [0.01, 0.99]])
+def test_slabspike_matches_mixture(dims, weights):
+    """Assert the specialised likelihood matches the generic mixture"""
+    model = SlabSpike(dims=dims, weights=weights)
+    x = 0.1 * np.random.randn(50, dims)
+    expected = GaussianMixture._log_likelihood_block(model, x)
+    np.testing.assert_allclose(model.log_likelihood_array(x), expected)
+
+
+def test_concentric_mixture_matches_mixture():
+    """Assert the likelihood matches the generic mixture with N components
+    and a non-zero mean.
+    """
+    model = ConcentricGaussianMixture(
+        dims=4, scales=[2.0, 1.0, 0.01], mean=1.0, weights=[0.2, 0.3, 0.5]
+    )
+    x = 1.0 + np.random.randn(20, 4)
+    expected = GaussianMixture._log_likelihood_block(model, x)
+    np.testing.assert_allclose(model.log_likelihood_array(x), expected)
+
+
+def test_slabspike_config():
+    """Assert the generic mixture is used if a config is specified"""
+    config = [
+        dict(mean=np.zeros(2), cov=np.eye(2)),
+        dict(mean=np.ones(2), cov=0.1 * np.eye(2)),
+    ]
+    model = SlabSpike(dims=2, config=config)
+    assert model.scales is None
+    x = np.random.randn(10, 2)
+    expected = GaussianMixture._log_likelihood_block(model, x)
+    np.testing.assert_array_equal(model.log_likelihood_array(x), expected)
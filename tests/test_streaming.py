@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Tests for streaming evaluation of chunks of samples."""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from nessai_models import Gaussian, LinearSignal
+from nessai_models.utils import iter_chunks, load_chunk, read_ahead
+
+
+@pytest.mark.parametrize("ModelClass", [Gaussian, LinearSignal])
+@pytest.mark.parametrize("structured", [False, True])
+@pytest.mark.parametrize("n_read_ahead", [0, 2])
+def test_iter_evaluate(ModelClass, structured, n_read_ahead):
+    """Assert the streamed results match evaluating all of the samples"""
+    model = ModelClass()
+    x = model.new_point(105)
+    if not structured:
+        x = model.unstructured_view(x)
+    results = list(
+        model.iter_evaluate(iter_chunks(x, 10), n_read_ahead=n_read_ahead)
+    )
+    assert len(results) == 11
+    log_p = np.concatenate([r[0] for r in results])
+    log_l = np.concatenate([r[1] for r in results])
+    if structured:
+        expected_p, expected_l = model.log_prior(x), model.log_likelihood(x)
+    else:
+        expected_p = model.log_prior_array(x)
+        expected_l = model.log_likelihood_array(x)
+    np.testing.assert_array_equal(log_p, expected_p)
+    np.testing.assert_array_equal(log_l, expected_l)
+
+
+def test_iter_evaluate_skip():
+    model = Gaussian()
+    x = model.new_point(10)
+    ((log_p, log_l),) = model.iter_evaluate([x], log_prior=False)
+    assert log_p is None
+    np.testing.assert_array_equal(log_l, model.log_likelihood(x))
+
+
+def test_iter_evaluate_memmap(tmp_path):
+    """Assert chunks of a memory-mapped array are loaded into memory"""
+    model = Gaussian()
+    x = model.unstructured_view(model.new_point(100))
+    filename = tmp_path / "samples.npy"
+    np.save(filename, x)
+    mmap = np.load(filename, mmap_mode="r")
+    log_l = np.concatenate(
+        [r[1] for r in model.iter_evaluate(iter_chunks(mmap, 30))]
+    )
+    np.testing.assert_array_equal(log_l, model.log_likelihood_array(x))
+
+
+def test_load_chunk(tmp_path):
+    filename = tmp_path / "samples.npy"
+    np.save(filename, np.ones((4, 2)))
+    chunk = load_chunk(np.load(filename, mmap_mode="r")[:2])
+    assert type(chunk) is np.ndarray
+    x = np.ones(3)
+    assert load_chunk(x) is x
+
+
+def test_iter_chunks_invalid():
+    with pytest.raises(ValueError, match="chunk_size"):
+        list(iter_chunks(np.ones(3), 0))
+
+
+def test_read_ahead_overlaps():
+    """Assert items are read on a background thread"""
+    threads = []
+
+    def produce():
+        for i in range(3):
+            threads.append(threading.current_thread())
+            yield i
+
+    assert list(read_ahead(produce(), n=2)) == [0, 1, 2]
+    assert all(t is not threading.main_thread() for t in threads)
+
+
+def test_read_ahead_bounded():
+    """Assert at most n items are read ahead of the consumer"""
+    produced = []
+
+    def produce():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    iterator = read_ahead(produce(), n=2)
+    assert next(iterator) == 0
+    time.sleep(0.1)
+    # One item being consumed, two queued and one waiting to be queued
+    assert len(produced) <= 4
+    iterator.close()
+
+
+def test_read_ahead_error():
+    """Assert errors in the iterable are raised in the consumer"""
+
+    def produce():
+        yield 1
+        raise RuntimeError("read failed")
+
+    iterator = read_ahead(produce(), n=1)
+    assert next(iterator) == 1
+    with pytest.raises(RuntimeError, match="read failed"):
+        next(iterator)
+
+
+def test_read_ahead_close_stops_thread():
+    """Assert closing the generator stops the background thread"""
+    iterator = read_ahead(iter(range(1000)), n=1)
+    next(iterator)
+    iterator.close()
+    assert not any(
+        t.name == "nessai_models_read_ahead" for t in threading.enumerate()
+    )
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Tests for the multivariate Student's t likelihood"""
+import numpy as np
+import pytest
+from scipy.stats import multivariate_t
+
+from nessai_models.reference import compute_reference
+from nessai_models.studentt import StudentT
+
+
+@pytest.mark.parametrize("dims", [2, 5])
+@pytest.mark.parametrize("dof", [1.0, 4.5])
+def test_log_likelihood(dims, dof):
+    """Assert the log-likelihood matches scipy"""
+    model = StudentT(dims=dims, dof=dof, loc=0.5, scale=2.0)
+    x = model.new_point(10)
+    x = np.stack([x[n] for n in model.names], axis=-1)
+    expected = multivariate_t(model.loc, 4.0 * np.eye(dims), df=dof).logpdf(x)
+    np.testing.assert_allclose(model.log_likelihood_array(x), expected)
+
+
+@pytest.mark.parametrize(
+    "dims, kwargs",
+    [
+        (2, {}),
+        (2, dict(dof=3.0, loc=[1.0, -2.0], scale=0.5, bounds=[-5, 5])),
+        (3, dict(dof=0.5, bounds=[-5, 5])),
+    ],
+)
+def test_ln_evidence(dims, kwargs):
+    """Assert the ln-evidence matches quadrature"""
+    model = StudentT(dims=dims, **kwargs)
+    reference = compute_reference(
+        model, n_intervals=8, order=8, tolerance=1e-5, cache=False
+    )
+    assert reference.converged
+    assert model.ln_evidence == pytest.approx(reference.ln_evidence, abs=1e-5)
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [(dict(dof=0.0), "dof must be"), (dict(scale=-1.0), "scale must be")],
+)
+def test_invalid(kwargs, msg):
+    """Assert invalid arguments are rejected"""
+    with pytest.raises(ValueError, match=msg):
+        StudentT(**kwargs)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""Tests for the tabulated surrogate wrapper."""
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from nessai_models import (
+    Gaussian,
+    GaussianMixture,
+    HalfGaussian,
+    MixtureOfDistributions,
+    Rosenbrock,
+    TabulatedModel,
+)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        HalfGaussian(dims=2),
+        Gaussian(dims=3, bounds=[-5, 5]),
+        MixtureOfDistributions({"gaussian": 1, "gamma": 1}),
+    ],
+)
+def test_tabulated_model_error(model):
+    """Assert the interpolation error is within the estimated error"""
+    tolerance = 1e-2
+    tabulated = TabulatedModel(model, tolerance=tolerance)
+    assert tabulated.converged
+    assert tabulated.error_estimate <= tolerance
+    x = model.unstructured_view(model.new_point(1000))
+    error = np.abs(
+        tabulated.log_likelihood_array(x) - model.log_likelihood_array(x)
+    )
+    assert np.max(error) <= 1.1 * tabulated.error_estimate
+
+
+def test_tabulated_model_adaptive():
+    """Assert the grid is refined where the curvature is large"""
+    model = TabulatedModel(
+        MixtureOfDistributions({"gamma": 2}, bounds={"gamma": [0.0, 10.0]}),
+        tolerance=1e-3,
+    )
+    nodes = model.nodes[0]
+    assert np.sum(nodes < 1) > np.sum(nodes > 9)
+
+
+def test_tabulated_model_non_finite():
+    """Assert the wrapped model is used where the log-likelihood is not
+    finite at the nodes"""
+    wrapped = MixtureOfDistributions({"gamma": 2})
+    model = TabulatedModel(wrapped, tolerance=1e-2)
+    assert np.isneginf(model.values[0, 0])
+    x = np.array([[1e-6, 1.0], [0.0, 1.0]])
+    np.testing.assert_array_equal(
+        model.log_likelihood_array(x), wrapped.log_likelihood_array(x)
+    )
+    assert np.isnan(model.interpolate(x)).all()
+
+
+def test_tabulated_model_structured():
+    wrapped = HalfGaussian(dims=2)
+    model = TabulatedModel(wrapped, tolerance=1e-2)
+    x = wrapped.new_point(10)
+    np.testing.assert_array_equal(
+        model.log_likelihood(x),
+        model.log_likelihood_array(wrapped.unstructured_view(x)),
+    )
+    assert (
+        np.ndim(model.log_likelihood_array(wrapped.unstructured_view(x)[0]))
+        == 0
+    )
+
+
+def test_tabulated_model_max_evaluations():
+    with pytest.warns(UserWarning, match="maximum number of evaluations"):
+        model = TabulatedModel(
+            Rosenbrock(dims=2), tolerance=1e-3, max_evaluations=10_000
+        )
+    assert not model.converged
+    assert model.error_estimate > 1e-3
+
+
+def test_tabulated_model_too_many_dims():
+    with pytest.raises(ValueError, match="at most 3 dimensions"):
+        TabulatedModel(Gaussian(dims=4))
+
+
+def test_tabulated_model_cache(cache_dir):
+    """Assert the grid is cached and reloaded when pickled"""
+    wrapped = HalfGaussian(dims=2)
+    model = TabulatedModel(wrapped, tolerance=1e-2)
+    assert os.path.exists(model.cache_file)
+    assert os.path.dirname(model.cache_file).startswith(str(cache_dir))
+
+    cached = TabulatedModel(wrapped, tolerance=1e-2)
+    np.testing.assert_array_equal(cached.values, model.values)
+
+    state = model.__getstate__()
+    assert "values" not in state
+    other = pickle.loads(pickle.dumps(model))
+    np.testing.assert_array_equal(other.values, model.values)
+    for a, b in zip(other.nodes, model.nodes):
+        np.testing.assert_array_equal(a, b)
+
+    rebuilt = TabulatedModel(wrapped, tolerance=1e-3)
+    assert rebuilt.n_evaluations > model.n_evaluations
+
+
+def test_tabulated_model_cache_settings(cache_dir):
+    """Assert grids with different settings do not overwrite each other
+    and can still be pickled.
+    """
+    wrapped = HalfGaussian(dims=2)
+    model = TabulatedModel(wrapped, tolerance=1e-1)
+    other = TabulatedModel(wrapped, tolerance=1e-2)
+    assert other.cache_file != model.cache_file
+    new_model = pickle.loads(pickle.dumps(model))
+    np.testing.assert_array_equal(new_model.values, model.values)
+
+
+def test_tabulated_model_cache_replaced(cache_dir):
+    """Assert the grid is copied when pickled if the cache file has been
+    replaced.
+    """
+    wrapped = HalfGaussian(dims=2)
+    model = TabulatedModel(wrapped, tolerance=1e-1)
+    os.remove(model.cache_file)
+    assert "values" in model.__getstate__()
+    TabulatedModel(wrapped, tolerance=1e-1, n_initial=5)._save(
+        model.cache_file
+    )
+    new_model = pickle.loads(pickle.dumps(model))
+    np.testing.assert_array_equal(new_model.values, model.values)
+
+
+def test_tabulated_model_cache_narrow_component(cache_dir):
+    """Assert models that only differ in a narrow component do not share
+    a cached grid.
+    """
+
+    def mixture(mean):
+        config = [
+            dict(mean=np.zeros(2), cov=1.0),
+            dict(mean=np.full(2, mean), cov=1e-2),
+        ]
+        return GaussianMixture(2, config=config, bounds=[-5, 5])
+
+    model = TabulatedModel(mixture(3.0), tolerance=1e-1)
+    other = TabulatedModel(mixture(-3.0), tolerance=1e-1)
+    assert other.cache_file != model.cache_file
+    x = np.array([[-3.0, -3.0]])
+    np.testing.assert_allclose(
+        other.log_likelihood_array(x),
+        other.model.log_likelihood_array(x),
+        atol=0.5,
+    )
+
+
+def test_tabulated_model_not_hashable(cache_dir):
+    """Assert the model is built if the wrapped model cannot be hashed"""
+    wrapped = HalfGaussian(dims=2)
+    wrapped._init_kwargs = dict(dims=lambda x: x)
+    with pytest.warns(UserWarning, match="Could not cache"):
+        model = TabulatedModel(wrapped, tolerance=1e-1)
+    assert model.cache_file is None
+
+
+@pytest.mark.parametrize("blocked", ["", "tabulated"])
+def test_tabulated_model_cache_not_writable(tmp_path, monkeypatch, blocked):
+    """Assert the model is built if the grid cannot be cached"""
+    cache_dir = tmp_path / "cache"
+    if blocked:
+        cache_dir.mkdir()
+    # A file where a directory is expected cannot be written to
+    (cache_dir / blocked).write_text("")
+    monkeypatch.setenv("NESSAI_MODELS_CACHE_DIR", str(cache_dir))
+    with pytest.warns(UserWarning, match="Could not cache"):
+        model = TabulatedModel(HalfGaussian(dims=2), tolerance=1e-1)
+    assert "values" in model.__getstate__()
+    other = pickle.loads(pickle.dumps(model))
+    np.testing.assert_array_equal(other.values, model.values)
+
+
+def test_tabulated_model_no_cache(cache_dir):
+    model = TabulatedModel(HalfGaussian(dims=2), tolerance=1e-2, cache=False)
+    assert model.cache_file is None
+    assert not os.path.exists(os.path.join(cache_dir, "tabulated"))
+    other = pickle.loads(pickle.dumps(model))
+    np.testing.assert_array_equal(other.values, model.values)
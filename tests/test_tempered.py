@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Tests for tempered likelihoods."""
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from scipy.integrate import quad
+from scipy.stats import halfnorm, norm
+
+from nessai_models import (
+    Gaussian,
+    HalfGaussian,
+    Rosenbrock,
+    TemperedModel,
+)
+
+
+@pytest.mark.parametrize("beta", [0.0, 0.01, 0.5, 1.0, 2.0])
+def test_gaussian_tempered_ln_evidence(beta):
+    """Assert the tempered evidence matches numerical integration"""
+    model = Gaussian(2, [-3, 5])
+    z = quad(lambda x: norm.pdf(x) ** beta, -3, 5)[0] / 8
+    assert model.tempered_ln_evidence(beta) == pytest.approx(2 * np.log(z))
+
+
+def test_gaussian_tempered_ln_evidence_normalised():
+    """Assert the normalisation is included in the tempered evidence"""
+    model = Gaussian(2, normalise=True)
+    assert model.tempered_ln_evidence(1.0) == pytest.approx(0.0)
+
+
+def test_gaussian_tempered_ln_evidence_not_available():
+    """Assert an error is raised for non-unit Gaussians"""
+    model = Gaussian(2, mean=1.0)
+    assert model.tempered_ln_evidence(0.0) == 0.0
+    with pytest.raises(NotImplementedError):
+        model.tempered_ln_evidence(0.5)
+
+
+@pytest.mark.parametrize("beta", [0.0, 0.3, 1.0])
+def test_half_gaussian_tempered_ln_evidence(beta):
+    """Assert the tempered evidence matches numerical integration"""
+    model = HalfGaussian(3, [0, 4])
+    z = quad(lambda x: halfnorm.pdf(x) ** beta, 0, 4)[0] / 4
+    assert model.tempered_ln_evidence(beta) == pytest.approx(3 * np.log(z))
+
+
+def test_tempered_ln_evidence_default():
+    """Assert the default tempered evidence is only available for zero and
+    one.
+    """
+    model = Rosenbrock()
+    model.ln_evidence = -2.0
+    np.testing.assert_array_equal(
+        model.tempered_ln_evidence([0.0, 1.0]), [0.0, -2.0]
+    )
+    with pytest.raises(NotImplementedError):
+        model.tempered_ln_evidence(0.5)
+
+
+def test_tempered_model_ladder():
+    """Assert the ladder evaluates the wrapped model once"""
+    base = Gaussian(2)
+    betas = np.array([0.0, 0.25, 1.0])
+    model = TemperedModel(base, beta=0.25, betas=betas)
+    x = base.new_point(10)
+    expected = base.log_likelihood(x)
+    base.log_likelihood = MagicMock(return_value=expected)
+
+    out = model.log_likelihood_ladder(x)
+
+    base.log_likelihood.assert_called_once_with(x)
+    assert out.shape == (3, 10)
+    np.testing.assert_array_equal(out, betas[:, np.newaxis] * expected)
+    np.testing.assert_array_equal(model.log_likelihood(x), 0.25 * expected)
+
+
+def test_tempered_model_array_ladder():
+    base = Gaussian(2)
+    model = TemperedModel(base, betas=[0.5, 1.0])
+    x = base.unstructured_view(base.new_point(10))
+    expected = base.log_likelihood_array(x)
+    np.testing.assert_array_equal(
+        model.log_likelihood_array_ladder(x, betas=[0.5]), [0.5 * expected]
+    )
+    np.testing.assert_array_equal(model.log_likelihood_array(x), expected)
+
+
+def test_tempered_model_zero_beta_infinite_log_likelihood():
+    """Assert beta equal to zero gives zero for infinite log-likelihoods"""
+    base = MagicMock()
+    base.log_likelihood = MagicMock(return_value=np.array([-np.inf, 1.0]))
+    out = TemperedModel.log_likelihood_ladder(
+        MagicMock(model=base, _get_betas=lambda b: np.array([0.0, 1.0])),
+        np.zeros(2),
+    )
+    np.testing.assert_array_equal(out, [[0.0, 0.0], [-np.inf, 1.0]])
+
+
+def test_tempered_model_ln_evidence():
+    base = Gaussian(2)
+    model = TemperedModel(base, beta=0.5, betas=[0.0, 0.5, 1.0])
+    assert model.ln_evidence == base.tempered_ln_evidence(0.5)
+    np.testing.assert_array_equal(
+        model.ladder_ln_evidence(), base.tempered_ln_evidence(model.betas)
+    )
+    model = TemperedModel(Rosenbrock(), beta=0.5)
+    assert model.ln_evidence is None
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(beta=-1.0, betas=[1.0]), "beta cannot be negative"),
+        (dict(betas=[-1.0, 1.0]), "betas cannot be negative"),
+        (dict(betas=[[1.0]]), "one-dimensional"),
+    ],
+)
+def test_tempered_model_invalid(kwargs, msg):
+    with pytest.raises(ValueError, match=msg):
+        TemperedModel(Gaussian(), **kwargs)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Tests for thread-parallel likelihood evaluation."""
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+from nessai_models import (
+    GaussianMixture,
+    GaussianMixtureWithData,
+    Pyramid,
+    Rosenbrock,
+)
+
+
+@pytest.fixture(
+    params=[GaussianMixture, GaussianMixtureWithData, Pyramid, Rosenbrock]
+)
+def model(request):
+    model = request.param()
+    yield model
+    model.close_thread_pool()
+
+
+@pytest.mark.parametrize("n_threads", [2, 4])
+def test_threaded_log_likelihood(model, n_threads):
+    """Assert the threaded log-likelihood matches the serial version"""
+    x = model.new_point(1000)
+    expected = model.log_likelihood(x)
+    model.n_threads = n_threads
+    model.block_size = 64
+    np.testing.assert_array_equal(model.log_likelihood(x), expected)
+
+
+def test_threaded_log_likelihood_concurrent_calls(model):
+    """Assert concurrent calls that share the thread pool are thread-safe"""
+    samples = [model.new_point(500) for _ in range(8)]
+    expected = [model.log_likelihood(x) for x in samples]
+    model.n_threads = 4
+    model.block_size = 32
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(model.log_likelihood, samples))
+    for out, target in zip(results, expected):
+        np.testing.assert_array_equal(out, target)
+
+
+def test_threaded_model_pickle(model):
+    """Assert the model can be pickled after the thread pool is created"""
+    model.n_threads = 2
+    model.get_thread_pool()
+    new_model = pickle.loads(pickle.dumps(model))
+    assert new_model._thread_pool is None
+    assert new_model.n_threads == 2
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="Fork start method is not available"
+)
+def test_threaded_model_fork(model):
+    """Assert a model that has used the thread pool can be evaluated in a
+    forked worker.
+    """
+    model.n_threads = 2
+    x = model.unstructured_view(model.new_point(100))
+    expected = model.log_likelihood_array(x)
+    # Hold the lock while forking, the worker must not wait for it
+    with model._thread_pool_lock:
+        pool = multiprocessing.get_context("fork").Pool(1)
+    with pool:
+        out = pool.apply_async(model.log_likelihood_array, (x,)).get(
+            timeout=30
+        )
+    np.testing.assert_array_equal(out, expected)
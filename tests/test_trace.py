@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""Tests for the binary trace wrapper."""
+import multiprocessing
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from nessai_models import Gaussian, Rosenbrock, TracedModel
+from nessai_models.config import model_from_config
+from nessai_models.trace import get_trace_dtype, load_trace_model, read_trace
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    return str(tmp_path / "trace")
+
+
+def _evaluate(model, x):
+    return model.log_likelihood(x)
+
+
+def test_traced_model_matches_wrapped(trace_path):
+    """Assert the wrapper does not change the model"""
+    wrapped = Gaussian(dims=3)
+    model = TracedModel(wrapped, trace_path)
+    assert model.names == wrapped.names
+    assert model.ln_evidence == wrapped.ln_evidence
+    x = wrapped.new_point(10)
+    np.testing.assert_array_equal(
+        model.log_likelihood(x), wrapped.log_likelihood(x)
+    )
+    x_array = wrapped.unstructured_view(x)
+    np.testing.assert_array_equal(
+        model.log_likelihood_array(x_array),
+        wrapped.log_likelihood_array(x_array),
+    )
+
+
+def test_trace_round_trip(trace_path):
+    """Assert the records match the evaluated points"""
+    model = TracedModel(Gaussian(dims=2), trace_path, buffer_size=7)
+    batches = [model.new_point(n) for n in [5, 1, 20, 3]]
+    log_l = [model.log_likelihood(x) for x in batches]
+    model.log_likelihood(batches[0][0])
+    model.close()
+
+    trace = read_trace(trace_path)
+    assert trace.dtype == get_trace_dtype(2)
+    assert len(trace) == 30
+    x = np.concatenate([model.unstructured_view(b) for b in batches])
+    np.testing.assert_array_equal(trace["x"][:29], x)
+    np.testing.assert_array_equal(trace["logL"][:29], np.concatenate(log_l))
+    np.testing.assert_array_equal(
+        trace["logP"], model.log_prior_array(trace["x"])
+    )
+    np.testing.assert_array_equal(
+        np.unique(trace["batch"], return_counts=True)[1], [5, 1, 20, 3, 1]
+    )
+    assert np.all(np.diff(trace["time"]) >= 0)
+    assert np.all(trace["duration"] >= 0)
+
+
+def test_trace_written_after_each_call(trace_path):
+    """Assert records are written at the end of each call, including
+    batches larger than the buffer.
+    """
+    model = TracedModel(Gaussian(), trace_path, buffer_size=10)
+    model.log_likelihood(model.new_point(6))
+    assert len(read_trace(trace_path)) == 6
+    model.log_likelihood(model.new_point(16))
+    assert len(read_trace(trace_path)) == 22
+    model.close()
+
+
+def test_trace_without_log_prior(trace_path):
+    model = TracedModel(Gaussian(), trace_path, log_prior=False)
+    model.log_likelihood(model.new_point(4))
+    model.close()
+    assert np.isnan(read_trace(trace_path)["logP"]).all()
+
+
+def test_trace_ignores_partial_record(trace_path):
+    """Assert a partially written record is ignored"""
+    model = TracedModel(Gaussian(), trace_path)
+    model.log_likelihood(model.new_point(4))
+    model.close()
+    (filename,) = [f for f in os.listdir(trace_path) if f.endswith(".bin")]
+    with open(os.path.join(trace_path, filename), "ab") as f:
+        f.write(b"\x00" * 10)
+    assert len(read_trace(trace_path)) == 4
+
+
+def test_trace_append(trace_path):
+    """Assert a new wrapper appends to an existing trace"""
+    for _ in range(2):
+        model = TracedModel(Gaussian(), trace_path)
+        model.log_likelihood(model.new_point(3))
+        model.close()
+    assert len(read_trace(trace_path)) == 6
+
+
+def test_trace_different_model(trace_path):
+    TracedModel(Gaussian(dims=2), trace_path)
+    with pytest.raises(ValueError, match="different model"):
+        TracedModel(Rosenbrock(dims=3), trace_path)
+
+
+def test_trace_model_config(trace_path):
+    """Assert the wrapped and wrapper models can be rebuilt"""
+    model = TracedModel(Rosenbrock(dims=3), trace_path)
+    assert load_trace_model(trace_path).get_config() == (
+        model.model.get_config()
+    )
+    rebuilt = model_from_config(model.get_config())
+    assert isinstance(rebuilt, TracedModel)
+    assert rebuilt.path == trace_path
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires fork",
+)
+def test_trace_pool(trace_path):
+    """Assert workers write to separate files without duplicating records
+    buffered in the parent process"""
+    model = TracedModel(Gaussian(dims=2), trace_path)
+    model.log_likelihood(model.new_point(5))
+    x = model.new_point(40)
+    context = multiprocessing.get_context("fork")
+    with context.Pool(2) as pool:
+        log_l = np.concatenate(
+            pool.starmap(_evaluate, [(model, x[i::4]) for i in range(4)])
+        )
+        pool.close()
+        pool.join()
+    model.close()
+    records = read_trace(trace_path, concatenate=False)
+    (parent,) = [k for k in records if k.startswith(f"{os.getpid()}-")]
+    assert len(records) >= 2
+    assert len(records[parent]) == 5
+    assert isinstance(records[parent], np.memmap)
+    trace = read_trace(trace_path)
+    assert len(trace) == 45
+    worker_log_l = np.concatenate(
+        [r["logL"] for k, r in records.items() if k != parent]
+    )
+    np.testing.assert_array_equal(np.sort(worker_log_l), np.sort(log_l))
+
+
+def test_traced_model_pickle(trace_path):
+    model = TracedModel(Gaussian(), trace_path)
+    model.log_likelihood(model.new_point(3))
+    other = pickle.loads(pickle.dumps(model))
+    other.log_likelihood(other.new_point(2))
+    other.close()
+    model.close()
+    assert len(read_trace(trace_path)) == 5
+
+
+def test_trace_reused_pid(trace_path):
+    """Assert a partial record from an earlier process with the same ID
+    does not misalign the records of a new writer.
+    """
+    model = TracedModel(Gaussian(dims=2), trace_path)
+    model.log_likelihood(model.new_point(2))
+    model.close()
+    (filename,) = [f for f in os.listdir(trace_path) if f.endswith(".bin")]
+    with open(os.path.join(trace_path, filename), "ab") as f:
+        f.write(b"partial")
+    other = TracedModel(Gaussian(dims=2), trace_path)
+    x = other.new_point(4)
+    log_l = other.log_likelihood(x)
+    other.close()
+    records = read_trace(trace_path, concatenate=False)
+    assert len(records) == 2
+    trace = read_trace(trace_path)
+    assert len(trace) == 6
+    np.testing.assert_array_equal(trace["logL"][2:], log_l)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Tests for the utilities in `nessai_models.utils`."""
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from nessai_models import utils
+
+
+@pytest.fixture(autouse=True)
+def reset_block_bytes(monkeypatch):
+    monkeypatch.setattr(utils, "_block_bytes", None)
+    monkeypatch.delenv("NESSAI_MODELS_BLOCK_BYTES", raising=False)
+
+
+def test_get_cache_dir(cache_dir):
+    """Assert the cache directory is set by the environment variable"""
+    assert utils.get_cache_dir() == str(cache_dir)
+    assert os.path.isdir(cache_dir)
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 10, 100])
+def test_evaluate_in_blocks(block_size):
+    """Assert the blocks are evaluated correctly"""
+    x = np.random.randn(10, 2)
+    out = utils.evaluate_in_blocks(
+        lambda y: y.sum(axis=-1), x, block_size=block_size
+    )
+    np.testing.assert_array_equal(out, x.sum(axis=-1))
+
+
+def test_evaluate_in_blocks_out():
+    """Assert the preallocated output is used"""
+    x = np.random.randn(10, 2)
+    out = np.empty(10)
+    res = utils.evaluate_in_blocks(
+        lambda y: y.sum(axis=-1), x, block_size=3, out=out
+    )
+    assert res is out
+    np.testing.assert_array_equal(out, x.sum(axis=-1))
+
+
+def test_evaluate_in_blocks_single_point():
+    """Assert a single (1-d) point is passed straight to the function"""
+    func = MagicMock(return_value=1.0)
+    x = np.random.randn(2)
+    assert utils.evaluate_in_blocks(func, x, block_size=1) == 1.0
+    func.assert_called_once_with(x)
+
+
+def test_tune_block_bytes():
+    """Assert a value from the candidates is returned"""
+    candidates = [2**10, 2**12]
+    out = utils.tune_block_bytes(
+        n_bytes=2**14, dims=2, candidates=candidates, n_repeats=1
+    )
+    assert out in candidates
+
+
+def test_get_block_bytes_env(monkeypatch):
+    """Assert the environment variable takes precedence"""
+    monkeypatch.setenv("NESSAI_MODELS_BLOCK_BYTES", "1024")
+    assert utils.get_block_bytes() == 1024
+
+
+def test_tune_block_bytes_random_state():
+    """Assert tuning does not change the global random state"""
+    np.random.seed(1234)
+    state = np.random.get_state()[1].copy()
+    utils.tune_block_bytes(
+        n_bytes=2**14, dims=2, candidates=[2**10], n_repeats=1
+    )
+    np.testing.assert_array_equal(np.random.get_state()[1], state)
+
+
+def test_get_block_bytes_default(cache_dir):
+    """Assert the default is used and the block size is not tuned
+    implicitly.
+    """
+    with patch("nessai_models.utils.tune_block_bytes") as mock:
+        assert utils.get_block_bytes() == utils.DEFAULT_BLOCK_BYTES
+    mock.assert_not_called()
+
+
+def test_get_block_bytes_not_writable(tmp_path, monkeypatch):
+    """Assert the default is used if the cache directory cannot be
+    created.
+    """
+    path = tmp_path / "file"
+    path.write_text("")
+    monkeypatch.setenv("NESSAI_MODELS_CACHE_DIR", str(path))
+    assert utils.get_block_bytes() == utils.DEFAULT_BLOCK_BYTES
+    with pytest.warns(UserWarning, match="Could not cache"):
+        assert utils.save_block_bytes(2048) == 2048
+    assert utils.get_block_bytes() == 2048
+
+
+def test_save_block_bytes(cache_dir):
+    """Assert the tuned block size is cached on disk"""
+    with patch(
+        "nessai_models.utils.tune_block_bytes", return_value=2048
+    ) as mock:
+        assert utils.save_block_bytes() == 2048
+    mock.assert_called_once()
+    assert utils.get_block_bytes() == 2048
+    with open(cache_dir / "block_bytes.json", "r") as f:
+        assert json.load(f)["block_bytes"] == 2048
+
+
+def test_get_block_bytes_from_file(cache_dir):
+    """Assert the cached value is read from disk"""
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_dir / "block_bytes.json", "w") as f:
+        json.dump({"block_bytes": 4096}, f)
+    with patch("nessai_models.utils.tune_block_bytes") as mock:
+        assert utils.get_block_bytes() == 4096
+    mock.assert_not_called()